@@ -5,3 +5,6 @@ class AuthConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.apps.auth"
     label = "authentication"
+
+    def ready(self):
+        import src.apps.auth.signals  # noqa
@@ -0,0 +1,117 @@
+import threading
+from functools import lru_cache
+
+from cachetools import TTLCache
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+
+AUTH_VERSION_CLAIM = "auth_version"
+
+# Enough to authenticate and serve most requests; anything else (the
+# password hash, last_login) is deferred and loaded on first access.
+CACHED_USER_FIELDS = (
+    "id", "username", "email", "first_name", "last_name", "image", "phone_number", "role",
+    "status", "email_verified", "is_active", "is_staff", "is_superuser", "auth_version",
+    "date_joined", "created_at", "updated_at",
+)
+
+_local_users = TTLCache(maxsize=settings.AUTH_USER_LOCAL_CACHE_SIZE, ttl=settings.AUTH_USER_LOCAL_CACHE_SECONDS)
+_local_lock = threading.Lock()
+
+
+@lru_cache(maxsize=None)
+def cached_user_fields():
+    """CACHED_USER_FIELDS in model order, which is what Model.from_db() expects."""
+    return tuple(
+        field.attname for field in get_user_model()._meta.concrete_fields if field.attname in CACHED_USER_FIELDS
+    )
+
+
+def user_cache_key(user_id, version):
+    return f"auth:user:{user_id}:{version}"
+
+
+def invalidate_cached_user(user_id, *versions):
+    """Drop the shared cached record. Per-process copies expire within seconds."""
+    keys = [user_cache_key(user_id, version) for version in versions]
+    with _local_lock:
+        for version in versions:
+            _local_users.pop((str(user_id), version), None)
+    try:
+        cache.delete_many(keys)
+    except Exception as e:
+        print(f"Failed to invalidate cached user {user_id}. Error: {e}")
+
+
+def _load_user_values(user_id, version):
+    """
+    Field values for ``user_id`` if its current auth version is ``version``:
+    per-process cache first, then Redis, then the database. A stale version
+    is never cached, so revoked tokens keep missing.
+    """
+    local_key = (str(user_id), version)
+    with _local_lock:
+        values = _local_users.get(local_key)
+    if values is not None:
+        return values
+
+    key = user_cache_key(user_id, version)
+    try:
+        values = cache.get(key)
+    except Exception:
+        values = None
+
+    if values is None:
+        User = get_user_model()
+        values = (
+            User.objects.filter(**{api_settings.USER_ID_FIELD: user_id})
+            .values_list(*cached_user_fields())
+            .first()
+        )
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        if values[cached_user_fields().index("auth_version")] != version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+        try:
+            cache.set(key, values, settings.AUTH_USER_CACHE_SECONDS)
+        except Exception:
+            pass
+
+    with _local_lock:
+        _local_users[local_key] = values
+    return values
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication that resolves the user from a short-lived per-process
+    cache backed by Redis instead of reading the users table on every request.
+
+    Cache entries are keyed by user id and the token's ``auth_version`` claim.
+    Saving a user drops its shared entry; changing the password or
+    deactivating the account bumps the version, which revokes older tokens.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        # Tokens issued before the claim existed belong to version 0
+        version = validated_token.get(AUTH_VERSION_CLAIM, 0)
+        values = _load_user_values(user_id, version)
+
+        User = get_user_model()
+        # from_db marks the missing fields as deferred: reading one loads it and
+        # save() only writes the fields that were loaded.
+        user = User.from_db("default", cached_user_fields(), values)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
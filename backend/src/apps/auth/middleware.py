@@ -0,0 +1,31 @@
+from urllib.parse import parse_qs
+
+from channels.db import database_sync_to_async
+from channels.middleware import BaseMiddleware
+from django.contrib.auth.models import AnonymousUser
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+
+from .authentication import CachedJWTAuthentication
+
+
+@database_sync_to_async
+def get_user_from_token(raw_token):
+    authentication = CachedJWTAuthentication()
+    try:
+        validated_token = authentication.get_validated_token(raw_token)
+        return authentication.get_user(validated_token)
+    except (InvalidToken, AuthenticationFailed):
+        return AnonymousUser()
+
+
+class JWTAuthMiddleware(BaseMiddleware):
+    """
+    Channels middleware that authenticates a WebSocket connection with the
+    same JWT access token the REST API uses, passed as ``?token=<access>``.
+    """
+
+    async def __call__(self, scope, receive, send):
+        query = parse_qs(scope.get("query_string", b"").decode())
+        token = query.get("token", [None])[0]
+        scope["user"] = await get_user_from_token(token) if token else AnonymousUser()
+        return await super().__call__(scope, receive, send)
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:50
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='auth_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
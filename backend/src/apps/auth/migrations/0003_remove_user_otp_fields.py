@@ -0,0 +1,25 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:52
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('authentication', '0002_user_auth_version'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='user',
+            name='otp',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_created_at',
+        ),
+        migrations.RemoveField(
+            model_name='user',
+            name='otp_tries',
+        ),
+    ]
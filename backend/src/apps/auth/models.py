@@ -4,10 +4,12 @@ from django.contrib.auth.models import (
     BaseUserManager,
     PermissionsMixin,
 )
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 from django.utils import timezone
 from src.apps.common.utils import image_validate
-from src.apps.common.models import BaseModel
+from src.apps.common.models import BaseModel, FieldTrackerMixin
 
 
 class Role(models.TextChoices):
@@ -43,7 +45,7 @@ class UserManager(BaseUserManager):
         return user
 
 
-class User(BaseModel, AbstractBaseUser, PermissionsMixin):
+class User(FieldTrackerMixin, BaseModel, AbstractBaseUser, PermissionsMixin):
 
     email = models.EmailField(unique=True)
     first_name = models.CharField(max_length=255)
@@ -59,23 +61,46 @@ class User(BaseModel, AbstractBaseUser, PermissionsMixin):
         default=Role.ADMIN,
     )
 
-    otp = models.CharField(max_length=10, null=True, blank=True)
-    otp_tries = models.IntegerField(default=0)
-    otp_created_at = models.DateTimeField(null=True, blank=True)
-
     email_verified = models.BooleanField(default=False)
 
     is_active = models.BooleanField(default=True)
     is_staff = models.BooleanField(default=False)
 
     date_joined = models.DateTimeField(default=timezone.now)
-    
+
+    # Carried in access tokens; bumping it revokes every token issued before
+    auth_version = models.PositiveIntegerField(default=0)
 
     objects: UserManager = UserManager()
 
     USERNAME_FIELD = "username"
     REQUIRED_FIELDS = ["email", "first_name", "last_name"]
 
+    tracked_fields = ("is_active", "auth_version")
+
+    class Meta:
+        # Trigram indexes on UPPER(col) serve icontains/istartswith (which
+        # compare UPPER(col::text)) as well as fuzzy % matches in user search.
+        indexes = [
+            GinIndex(OpClass(Upper("username"), name="gin_trgm_ops"), name="user_username_trgm_idx"),
+            GinIndex(OpClass(Upper("email"), name="gin_trgm_ops"), name="user_email_trgm_idx"),
+            GinIndex(OpClass(Upper("first_name"), name="gin_trgm_ops"), name="user_first_name_trgm_idx"),
+            GinIndex(OpClass(Upper("last_name"), name="gin_trgm_ops"), name="user_last_name_trgm_idx"),
+        ]
+
+    def set_password(self, raw_password):
+        super().set_password(raw_password)
+        if not self._state.adding:
+            self.auth_version = (self.auth_version or 0) + 1
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding and not self.is_active and self.has_changed("is_active"):
+            self.auth_version = (self.auth_version or 0) + 1
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and self.has_changed("auth_version"):
+            kwargs["update_fields"] = {*update_fields, "auth_version"}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.username
 
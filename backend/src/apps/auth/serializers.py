@@ -1,5 +1,7 @@
 from rest_framework import serializers, exceptions
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from src.apps.auth.models import User, Role
+from src.apps.auth.authentication import AUTH_VERSION_CLAIM
 from django.contrib.auth.models import Permission
 from django.db import transaction
 from django.db.models import Q
@@ -7,6 +9,16 @@ from src.apps.common.otp import OTPhandlers, OTPAction
 from src.apps.common.serializers import DynamicSerializer
 
 
+class VersionedTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Adds the user's auth_version, checked by CachedJWTAuthentication."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[AUTH_VERSION_CLAIM] = user.auth_version
+        return token
+
+
 class PermissionsSerializer(serializers.ModelSerializer):
     class Meta:
         model = Permission
@@ -137,6 +149,14 @@ class UserSerializer(DynamicSerializer):
         return instance
 
 
+class UserSearchSerializer(serializers.ModelSerializer):
+    """Small projection returned by user search."""
+
+    class Meta:
+        model = User
+        fields = ("id", "username", "first_name", "last_name", "image")
+
+
 class UserChangePasswordSerializer(serializers.Serializer):
     username = serializers.CharField(max_length=255, required=True, allow_blank=False)
     old_password = serializers.CharField(
@@ -0,0 +1,21 @@
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_cached_user
+
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=User)
+def invalidate_cached_user_on_save(sender, instance, **kwargs):
+    # previous() still holds the pre-save version here, so both keys are dropped
+    versions = {instance.auth_version, instance.previous("auth_version")} - {None}
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk, *versions))
+
+
+@receiver(post_delete, sender=User)
+def invalidate_cached_user_on_delete(sender, instance, **kwargs):
+    transaction.on_commit(lambda: invalidate_cached_user(instance.pk, instance.auth_version))
@@ -1,3 +1,151 @@
-from django.test import TestCase
+from unittest import skipUnless
 
-# Create your tests here.
+from django.db import connection
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+from src.apps.common.otp import OTPAction, OTPhandlers, _verify_otp_script
+from src.utility.redis_client import get_redis_connection
+from .authentication import CachedJWTAuthentication, invalidate_cached_user
+from .models import User
+from .serializers import VersionedTokenObtainPairSerializer
+
+
+@override_settings(OTP_MAX_TRIES=3)
+class OTPVerifyTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("otp-user", "otp@example.com", "pw")
+
+    def setUp(self):
+        self.handler = OTPhandlers(None, self.user, action=OTPAction.LOGIN)
+        self.redis = get_redis_connection()
+        self.redis.delete(self.handler.key)
+        self.addCleanup(self.redis.delete, self.handler.key)
+
+    def script(self, otp):
+        return _verify_otp_script()(keys=[self.handler.key], args=[self.handler._digest(otp), 3])
+
+    def test_no_live_code(self):
+        self.assertEqual(self.script("123456"), -1)
+        self.assertEqual(self.handler.verify_otp("123456"), (False, "OTP expired"))
+
+    def test_correct_code_is_consumed(self):
+        otp = self.handler.generate_otp()
+
+        self.assertEqual(self.handler.verify_otp(otp), (True, "OTP Verified"))
+
+        self.assertFalse(self.redis.exists(self.handler.key))
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.email_verified)
+        self.assertEqual(self.script(otp), -1)
+
+    def test_wrong_code_counts_a_try(self):
+        otp = self.handler.generate_otp()
+        wrong = "000000" if otp != "000000" else "111111"
+
+        self.assertEqual(self.script(wrong), 0)
+        self.assertEqual(self.redis.hget(self.handler.key, "tries"), b"1")
+        self.assertEqual(self.script(otp), 1)
+
+    def test_code_locks_after_max_tries(self):
+        otp = self.handler.generate_otp()
+        wrong = "000000" if otp != "000000" else "111111"
+
+        self.assertEqual([self.script(wrong) for _ in range(3)], [0, 0, -2])
+        # Even the right code is refused once the budget is spent
+        self.assertEqual(self.handler.verify_otp(otp), (False, "OTP Tried too many times"))
+
+
+class CachedJWTAuthenticationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("jwt-user", "jwt@example.com", "pw")
+
+    def setUp(self):
+        # Both the initial version and the one a password change moves to
+        invalidate_cached_user(self.user.pk, 0, 1)
+
+    def token(self, user):
+        return str(VersionedTokenObtainPairSerializer.get_token(user).access_token)
+
+    def authenticate(self, token):
+        request = RequestFactory().get("/", headers={"Authorization": f"Bearer {token}"})
+        return CachedJWTAuthentication().authenticate(request)
+
+    def test_resolves_the_user_from_the_cache(self):
+        token = self.token(self.user)
+        authenticated, _ = self.authenticate(token)
+        self.assertEqual(authenticated.pk, self.user.pk)
+
+        with self.assertNumQueries(0):
+            authenticated, _ = self.authenticate(token)
+        self.assertEqual(authenticated.username, "jwt-user")
+
+    def test_password_change_revokes_older_tokens(self):
+        old_token = self.token(self.user)
+        self.authenticate(old_token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.set_password("new-pw")
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed) as raised:
+            self.authenticate(old_token)
+        self.assertEqual(raised.exception.detail["code"], "token_revoked")
+        authenticated, _ = self.authenticate(self.token(self.user))
+        self.assertEqual(authenticated.auth_version, self.user.auth_version)
+
+    def test_deactivation_revokes_tokens(self):
+        old_token = self.token(self.user)
+        self.authenticate(old_token)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate(old_token)
+
+
+class UserSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user("searcher", "searcher@example.com", "pw")
+        for username in ("alex", "alexandra", "malex", "alec", "bob"):
+            User.objects.create_user(username, f"{username}@example.com", "pw")
+        User.objects.create_user("alexis", "alexis@example.com", "pw", is_active=False)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def search(self, **params):
+        response = self.client.get(reverse("user-search-api"), params)
+        self.assertEqual(response.status_code, 200)
+        return [user["username"] for user in response.data]
+
+    def test_short_queries_return_nothing_without_querying(self):
+        with self.assertNumQueries(0):
+            self.assertEqual(self.search(q=" a "), [])
+
+    @skipUnless(connection.vendor == "postgresql", "trigram matching needs pg_trgm")
+    def test_exact_then_prefix_then_fuzzy_matches(self):
+        usernames = self.search(q="ALEX")
+
+        self.assertEqual(usernames[:2], ["alex", "alexandra"])
+        self.assertIn("malex", usernames)
+        self.assertNotIn("alexis", usernames)
+        self.assertNotIn("bob", usernames)
+
+    @skipUnless(connection.vendor == "postgresql", "trigram matching needs pg_trgm")
+    def test_limit_is_clamped(self):
+        self.assertEqual(self.search(q="alex", limit=1), ["alex"])
+        # The searcher and five other active users share the domain
+        self.assertEqual(len(self.search(q="example.com", limit=1000)), 6)
+        self.assertEqual(len(self.search(q="example.com", limit="many")), 6)
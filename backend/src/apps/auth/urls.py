@@ -8,6 +8,7 @@ from .views import (
     UserDetailsView,
     UserRetrieveView,
     UserListView,
+    UserSearchView,
     UserUpdateView,
     VerifyLoginOTPView,
     UserChangePasswordView,
@@ -30,6 +31,7 @@ urlpatterns = [
     path("details/", UserDetailsView.as_view(), name="user-details-api"),
     path("retrieve/<uuid:pk>/", UserRetrieveView.as_view(), name="user-retrieve-api"),
     path("list/", UserListView.as_view(), name="user-list-api"),
+    path("search/", UserSearchView.as_view(), name="user-search-api"),
     path("update/<uuid:pk>/", UserUpdateView.as_view(), name="user-update-api"),
     path(
         "change/password/",
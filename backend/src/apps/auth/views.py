@@ -1,8 +1,10 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Upper
 from django.utils import timezone
 from rest_framework import generics, status, exceptions
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
-from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth.models import Permission
 from django.utils.crypto import get_random_string
@@ -15,9 +17,11 @@ from .serializers import (
     UserLogoutSerializer,
     VerifyLoginOTPSerializer,
     UserSerializer,
+    UserSearchSerializer,
     UserChangePasswordSerializer,
     ForgotPasswordSerializer,
     VerifyForgotPasswordSerializer,
+    VersionedTokenObtainPairSerializer,
     ChangeForgotPasswordSerializer,
     # AddUserPermissionsSerializer,
     PermissionsSerializer,
@@ -25,6 +29,13 @@ from .serializers import (
 from .permissions import IsSuperAdminOrAdmin, IsSelfOrAdmin
 from .models import User, Role
 from src.apps.common.otp import OTPhandlers, OTPAction
+from src.apps.common.throttling import (
+    LoginAccountRateThrottle,
+    LoginRateThrottle,
+    OTPAccountRateThrottle,
+    OTPRateThrottle,
+    PasswordResetRateThrottle,
+)
 from src.apps.auth.filters import UserFilter
 from src.apps.common.tasks import send_user_mail
 
@@ -69,6 +80,7 @@ class UserRegisterView(generics.CreateAPIView):
 class UserLoginView(generics.GenericAPIView):
     serializer_class = UserLoginSerializer
     permission_classes = []
+    throttle_classes = [LoginRateThrottle, LoginAccountRateThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -80,7 +92,7 @@ class UserLoginView(generics.GenericAPIView):
         user.last_login = timezone.now()
         user.save()
 
-        token = TokenObtainPairSerializer.get_token(user)
+        token = VersionedTokenObtainPairSerializer.get_token(user)
 
         return Response(
             {
@@ -101,6 +113,7 @@ class UserLoginView(generics.GenericAPIView):
 class VerifyLoginOTPView(generics.GenericAPIView):
     serializer_class = VerifyLoginOTPSerializer
     permission_classes = []
+    throttle_classes = [OTPRateThrottle, OTPAccountRateThrottle]
 
     def post(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
@@ -108,7 +121,7 @@ class VerifyLoginOTPView(generics.GenericAPIView):
         user = serializer.validated_data.get("user", None)
 
         if user is not None:
-            token = TokenObtainPairSerializer.get_token(user)
+            token = VersionedTokenObtainPairSerializer.get_token(user)
             user.is_active = True
             user.last_login = timezone.now()
             user.save()
@@ -194,6 +207,57 @@ class UserListView(generics.ListAPIView):
         return User.objects.all()
 
 
+USER_SEARCH_DEFAULT_LIMIT = 10
+USER_SEARCH_MAX_LIMIT = 25
+USER_SEARCH_MIN_LENGTH = 2
+
+
+class UserSearchView(generics.ListAPIView):
+    """
+    Find users to add as group members or lend participants: ``?q=`` matches
+    username, email and name by substring, and usernames fuzzily. Exact and
+    prefix username matches rank first. Returns at most ``?limit=`` users.
+    Every predicate is served by the pg_trgm indexes on UPPER(column).
+    """
+    serializer_class = UserSearchSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        query = self.request.query_params.get("q", "").strip()
+        if len(query) < USER_SEARCH_MIN_LENGTH:
+            return User.objects.none()
+        try:
+            limit = int(self.request.query_params.get("limit", USER_SEARCH_DEFAULT_LIMIT))
+        except ValueError:
+            limit = USER_SEARCH_DEFAULT_LIMIT
+        limit = max(1, min(limit, USER_SEARCH_MAX_LIMIT))
+
+        upper_query = query.upper()
+        return (
+            User.objects.filter(is_active=True)
+            .annotate(username_upper=Upper("username"))
+            .filter(
+                Q(username__icontains=query)
+                | Q(email__icontains=query)
+                | Q(first_name__icontains=query)
+                | Q(last_name__icontains=query)
+                | Q(username_upper__trigram_similar=upper_query)
+            )
+            .annotate(
+                rank=Case(
+                    When(username__iexact=query, then=Value(0)),
+                    When(username__istartswith=query, then=Value(1)),
+                    default=Value(2),
+                    output_field=IntegerField(),
+                ),
+                similarity=TrigramSimilarity("username_upper", upper_query),
+            )
+            .only("id", "username", "first_name", "last_name", "image")
+            .order_by("rank", "-similarity", "username")[:limit]
+        )
+
+
 class UserUpdateView(generics.UpdateAPIView):
     permission_classes = [IsAuthenticated]
     serializer_class = UserSerializer
@@ -223,7 +287,7 @@ class UserChangePasswordView(generics.GenericAPIView):
         user = serializer.validated_data.get("user", None)
 
         if user is not None:
-            token = TokenObtainPairSerializer.get_token(user)
+            token = VersionedTokenObtainPairSerializer.get_token(user)
             return Response(
                 {
                     "refresh": str(token),
@@ -238,6 +302,7 @@ class UserChangePasswordView(generics.GenericAPIView):
 
 class ForgotPasswordView(generics.GenericAPIView):
     permission_classes = []
+    throttle_classes = [PasswordResetRateThrottle]
     serializer_class = ForgotPasswordSerializer
 
     def post(self, request, *args, **kwargs):
@@ -260,6 +325,7 @@ class ForgotPasswordView(generics.GenericAPIView):
 
 class VerifyForgotPasswordView(generics.GenericAPIView):
     permission_classes = []
+    throttle_classes = [OTPRateThrottle, OTPAccountRateThrottle]
     serializer_class = VerifyForgotPasswordSerializer
 
     def post(self, request, *args, **kwargs):
@@ -271,6 +337,7 @@ class VerifyForgotPasswordView(generics.GenericAPIView):
 
 class ChangeForgotPasswordView(generics.GenericAPIView):
     permission_classes = []
+    throttle_classes = [OTPRateThrottle, OTPAccountRateThrottle]
     serializer_class = ChangeForgotPasswordSerializer
 
     def post(self, request, *args, **kwargs):
@@ -279,7 +346,7 @@ class ChangeForgotPasswordView(generics.GenericAPIView):
         user = serializer.validated_data.get("user", None)
 
         if user is not None:
-            token = TokenObtainPairSerializer.get_token(user)
+            token = VersionedTokenObtainPairSerializer.get_token(user)
             return Response(
                 {
                     "refresh": str(token),
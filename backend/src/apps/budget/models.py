@@ -4,16 +4,20 @@ from django.db.models import Sum
 from decimal import Decimal
 from src.apps.expense.models import Expense, Category
 from src.apps.income.models import Income
+from src.apps.common.models import FieldTrackerMixin
 
 User = get_user_model()
 
-class Budget(models.Model):
+class Budget(FieldTrackerMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     month = models.DateField()
     category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True)
     threshold_percentage = models.FloatField(default=80.0)  # Percentage of income for this category
     amount = models.DecimalField(max_digits=12, decimal_places=2, null=True, blank=True) # Fixed budget amount
 
+    # Fields that change the allowed spend; saves touching nothing else skip the alert check
+    tracked_fields = ('month', 'category', 'threshold_percentage', 'amount')
+
     @property
     def total_income(self):
         """Total income of user for the month"""
@@ -1,90 +1,82 @@
-import google.generativeai as genai
-from django.conf import settings
 from datetime import datetime
 from decimal import Decimal
+
+from asgiref.sync import sync_to_async
 from django.db.models import Sum, Q
 from src.apps.expense.models import Expense, Category as ExpenseCategory
 from src.apps.budget.models import Budget
 from src.apps.income.models import Income
 from google.api_core.exceptions import GoogleAPIError, InvalidArgument
+from .backends import AIBackendError, get_ai_backend
 
 class FinancialAIService:
-    def __init__(self):
-        try:
-            genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
-        except Exception as e:
-            # Handle cases where the API key is not configured correctly
-            raise ValueError(f"Failed to configure Gemini API: {e}")
-
-    def get_user_financial_context(self, user):
-        """Gather user's financial data for AI context"""
-        current_month = datetime.now().month
-        current_year = datetime.now().year
-
-        # Get current month's expenses
-        monthly_expenses = Expense.objects.filter(
-            paid_by=user,
-            date__month=current_month,
-            date__year=current_year
-        ).select_related('category')
-
-        # Get current month's income
-        monthly_income = Income.objects.filter(
-            user=user,
-            date__month=current_month,
-            date__year=current_year
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-
-        # Get budgets
-        user_budgets = Budget.objects.filter(
-            user=user,
-            month__month=current_month,
-            month__year=current_year
-        ).select_related('category')
-
-        # Calculate expense totals by category
+    def __init__(self, backend=None):
+        # The backend is chosen by settings.CHATBOT_AI_BACKEND unless one is passed in
+        self.backend = backend or get_ai_backend()
+
+    async def aget_user_financial_context(self, user):
+        """
+        Gather the user's month of financial data for the AI context. The
+        recent expenses come from the month's rows already loaded instead of a
+        second query.
+        """
+        now = datetime.now()
+        expenses = [
+            expense
+            async for expense in Expense.objects.filter(
+                paid_by=user, date__month=now.month, date__year=now.year
+            ).select_related('category')
+        ]
+        income = await Income.objects.filter(
+            user=user, date__month=now.month, date__year=now.year
+        ).aaggregate(total=Sum('amount'))
+        budget_analysis = await self._abudget_analysis(user, now)
+
         expense_by_category = {}
         total_monthly_expenses = Decimal('0')
-
-        for expense in monthly_expenses:
-            category_name = expense.category.name
-            if category_name not in expense_by_category:
-                expense_by_category[category_name] = Decimal('0')
-            expense_by_category[category_name] += expense.amount
+        for expense in expenses:
+            category_name = expense.category.name if expense.category else 'Uncategorized'
+            expense_by_category[category_name] = expense_by_category.get(category_name, Decimal('0')) + expense.amount
             total_monthly_expenses += expense.amount
 
-        # Get recent expenses (last 5) - convert Decimal amounts to float
-        recent_expenses = []
-        for expense in monthly_expenses.order_by('-date')[:5]:
-            recent_expenses.append({
+        recent_expenses = [
+            {
                 'description': expense.description,
-                'amount': float(expense.amount),  # Convert to float
-                'category__name': expense.category.name,
-                'date': expense.date.isoformat()
-            })
-
-        # Budget analysis
-        budget_analysis = []
-        for budget in user_budgets:
-            budget_analysis.append({
-                'category': budget.category.name,
-                'allowed': float(budget.allowed_expense),
-                'spent': float(budget.total_expense),
-                'remaining': float(budget.remaining_budget),
-                'percentage_used': float(budget.total_expense / budget.allowed_expense * 100) if budget.allowed_expense > 0 else 0
-            })
+                'amount': float(expense.amount),
+                'category__name': expense.category.name if expense.category else 'Uncategorized',
+                'date': expense.date.isoformat(),
+            }
+            for expense in sorted(expenses, key=lambda expense: expense.date, reverse=True)[:5]
+        ]
 
-        # Return all values as floats for JSON serialization
         return {
-            'monthly_income': float(monthly_income),
+            'monthly_income': float(income['total'] or Decimal('0')),
             'monthly_expenses': float(total_monthly_expenses),
             'expense_by_category': {k: float(v) for k, v in expense_by_category.items()},
             'recent_expenses': recent_expenses,
             'budget_analysis': budget_analysis,
-            'month_year': f"{datetime.now().strftime('%B %Y')}"
+            'month_year': f"{now.strftime('%B %Y')}"
         }
 
+    @staticmethod
+    @sync_to_async
+    def _abudget_analysis(user, now):
+        # Budget totals are model properties that query on access, so they run in the sync thread
+        analysis = []
+        for budget in Budget.objects.filter(
+            user=user, month__month=now.month, month__year=now.year
+        ).select_related('category'):
+            allowed = budget.allowed_expense
+            spent = budget.total_expense
+            analysis.append({
+                'category': budget.category.name if budget.category else 'Overall',
+                'allowed': float(allowed),
+                'spent': float(spent),
+                'remaining': float(allowed - spent),
+                'percentage_used': float(spent / allowed * 100) if allowed > 0 else 0
+            })
+        return analysis
+
     def create_system_prompt(self, user_context):
         """Create a system prompt with user's financial context"""
 
@@ -127,28 +119,24 @@ Remember: You're helping young Nepalese people build better financial habits!"""
 
         return system_prompt
 
-    def get_ai_response_sync(self, user_message, user_context):
-        """Synchronous version for simpler implementation"""
-        try:
-            system_prompt = self.create_system_prompt(user_context)
-
-            # Combine system prompt and user message
-            full_prompt = f"{system_prompt}\n\nUser Question: {user_message}\n\nResponse:"
+    def build_prompt(self, user_message, user_context):
+        """Combine system prompt and user message"""
+        system_prompt = self.create_system_prompt(user_context)
+        return f"{system_prompt}\n\nUser Question: {user_message}\n\nResponse:"
 
-            response = self.model.generate_content(
+    async def aget_ai_response(self, user_message, user_context):
+        """Ask the backend for an answer; the worker is free while the model answers."""
+        try:
+            full_prompt = self.build_prompt(user_message, user_context)
+            response = await self.backend.agenerate(
                 full_prompt,
-                generation_config=genai.types.GenerationConfig(
-                    max_output_tokens=500,
-                    temperature=0.7,
-                )
+                max_output_tokens=500,
+                temperature=0.7,
             )
+            return response.strip()
 
-            return response.text.strip()
-        
-        except (GoogleAPIError, InvalidArgument) as e:
-            # Handle specific API errors
+        except (GoogleAPIError, InvalidArgument, AIBackendError) as e:
             return f"I ran into a problem with my AI brain. It seems like there's an API issue: {str(e)}"
-        
-        except Exception as e:
-            # Fallback response for any other unexpected errors
-            return f"I'm having trouble connecting right now, but I can see from your data that you've spent NPR {user_context['monthly_expenses']:,.2f} this month. Your recent expenses include some interesting items! Try asking me again in a moment."
\ No newline at end of file
+
+        except Exception:
+            return f"I'm having trouble connecting right now, but I can see from your data that you've spent NPR {user_context['monthly_expenses']:,.2f} this month. Your recent expenses include some interesting items! Try asking me again in a moment."
@@ -2,4 +2,7 @@ from django.apps import AppConfig
 
 class ChatbotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
-    name = 'src.apps.chatbot'
\ No newline at end of file
+    name = 'src.apps.chatbot'
+
+    def ready(self):
+        import src.apps.chatbot.signals  # noqa
@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import random
+import time
+from functools import lru_cache
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+
+class AIBackendError(Exception):
+    """Raised by a backend when the model call fails."""
+
+
+class BaseAIBackend:
+    """
+    Interface between FinancialAIService and a text generation model.
+    Subclasses implement ``generate``; ``stream`` and ``astream`` yield the
+    reply in chunks and default to a single chunk.
+    """
+
+    def generate(self, prompt, max_output_tokens=500, temperature=0.7):
+        raise NotImplementedError
+
+    async def agenerate(self, prompt, max_output_tokens=500, temperature=0.7):
+        """Async generate; backends without a native async client run it in a worker thread."""
+        return await asyncio.to_thread(self.generate, prompt, max_output_tokens, temperature)
+
+    def stream(self, prompt, max_output_tokens=500, temperature=0.7):
+        yield self.generate(prompt, max_output_tokens, temperature)
+
+    async def astream(self, prompt, max_output_tokens=500, temperature=0.7):
+        yield await self.agenerate(prompt, max_output_tokens, temperature)
+
+
+class GeminiBackend(BaseAIBackend):
+    """Google Gemini, the production backend."""
+
+    def __init__(self, model_name='gemini-1.5-flash'):
+        import google.generativeai as genai
+
+        try:
+            genai.configure(api_key=settings.GOOGLE_GEMINI_API_KEY)
+            self.model = genai.GenerativeModel(model_name)
+        except Exception as e:
+            # Handle cases where the API key is not configured correctly
+            raise ValueError(f"Failed to configure Gemini API: {e}")
+        self.genai = genai
+
+    def _generation_config(self, max_output_tokens, temperature):
+        return self.genai.types.GenerationConfig(
+            max_output_tokens=max_output_tokens,
+            temperature=temperature,
+        )
+
+    def generate(self, prompt, max_output_tokens=500, temperature=0.7):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._generation_config(max_output_tokens, temperature),
+        )
+        return response.text
+
+    async def agenerate(self, prompt, max_output_tokens=500, temperature=0.7):
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(max_output_tokens, temperature),
+        )
+        return response.text
+
+    def stream(self, prompt, max_output_tokens=500, temperature=0.7):
+        response = self.model.generate_content(
+            prompt,
+            generation_config=self._generation_config(max_output_tokens, temperature),
+            stream=True,
+        )
+        for chunk in response:
+            yield chunk.text
+
+    async def astream(self, prompt, max_output_tokens=500, temperature=0.7):
+        response = await self.model.generate_content_async(
+            prompt,
+            generation_config=self._generation_config(max_output_tokens, temperature),
+            stream=True,
+        )
+        async for chunk in response:
+            yield chunk.text
+
+
+class LocalStandInBackend(BaseAIBackend):
+    """
+    Offline stand-in for load and timeout testing of the chatbot endpoints.
+
+    Nothing leaves the machine. Latency, per-token delay and error rate come
+    from the CHATBOT_STANDIN_* settings. The reply is streamed a token at a
+    time after the time-to-first-token delay. The reply and its timing are
+    seeded from the prompt, so the same prompt always gets the same answer.
+    Failures are drawn per call from a stream seeded once per backend, so
+    repeated prompts still fail at the configured rate and a run is
+    reproducible.
+    """
+
+    WORDS = (
+        "Based on your spending this month, try setting aside a fixed amount "
+        "for savings first, then plan daily costs like transport, dal-bhat "
+        "and momo around what is left. Small weekly reviews of your budget "
+        "help you spot categories that are growing faster than expected."
+    ).split()
+
+    def __init__(self, latency_ms=None, jitter_ms=None, token_delay_ms=None, error_rate=None, seed=None):
+        self.latency_ms = settings.CHATBOT_STANDIN_LATENCY_MS if latency_ms is None else latency_ms
+        self.jitter_ms = settings.CHATBOT_STANDIN_JITTER_MS if jitter_ms is None else jitter_ms
+        self.token_delay_ms = settings.CHATBOT_STANDIN_TOKEN_DELAY_MS if token_delay_ms is None else token_delay_ms
+        self.error_rate = settings.CHATBOT_STANDIN_ERROR_RATE if error_rate is None else error_rate
+        self.seed = settings.CHATBOT_STANDIN_SEED if seed is None else seed
+        self._failures = random.Random(f"{self.seed}:failures")
+
+    def _rng(self, prompt):
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        return random.Random(f"{self.seed}:{digest}")
+
+    def _plan(self, prompt, max_output_tokens):
+        """Time to first token and the words to reply with, both fixed per prompt."""
+        rng = self._rng(prompt)
+        delay = (self.latency_ms + rng.uniform(0, self.jitter_ms)) / 1000
+        token_count = min(max_output_tokens, rng.randint(20, 80))
+        start = rng.randrange(len(self.WORDS))
+        words = [self.WORDS[(start + i) % len(self.WORDS)] for i in range(token_count)]
+        return delay, words
+
+    def _check_failure(self):
+        if self._failures.random() < self.error_rate:
+            raise AIBackendError("Simulated backend failure from the local stand-in")
+
+    def stream(self, prompt, max_output_tokens=500, temperature=0.7):
+        delay, words = self._plan(prompt, max_output_tokens)
+        time.sleep(delay)
+        self._check_failure()
+        for i, word in enumerate(words):
+            if self.token_delay_ms:
+                time.sleep(self.token_delay_ms / 1000)
+            yield word if i == 0 else f" {word}"
+
+    async def astream(self, prompt, max_output_tokens=500, temperature=0.7):
+        delay, words = self._plan(prompt, max_output_tokens)
+        await asyncio.sleep(delay)
+        self._check_failure()
+        for i, word in enumerate(words):
+            if self.token_delay_ms:
+                await asyncio.sleep(self.token_delay_ms / 1000)
+            yield word if i == 0 else f" {word}"
+
+    def generate(self, prompt, max_output_tokens=500, temperature=0.7):
+        return "".join(self.stream(prompt, max_output_tokens, temperature))
+
+    async def agenerate(self, prompt, max_output_tokens=500, temperature=0.7):
+        return "".join([chunk async for chunk in self.astream(prompt, max_output_tokens, temperature)])
+
+
+@lru_cache(maxsize=None)
+def get_ai_backend():
+    """Return the process-wide backend configured by CHATBOT_AI_BACKEND."""
+    return import_string(settings.CHATBOT_AI_BACKEND)()
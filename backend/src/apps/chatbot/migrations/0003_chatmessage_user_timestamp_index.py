@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chatbot', '0002_alter_chatmessage_context_data'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='chatmessage',
+            index=models.Index(fields=['user', 'timestamp'], name='chatmessage_user_ts_idx'),
+        ),
+    ]
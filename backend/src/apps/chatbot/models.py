@@ -3,6 +3,7 @@ import json
 from decimal import Decimal
 from django.db import models
 from src.apps.auth.models import User
+from src.apps.common.cache import CachedCounter
 
 
 class DecimalEncoder(json.JSONEncoder):
@@ -29,6 +30,15 @@ class ChatMessage(models.Model):
     
     class Meta:
         ordering = ['timestamp']
+        indexes = [
+            models.Index(fields=['user', 'timestamp'], name='chatmessage_user_ts_idx'),
+        ]
     
     def __str__(self):
-        return f"{self.user.username} - {self.message_type} - {self.timestamp}"
\ No newline at end of file
+        return f"{self.user.username} - {self.message_type} - {self.timestamp}"
+
+
+chat_message_counter = CachedCounter(
+    prefix='chatbot:message_count',
+    loader=lambda user_id: ChatMessage.objects.filter(user_id=user_id).count(),
+)
@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import ChatMessage, chat_message_counter
+
+
+# Counter moves wait for the commit, so a rolled-back save or delete leaves it alone
+@receiver(post_save, sender=ChatMessage)
+def increment_chat_message_count(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: chat_message_counter.incr(instance.user_id))
+
+
+@receiver(post_delete, sender=ChatMessage)
+def decrement_chat_message_count(sender, instance, **kwargs):
+    transaction.on_commit(lambda: chat_message_counter.decr(instance.user_id))
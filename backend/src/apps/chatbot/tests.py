@@ -0,0 +1,139 @@
+import asyncio
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .backends import AIBackendError, LocalStandInBackend
+from .models import ChatMessage, chat_message_counter
+
+
+class ChatHistoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("chat-user", "chat@example.com", "pw")
+        cls.other = get_user_model().objects.create_user("chat-other", "other@example.com", "pw")
+        cls.messages = [
+            ChatMessage.objects.create(user=cls.user, message=f"Message {i}", message_type='user')
+            for i in range(5)
+        ]
+        ChatMessage.objects.create(user=cls.other, message="Not mine", message_type='user')
+
+    def setUp(self):
+        chat_message_counter.reset(self.user.pk)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def history(self, **params):
+        response = self.client.get(reverse('chat_history'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def ids(self, data):
+        return [message['id'] for message in data['messages']]
+
+    def test_latest_page_in_chronological_order(self):
+        data = self.history(limit=2)
+
+        self.assertEqual(self.ids(data), [self.messages[3].pk, self.messages[4].pk])
+        self.assertTrue(data['has_more'])
+        self.assertEqual(data['total_count'], 5)
+
+    def test_pages_back_and_forward_from_a_cursor(self):
+        first = self.history(limit=2)
+        older = self.history(limit=2, before=first['oldest_id'])
+        oldest = self.history(limit=2, before=older['oldest_id'])
+
+        self.assertEqual(self.ids(older), [self.messages[1].pk, self.messages[2].pk])
+        self.assertEqual(self.ids(oldest), [self.messages[0].pk])
+        self.assertFalse(oldest['has_more'])
+
+        newer = self.history(limit=3, after=self.messages[1].pk)
+        self.assertEqual(self.ids(newer), [message.pk for message in self.messages[2:5]])
+        self.assertFalse(newer['has_more'])
+
+    def test_non_integer_cursor_is_rejected(self):
+        response = self.client.get(reverse('chat_history'), {'before': 'abc'})
+
+        self.assertEqual(response.status_code, 400)
+
+
+class ChatMessageCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("count-user", "count@example.com", "pw")
+
+    def setUp(self):
+        chat_message_counter.reset(self.user.pk)
+        self.assertEqual(chat_message_counter.get(self.user.pk), 0)
+
+    def test_counter_follows_committed_messages(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            message = ChatMessage.objects.create(user=self.user, message="Hi", message_type='user')
+        self.assertEqual(chat_message_counter.get(self.user.pk), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            message.delete()
+        self.assertEqual(chat_message_counter.get(self.user.pk), 0)
+
+    def test_rolled_back_message_is_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    ChatMessage.objects.create(user=self.user, message="Hi", message_type='user')
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+
+        self.assertEqual(chat_message_counter.get(self.user.pk), 0)
+
+
+class LocalStandInBackendTests(SimpleTestCase):
+
+    def backend(self, **options):
+        return LocalStandInBackend(**{'latency_ms': 0, 'jitter_ms': 0, 'token_delay_ms': 0, 'error_rate': 0, **options})
+
+    def test_streams_one_token_at_a_time(self):
+        chunks = list(self.backend().stream("How do I save?", max_output_tokens=5))
+
+        self.assertEqual(len(chunks), 5)
+        self.assertFalse(chunks[0].startswith(" "))
+        self.assertTrue(all(chunk.startswith(" ") for chunk in chunks[1:]))
+        self.assertEqual("".join(chunks), self.backend().generate("How do I save?", max_output_tokens=5))
+
+    def test_each_token_waits_the_token_delay(self):
+        backend = self.backend(latency_ms=200, token_delay_ms=10)
+
+        with mock.patch('src.apps.chatbot.backends.time.sleep') as sleep:
+            list(backend.stream("How do I save?", max_output_tokens=3))
+
+        self.assertEqual([call.args[0] for call in sleep.call_args_list], [0.2, 0.01, 0.01, 0.01])
+
+    def test_async_stream_matches_sync(self):
+        async def collect(backend):
+            return [chunk async for chunk in backend.astream("How do I save?", max_output_tokens=4)]
+
+        self.assertEqual(asyncio.run(collect(self.backend())), list(self.backend().stream("How do I save?", 4)))
+        self.assertEqual(
+            asyncio.run(self.backend().agenerate("How do I save?", 4)), self.backend().generate("How do I save?", 4)
+        )
+
+    def test_failures_are_reproducible_per_seed_and_vary_per_call(self):
+        def outcomes(seed):
+            backend = self.backend(error_rate=0.5, seed=seed)
+            results = []
+            for _ in range(20):
+                try:
+                    backend.generate("Same prompt", max_output_tokens=1)
+                    results.append(True)
+                except AIBackendError:
+                    results.append(False)
+            return results
+
+        self.assertEqual(outcomes(1), outcomes(1))
+        self.assertEqual(len(set(outcomes(1))), 2)
@@ -1,13 +1,21 @@
+import asyncio
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
+from django.db.models import Q, Subquery
+from django.http import JsonResponse
 from django.utils import timezone
 from decimal import Decimal
-from .models import ChatMessage
+from .models import ChatMessage, chat_message_counter
 from .ai_service import FinancialAIService
+from src.apps.common.async_views import async_api_view
+from src.apps.common.throttling import AIChatRateThrottle
 from .serializers import ChatMessageSerializer, ChatRequestSerializer
 
+CHAT_HISTORY_MAX_LIMIT = 100
+
 
 def convert_decimals_to_float(data):
     """Recursively convert Decimal objects to float for JSON serialization"""
@@ -21,17 +29,18 @@ def convert_decimals_to_float(data):
         return data
 
 
-@api_view(['POST'])
-@permission_classes([IsAuthenticated])
-def chat_with_ai(request):
+@async_api_view(['POST'], throttle_classes=[AIChatRateThrottle])
+async def chat_with_ai(request):
     """
     Handle chat messages with AI
     Expects: {"message": "user message"}
     Returns: {"ai_response": "response", "context_used": {...}}
+
+    Async so a worker is not held while Gemini answers; the user's message
+    is stored while the model call is in flight.
     """
     serializer = ChatRequestSerializer(data=request.data)
-    if not serializer.is_valid():
-        return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+    serializer.is_valid(raise_exception=True)
 
     user_message = serializer.validated_data['message']
     user = request.user
@@ -39,33 +48,31 @@ def chat_with_ai(request):
     try:
         # Initialize AI service
         ai_service = FinancialAIService()
-        
-        # Get user's financial context
-        user_context = ai_service.get_user_financial_context(user)
-        
-        # Convert Decimals to floats for JSON serialization
+
+        # Get user's financial context (already JSON serializable floats)
+        user_context = await ai_service.aget_user_financial_context(user)
         serializable_context = convert_decimals_to_float(user_context)
-        
-        # Save user message
-        user_chat = ChatMessage.objects.create(
-            user=user,
-            message=user_message,
-            message_type='user',
-            context_data=serializable_context  # Now JSON serializable
+
+        # Save user message and get AI response concurrently
+        user_chat, ai_response = await asyncio.gather(
+            ChatMessage.objects.acreate(
+                user=user,
+                message=user_message,
+                message_type='user',
+                context_data=serializable_context
+            ),
+            ai_service.aget_ai_response(user_message, user_context),
         )
-        
-        # Get AI response
-        ai_response = ai_service.get_ai_response_sync(user_message, user_context)
-        
+
         # Save AI response
-        ai_chat = ChatMessage.objects.create(
+        ai_chat = await ChatMessage.objects.acreate(
             user=user,
             message=ai_response,
             message_type='ai',
             context_data=serializable_context
         )
-        
-        return Response({
+
+        return JsonResponse({
             'ai_response': ai_response,
             'context_used': serializable_context,
             'user_message_id': user_chat.id,
@@ -74,7 +81,7 @@ def chat_with_ai(request):
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
-        return Response({
+        return JsonResponse({
             'error': 'Failed to generate AI response',
             'details': str(e)
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -84,48 +91,84 @@ def chat_with_ai(request):
 @permission_classes([IsAuthenticated])
 def chat_history(request):
     """
-    Get user's chat history
-    Optional query params: 
-    - limit: number of messages (default: 50)
+    Get user's chat history using keyset pagination
+    Optional query params:
+    - limit: number of messages (default: 50, max: 100)
+    - before: message id; returns the messages right before it (paging back)
+    - after: message id; returns the messages right after it (catching up)
+    Without a cursor the latest messages are returned.
     """
-    limit = int(request.GET.get('limit', 50))
-    
-    messages = ChatMessage.objects.filter(
-        user=request.user
-    ).order_by('-timestamp')[:limit]
-    
-    # Reverse to get chronological order
-    messages = list(reversed(messages))
-    
-    serializer = ChatMessageSerializer(messages, many=True)
-    
+    try:
+        limit = int(request.GET.get('limit', 50))
+        before = request.GET.get('before')
+        after = request.GET.get('after')
+        before = int(before) if before else None
+        after = int(after) if after else None
+    except ValueError:
+        return Response({
+            'error': 'limit, before and after must be integers'
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+    limit = min(max(limit, 1), CHAT_HISTORY_MAX_LIMIT)
+    messages = ChatMessage.objects.filter(user=request.user)
+
+    cursor_id = before or after
+    if cursor_id:
+        # Resolve the cursor timestamp inside the same statement; (timestamp, id)
+        # is compared as a pair so messages sharing a timestamp are not skipped.
+        cursor_ts = Subquery(
+            ChatMessage.objects.filter(user=request.user, pk=cursor_id).values('timestamp')[:1]
+        )
+        if before:
+            messages = messages.filter(
+                Q(timestamp__lt=cursor_ts) | Q(timestamp=cursor_ts, id__lt=cursor_id)
+            )
+        else:
+            messages = messages.filter(
+                Q(timestamp__gt=cursor_ts) | Q(timestamp=cursor_ts, id__gt=cursor_id)
+            )
+
+    if after and not before:
+        page = list(messages.order_by('timestamp', 'id')[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+    else:
+        page = list(messages.order_by('-timestamp', '-id')[:limit + 1])
+        has_more = len(page) > limit
+        # Reverse to get chronological order
+        page = list(reversed(page[:limit]))
+
+    serializer = ChatMessageSerializer(page, many=True)
+
     return Response({
         'messages': serializer.data,
-        'total_count': ChatMessage.objects.filter(user=request.user).count()
+        'total_count': chat_message_counter.get(request.user.pk),
+        'has_more': has_more,
+        'oldest_id': page[0].id if page else None,
+        'newest_id': page[-1].id if page else None,
     }, status=status.HTTP_200_OK)
 
 
-@api_view(['GET'])
-@permission_classes([IsAuthenticated])
-def user_financial_summary(request):
+@async_api_view(['GET'])
+async def user_financial_summary(request):
     """
     Get user's financial summary for the AI context
     Useful for debugging or showing users what data AI sees
     """
     try:
         ai_service = FinancialAIService()
-        user_context = ai_service.get_user_financial_context(request.user)
-        
+        user_context = await ai_service.aget_user_financial_context(request.user)
+
         # Convert Decimals for JSON response
         serializable_context = convert_decimals_to_float(user_context)
-        
-        return Response({
+
+        return JsonResponse({
             'financial_summary': serializable_context,
             'summary_generated_at': timezone.now().isoformat()
         }, status=status.HTTP_200_OK)
 
     except Exception as e:
-        return Response({
+        return JsonResponse({
             'error': 'Failed to generate financial summary',
             'details': str(e)
-        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
\ No newline at end of file
+        }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
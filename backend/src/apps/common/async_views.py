@@ -0,0 +1,80 @@
+import json
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.views.decorators.csrf import csrf_exempt
+from drf_standardized_errors.settings import package_settings
+from rest_framework import exceptions
+
+from src.apps.auth.authentication import CachedJWTAuthentication
+
+
+def error_response(exc, request=None):
+    """
+    JsonResponse for a DRF exception, formatted by the same
+    drf_standardized_errors formatter the DRF views go through, so dict and
+    list details (simplejwt's token errors, serializer errors) flatten the
+    same way.
+    """
+    formatter = package_settings.EXCEPTION_FORMATTER_CLASS(exc, {"view": None, "request": request}, exc)
+    response = JsonResponse(formatter.run(), status=exc.status_code)
+    if getattr(exc, "auth_header", None):
+        response["WWW-Authenticate"] = exc.auth_header
+    if getattr(exc, "wait", None):
+        response["Retry-After"] = "%d" % exc.wait
+    return response
+
+
+def async_api_view(methods, throttle_classes=()):
+    """
+    Run an ``async def`` view under ASGI with the API's JWT authentication
+    and throttles, which DRF's @api_view cannot do for coroutines.
+
+    The wrapped view receives a Django request with ``user``, ``auth`` and a
+    parsed JSON ``data`` attached, and returns a JsonResponse. DRF exceptions
+    it raises (e.g. from ``is_valid(raise_exception=True)``) become the
+    standard error body. Only the authentication and throttle checks run in a
+    worker thread; the view's own awaits do not hold one.
+    """
+
+    def decorator(view):
+        @csrf_exempt
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            try:
+                return await handle(request, *args, **kwargs)
+            except exceptions.APIException as exc:
+                return error_response(exc, request)
+
+        async def handle(request, *args, **kwargs):
+            if request.method not in methods:
+                raise exceptions.MethodNotAllowed(request.method)
+
+            authenticator = CachedJWTAuthentication()
+            try:
+                authenticated = await sync_to_async(authenticator.authenticate)(request)
+                if authenticated is None:
+                    raise exceptions.NotAuthenticated()
+            except (exceptions.AuthenticationFailed, exceptions.NotAuthenticated) as exc:
+                exc.auth_header = authenticator.authenticate_header(request)
+                raise
+            request.user, request.auth = authenticated
+
+            for throttle_class in throttle_classes:
+                throttle = throttle_class()
+                if not await sync_to_async(throttle.allow_request)(request, None):
+                    raise exceptions.Throttled(throttle.wait())
+
+            request.data = {}
+            if request.method in ("POST", "PUT", "PATCH") and request.body:
+                try:
+                    request.data = json.loads(request.body)
+                except ValueError:
+                    raise exceptions.ParseError("Malformed JSON body.")
+
+            return await view(request, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,73 @@
+from django.core.cache import cache
+
+
+class CachedCounter:
+    """
+    Per-object integer counter kept in the cache.
+
+    The value is loaded from the database once through ``loader`` and then
+    maintained with atomic increments, so warm reads never touch the database.
+    If the cache is unavailable every read falls back to ``loader``.
+    """
+
+    def __init__(self, prefix, loader, timeout=60 * 60 * 24):
+        self.prefix = prefix
+        self.loader = loader
+        self.timeout = timeout
+
+    def key(self, pk):
+        return f"{self.prefix}:{pk}"
+
+    def get(self, pk):
+        key = self.key(pk)
+        try:
+            value = cache.get(key)
+        except Exception:
+            return self.loader(pk)
+
+        if value is None:
+            value = self.loader(pk)
+            try:
+                cache.add(key, value, self.timeout)
+            except Exception:
+                pass
+        return value
+
+    def incr(self, pk, delta=1):
+        try:
+            cache.incr(self.key(pk), delta)
+        except ValueError:
+            # Cold key: the next get() loads the real value from the database.
+            pass
+        except Exception:
+            self.reset(pk)
+
+    def decr(self, pk, delta=1):
+        self.incr(pk, -delta)
+
+    def set(self, pk, value):
+        try:
+            cache.set(self.key(pk), value, self.timeout)
+        except Exception:
+            pass
+
+    def reset(self, pk):
+        try:
+            cache.delete(self.key(pk))
+        except Exception:
+            pass
+
+    def get_many(self, pks):
+        """Return the cached values that exist for ``pks``, keyed by pk. Never hits the loader."""
+        keys = {self.key(pk): pk for pk in pks}
+        try:
+            found = cache.get_many(list(keys))
+        except Exception:
+            return {}
+        return {keys[key]: value for key, value in found.items()}
+
+    def set_many(self, values):
+        try:
+            cache.set_many({self.key(pk): value for pk, value in values.items()}, self.timeout)
+        except Exception:
+            pass
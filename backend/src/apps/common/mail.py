@@ -0,0 +1,220 @@
+import json
+
+import redis
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+
+from src.utility.redis_client import get_redis_connection
+
+
+class MailPriority:
+    IMMEDIATE = "immediate"  # OTP and anything the user is waiting on
+    NORMAL = "normal"  # buffered and flushed in batches over one connection
+    DIGEST = "digest"  # coalesced into a single email per recipient
+
+
+OUTBOX_KEY = "mail:outbox"
+DIGEST_RECIPIENTS_KEY = "mail:digest:recipients"
+# Messages that failed MAIL_MAX_TRIES times, kept for inspection instead of retried forever
+DEAD_LETTER_KEY = "mail:dead"
+
+
+def digest_key(email):
+    return f"mail:digest:{email}"
+
+
+def build_message(subject, body, recipients):
+    return EmailMessage(
+        subject=subject,
+        body=body,
+        from_email=settings.EMAIL_HOST_USER,
+        to=recipients,
+    )
+
+
+def send_messages(messages):
+    """Deliver all messages over a single backend connection."""
+    if not messages:
+        return 0
+    connection = get_connection(fail_silently=False)
+    return connection.send_messages(messages)
+
+
+def enqueue_mail(subject, body, recipients, priority=MailPriority.NORMAL):
+    """
+    Hand a message to the outbound pipeline.
+
+    Immediate mail is delivered right away. Normal mail waits in the Redis
+    outbox until flush_outbox() sends it in a batch, and digest mail is held
+    per recipient until flush_digests() folds it into one email. If Redis is
+    unreachable the message is delivered directly instead of being dropped.
+    """
+    if not recipients:
+        return
+    if priority == MailPriority.IMMEDIATE:
+        send_messages([build_message(subject, body, recipients)])
+        return
+
+    payload = json.dumps({"subject": subject, "body": body, "to": recipients})
+    try:
+        connection = get_redis_connection()
+        if priority == MailPriority.DIGEST:
+            pipe = connection.pipeline()
+            for email in recipients:
+                pipe.rpush(digest_key(email), payload)
+                pipe.sadd(DIGEST_RECIPIENTS_KEY, email)
+            pipe.execute()
+        else:
+            connection.rpush(OUTBOX_KEY, payload)
+    except redis.RedisError as e:
+        print(f"Mail outbox unavailable, sending directly to {recipients}. Error: {e}")
+        send_messages([build_message(subject, body, recipients)])
+
+
+def _pop_list(connection, key, count):
+    """Atomically take up to ``count`` items from the head of a Redis list."""
+    pipe = connection.pipeline(transaction=True)
+    pipe.lrange(key, 0, count - 1)
+    pipe.ltrim(key, count, -1)
+    items, _ = pipe.execute()
+    return items
+
+
+def _send_each(messages):
+    """
+    Send messages one at a time over a single backend connection and return
+    the indexes of the ones that failed, so a refused recipient does not take
+    the rest of the batch down with it. Raises only when the connection
+    cannot be opened, in which case nothing was sent.
+    """
+    connection = get_connection(fail_silently=False)
+    connection.open()
+    failed = []
+    try:
+        for i, message in enumerate(messages):
+            try:
+                connection.send_messages([message])
+            except Exception as e:
+                print(f"Failed to send mail to {message.to}. Error: {e}")
+                failed.append(i)
+    finally:
+        connection.close()
+    return failed
+
+
+def _count_failure(pipe, payload):
+    """
+    Bump a failed payload's try count. Returns it encoded for another try, or
+    None once it has used up MAIL_MAX_TRIES and was moved to the dead letters.
+    """
+    payload["tries"] = payload.get("tries", 0) + 1
+    item = json.dumps(payload)
+    if payload["tries"] >= settings.MAIL_MAX_TRIES:
+        pipe.rpush(DEAD_LETTER_KEY, item)
+        return None
+    return item
+
+
+def flush_outbox(batch_size=None):
+    """
+    Send buffered mail in batches, each batch over one SMTP connection.
+
+    Messages that fail go to the back of the outbox once the flush is done,
+    so they neither block the rest nor get retried in the same pass; after
+    MAIL_MAX_TRIES attempts they are moved to the dead-letter list. Returns
+    the number of messages sent.
+    """
+    batch_size = batch_size or settings.MAIL_OUTBOX_BATCH_SIZE
+    connection = get_redis_connection()
+    sent = 0
+    failed = []
+    try:
+        while True:
+            items = _pop_list(connection, OUTBOX_KEY, batch_size)
+            if not items:
+                return sent
+
+            payloads = [json.loads(item) for item in items]
+            messages = [build_message(data["subject"], data["body"], data["to"]) for data in payloads]
+            try:
+                failed_indexes = _send_each(messages)
+            except Exception:
+                # The mail server is unreachable; put the untouched batch back as it was
+                connection.lpush(OUTBOX_KEY, *reversed(items))
+                raise
+            sent += len(messages) - len(failed_indexes)
+            failed.extend(payloads[i] for i in failed_indexes)
+
+            if len(items) < batch_size:
+                return sent
+    finally:
+        if failed:
+            pipe = connection.pipeline()
+            retries = [item for item in (_count_failure(pipe, payload) for payload in failed) if item]
+            if retries:
+                pipe.rpush(OUTBOX_KEY, *retries)
+            pipe.execute()
+
+
+def flush_digests(batch_size=None):
+    """
+    Fold each recipient's pending low-priority alerts into one digest email.
+
+    A recipient whose digest fails keeps their alerts for the next flush, up
+    to MAIL_MAX_TRIES attempts per alert before it is dead-lettered. Returns
+    the number of digests sent.
+    """
+    batch_size = batch_size or settings.MAIL_DIGEST_BATCH_SIZE
+    connection = get_redis_connection()
+    sent = 0
+    failed = []
+    try:
+        while True:
+            emails = connection.spop(DIGEST_RECIPIENTS_KEY, batch_size)
+            if not emails:
+                return sent
+
+            messages = []
+            taken = []
+            for email in emails:
+                email = email.decode() if isinstance(email, bytes) else email
+                pipe = connection.pipeline(transaction=True)
+                pipe.lrange(digest_key(email), 0, -1)
+                pipe.delete(digest_key(email))
+                items, _ = pipe.execute()
+                if not items:
+                    continue
+                taken.append((email, items))
+
+                alerts = [json.loads(item) for item in items]
+                if len(alerts) == 1:
+                    messages.append(build_message(alerts[0]["subject"], alerts[0]["body"], [email]))
+                    continue
+
+                sections = [f"{alert['subject']}\n{alert['body']}" for alert in alerts]
+                body = "Here is a summary of your recent alerts:\n\n" + "\n\n".join(sections)
+                messages.append(build_message(f"You have {len(alerts)} new alerts", body, [email]))
+
+            if not messages:
+                continue
+            try:
+                failed_indexes = _send_each(messages)
+            except Exception:
+                # The mail server is unreachable; restore every pending alert as it was
+                pipe = connection.pipeline()
+                for email, items in taken:
+                    pipe.lpush(digest_key(email), *reversed(items))
+                    pipe.sadd(DIGEST_RECIPIENTS_KEY, email)
+                pipe.execute()
+                raise
+            sent += len(messages) - len(failed_indexes)
+            failed.extend(taken[i] for i in failed_indexes)
+    finally:
+        if failed:
+            pipe = connection.pipeline()
+            for email, items in failed:
+                retries = [item for item in (_count_failure(pipe, json.loads(item)) for item in items) if item]
+                if retries:
+                    pipe.lpush(digest_key(email), *reversed(retries))
+                    pipe.sadd(DIGEST_RECIPIENTS_KEY, email)
+            pipe.execute()
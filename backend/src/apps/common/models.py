@@ -1,4 +1,5 @@
 from django.db import models
+from django.db.models.fields.files import FieldFile
 import uuid
 
 
@@ -20,4 +21,54 @@ class BaseModel(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
-        abstract = True
\ No newline at end of file
+        abstract = True
+
+class FieldTrackerMixin:
+    """
+    Remembers the values of ``tracked_fields`` as loaded from the database, so
+    save() and signal handlers can ask what changed without re-reading the row.
+
+    The snapshot is taken in from_db() and refreshed after every save, which
+    means post_save receivers still see the pre-save values. Instances that
+    were not loaded from the database report every field as changed.
+    """
+    tracked_fields = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _tracked_value(self, name):
+        value = self.__dict__.get(self._meta.get_field(name).attname, models.DEFERRED)
+        # File fields hold a FieldFile once accessed; compare by stored name
+        return value.name if isinstance(value, FieldFile) else value
+
+    def _snapshot_tracked_fields(self):
+        self._tracked_initial = {}
+        for name in self.tracked_fields:
+            value = self._tracked_value(name)
+            if value is not models.DEFERRED:
+                self._tracked_initial[name] = value
+
+    def has_changed(self, name):
+        initial = getattr(self, "_tracked_initial", {})
+        if name not in initial:
+            return True
+        return self._tracked_value(name) != initial[name]
+
+    def previous(self, name):
+        """Value of the field when it was loaded, or None if unknown."""
+        return getattr(self, "_tracked_initial", {}).get(name)
+
+    def changed_fields(self):
+        return [name for name in self.tracked_fields if self.has_changed(name)]
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields()
+
+    def refresh_from_db(self, *args, **kwargs):
+        super().refresh_from_db(*args, **kwargs)
+        self._snapshot_tracked_fields()
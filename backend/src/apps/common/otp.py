@@ -1,7 +1,12 @@
+import hashlib
+import hmac
+
+import redis
 from src.apps.auth.models import User
 from django.utils.crypto import get_random_string
-from django.utils import timezone
+from src.apps.common.mail import MailPriority
 from src.apps.common.tasks import send_user_mail
+from src.utility.redis_client import get_redis_connection
 from django.conf import settings
 
 class OTPAction:
@@ -9,7 +14,46 @@ class OTPAction:
     RESET = "Reset"
 
 
+# Checks the try budget and the code in one atomic step. Returns 1 when the
+# code matches (and consumes it), 0 for a wrong code, -1 when there is no live
+# code (never sent or expired) and -2 once the tries are used up.
+VERIFY_OTP_SCRIPT = """
+local key = KEYS[1]
+local tries = redis.call('HGET', key, 'tries')
+if not tries then
+    return -1
+end
+local max_tries = tonumber(ARGV[2])
+if tonumber(tries) >= max_tries then
+    return -2
+end
+if redis.call('HGET', key, 'code') == ARGV[1] then
+    redis.call('DEL', key)
+    return 1
+end
+if redis.call('HINCRBY', key, 'tries', 1) >= max_tries then
+    return -2
+end
+return 0
+"""
+
+_verify_otp = None
+
+
+def _verify_otp_script():
+    global _verify_otp
+    if _verify_otp is None:
+        _verify_otp = get_redis_connection().register_script(VERIFY_OTP_SCRIPT)
+    return _verify_otp
+
+
 class OTPhandlers:
+    """
+    One-time codes live in Redis, not on the User row: a hash per user and
+    action holding the code's HMAC and a try counter, expiring after
+    ``valid_period`` seconds. The database is only written once a code is
+    verified.
+    """
 
     def __init__(
         self,
@@ -23,40 +67,46 @@ class OTPhandlers:
         self.action = action
         self.valid_period = valid_period
 
+    @property
+    def key(self):
+        return f"otp:{self.action.lower()}:{self.user.pk}"
+
+    def _digest(self, otp):
+        return hmac.new(
+            settings.SECRET_KEY.encode(), f"{self.key}:{otp}".encode(), hashlib.sha256
+        ).hexdigest()
+
     def generate_otp(self):
         otp = get_random_string(length=6, allowed_chars="0123456789")
-        self.user.otp = otp
-        self.user.otp_created_at = timezone.now()
-        self.user.save()
+        pipe = get_redis_connection().pipeline(transaction=True)
+        pipe.delete(self.key)
+        pipe.hset(self.key, mapping={"code": self._digest(otp), "tries": 0})
+        pipe.expire(self.key, self.valid_period)
+        pipe.execute()
         return otp
 
     def verify_otp(self, otp):
-        if self.user.otp != otp:
-            self.user.otp_tries += 1
-            self.user.save()
-            if self.user.otp_tries >= 3:
-                return False, "OTP Tried too many times"
+        try:
+            result = _verify_otp_script()(keys=[self.key], args=[self._digest(otp), settings.OTP_MAX_TRIES])
+        except redis.RedisError as e:
+            print(f"OTP store unavailable for user {self.user.pk}. Error: {e}")
+            return False, "OTP verification is temporarily unavailable"
 
-            return False, "Invalid OTP"
-
-        if (
-            self.user.otp_created_at
-            and self.user.otp_created_at + timezone.timedelta(minutes=self.valid_period)
-            < timezone.now()
-        ):
+        if result == -1:
             return False, "OTP expired"
+        if result == -2:
+            return False, "OTP Tried too many times"
+        if result != 1:
+            return False, "Invalid OTP"
 
-        self.user.otp = None
-        self.user.otp_tries = 0
-        self.user.otp_created_at = None
-        self.user.email_verified = True
-        self.user.save()
+        if not self.user.email_verified:
+            self.user.email_verified = True
+            self.user.save(update_fields=["email_verified"])
         return True, "OTP Verified"
 
     def send_otp(self):
         otp = self.generate_otp()
         subject = f"{self.action} OTP"
-        receiver = self.user.email
         # if self.action == OTPAction.LOGIN:
         message = f"Hi {self.user.first_name} {self.user.last_name},\n\nYour {self.action} OTP is: {otp}"
         # else:
@@ -66,4 +116,6 @@ class OTPhandlers:
         #     self.user.set_password(random_password)
         #     self.user.save()
 
-        send_user_mail.delay(subject, [receiver], message)
+        send_user_mail.delay(
+            subject, [], message, user_ids=[str(self.user.pk)], priority=MailPriority.IMMEDIATE
+        )
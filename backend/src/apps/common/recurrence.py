@@ -0,0 +1,72 @@
+from datetime import date, datetime, time
+
+from dateutil.rrule import rrulestr
+
+
+class RecurrenceError(ValueError):
+    """Raised for recurrence rules the app cannot schedule."""
+
+
+def _as_datetime(value):
+    if isinstance(value, datetime):
+        return value
+    return datetime.combine(value, time.min)
+
+
+def _normalize(rule):
+    rule = (rule or "").strip()
+    if rule.upper().startswith("RRULE:"):
+        rule = rule[len("RRULE:"):]
+    return rule
+
+
+def parse_rule(rule, dtstart):
+    """
+    Build a dateutil rrule from an RFC 5545 RRULE string such as
+    ``FREQ=MONTHLY;BYMONTHDAY=1``. A leading ``RRULE:`` is optional.
+
+    Occurrences are materialized one at a time from a moving start, so COUNT
+    cannot be honoured; bounded series must use UNTIL instead.
+    """
+    rule = _normalize(rule)
+    if not rule:
+        raise RecurrenceError("Recurrence rule is empty.")
+    if "COUNT=" in rule.upper():
+        raise RecurrenceError("COUNT is not supported; use UNTIL to end a series.")
+    try:
+        return rrulestr(rule, dtstart=_as_datetime(dtstart))
+    except (ValueError, TypeError) as e:
+        raise RecurrenceError(f"Invalid recurrence rule: {e}")
+
+
+def validate_rule(rule, dtstart):
+    """Return the normalized rule string, or raise RecurrenceError."""
+    parse_rule(rule, dtstart)
+    return _normalize(rule)
+
+
+def next_occurrence(rule, dtstart, after, inclusive=False):
+    """
+    First occurrence after ``after`` (or on it, when inclusive), or None when
+    the series has ended. Dates in give dates out.
+    """
+    occurrence = parse_rule(rule, dtstart).after(_as_datetime(after), inc=inclusive)
+    if occurrence is None:
+        return None
+    if isinstance(dtstart, date) and not isinstance(dtstart, datetime):
+        return occurrence.date()
+    return occurrence
+
+
+def occurrences_between(rule, dtstart, start, end, limit=None):
+    """
+    Occurrences in the inclusive range [start, end], at most ``limit`` of them.
+    Dates in give dates out.
+    """
+    as_date = isinstance(dtstart, date) and not isinstance(dtstart, datetime)
+    occurrences = []
+    for occurrence in parse_rule(rule, dtstart).xafter(_as_datetime(start), inc=True):
+        if occurrence > _as_datetime(end) or (limit is not None and len(occurrences) >= limit):
+            break
+        occurrences.append(occurrence.date() if as_date else occurrence)
+    return occurrences
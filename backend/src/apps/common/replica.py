@@ -0,0 +1,81 @@
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+
+from src.utility.db_router import (
+    has_recent_write,
+    mark_recent_write,
+    replica_available,
+    restore_replica_reads,
+    use_replica_reads,
+)
+
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReplicaReadMixin:
+    """
+    For report and analytics views that can tolerate a little replication lag.
+    Safe requests read from the replica, unless the user wrote something in
+    the last DATABASE_REPLICA_STICKY_SECONDS, in which case they stay on the
+    primary so they see their own changes.
+    """
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if request.method not in SAFE_METHODS or not replica_available():
+            return
+        user = request.user
+        if user and user.is_authenticated and has_recent_write(user.pk):
+            return
+        self._replica_token = use_replica_reads()
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "_replica_token", None)
+        if token is not None:
+            restore_replica_reads(token)
+            self._replica_token = None
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
+class StickyWritesMiddleware:
+    """
+    Remembers which users just wrote, so ReplicaReadMixin keeps their next
+    reads on the primary. DRF copies the authenticated user onto the Django
+    request, so it is available here once the view has run.
+
+    Works in both sync and async chains, so it does not force the ASGI
+    handler to run the async views through a sync adapter.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(self.get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        response = self.get_response(request)
+        if self.is_write(request, response):
+            self.remember_writer(request)
+        return response
+
+    async def __acall__(self, request):
+        response = await self.get_response(request)
+        if self.is_write(request, response):
+            # request.user may still be the lazy session user, which queries on access
+            await sync_to_async(self.remember_writer)(request)
+        return response
+
+    @staticmethod
+    def is_write(request, response):
+        return request.method not in SAFE_METHODS and response.status_code < 400 and replica_available()
+
+    @staticmethod
+    def remember_writer(request):
+        user = getattr(request, "user", None)
+        if user is not None and user.is_authenticated:
+            mark_recent_write(user.pk)
@@ -1,38 +1,62 @@
 from celery import shared_task
-from django.core.mail import EmailMessage
-from django.conf import settings
-from src.apps.notification.models import Notification
+from src.apps.common.mail import MailPriority, enqueue_mail, flush_digests, flush_outbox
+from src.apps.notification.services import NotificationService
 from src.apps.remainder.models import Reminder
+from src.apps.remainder.services import ReminderService
+from src.apps.expense.services import RecurringExpenseService
+from src.apps.lend.services import LoanAccrualService
+from src.apps.income.services import WalletService
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 
 @shared_task
-def send_user_mail(subject, recipients, message, create_notification=True):
+def send_user_mail(subject, recipients=None, message="", create_notification=True, user_ids=None,
+                   priority=MailPriority.NORMAL):
+    """
+    Send one email to all recipients and fan out in-app notifications.
+
+    Recipients can be given as email addresses, as user ids (preferred when the
+    caller already holds the user objects), or both. Each form is resolved with
+    a single query and notifications are inserted with one bulk INSERT.
+
+    The email goes through the outbound pipeline: ``priority`` picks between
+    immediate delivery (OTP), the batched outbox, and the per-user digest.
+    """
+    User = get_user_model()
+    recipients = list(recipients or [])
+    user_ids = [str(pk) for pk in (user_ids or [])]
+
+    recipient_ids = set()
+    resolved_emails = set()
+    if user_ids:
+        for pk, email in User.objects.filter(id__in=user_ids).values_list('id', 'email'):
+            recipient_ids.add(pk)
+            resolved_emails.add(email)
+            if email not in recipients:
+                recipients.append(email)
+
     # 1️⃣ Send email
     try:
-        mail = EmailMessage(
-            subject=subject,
-            body=message,
-            from_email=settings.EMAIL_HOST_USER,
-            to=recipients
-        )
-        mail.send(fail_silently=False)
-        print(f"Email sent successfully to: {recipients}")
+        enqueue_mail(subject, message, recipients, priority=priority)
+        print(f"Email queued ({priority}) for: {recipients}")
     except Exception as e:
         print(f"Failed to send email to {recipients}. Error: {e}")
 
     # 2️⃣ Create in-app notification
     if create_notification:
-        User = get_user_model()
-        for email in recipients:
-            try:
-                user = User.objects.get(email=email)
-                Notification.objects.create(recipient=user, message=message)
-                print(f"Notification created for user with email: {email}")
-            except User.DoesNotExist:
-                print(f"Skipping notification creation: No user found with email '{email}'.")
-            except Exception as e:
-                print(f"Failed to create notification for user '{email}'. Error: {e}")
+        unresolved = [email for email in recipients if email not in resolved_emails]
+        if unresolved:
+            found = dict(User.objects.filter(email__in=unresolved).values_list('email', 'id'))
+            for email in unresolved:
+                if email not in found:
+                    print(f"Skipping notification creation: No user found with email '{email}'.")
+            recipient_ids.update(found.values())
+
+        try:
+            NotificationService.notify_users(recipient_ids, message)
+            print(f"Notifications created for {len(recipient_ids)} user(s)")
+        except Exception as e:
+            print(f"Failed to create notifications for {recipients}. Error: {e}")
 
 
 @shared_task
@@ -47,10 +71,8 @@ def send_reminder_notification(reminder_id):
         # Only proceed if the reminder is active and the due date has passed
         if reminder.is_active and reminder.due_date <= timezone.now():
             # Create a simple notification record
-            Notification.objects.create(
-                recipient=reminder.recipient,
-                message=f"Reminder: {reminder.message}",
-                is_read=False
+            NotificationService.notify_users(
+                [reminder.recipient_id], f"Reminder: {reminder.message}"
             )
             print(f"Reminder notification sent for ID {reminder_id}")
 
@@ -60,3 +82,73 @@ def send_reminder_notification(reminder_id):
 
     except Reminder.DoesNotExist:
         print(f"Reminder with ID {reminder_id} not found.")
+
+
+@shared_task
+def sweep_due_reminders():
+    """Deliver all due reminders in batches; safe to run on several workers at once."""
+    delivered = ReminderService.sweep_due_reminders()
+    if delivered:
+        print(f"Sent {delivered} due reminder(s)")
+    return delivered
+
+
+@shared_task
+def materialize_recurring_expenses():
+    """Create the expenses for recurring templates that fall inside the rolling window."""
+    created = RecurringExpenseService.materialize_due()
+    if created:
+        print(f"Created {created} recurring expense(s)")
+    return created
+
+
+@shared_task
+def accrue_lend_interest():
+    """Nightly interest accrual and overdue detection for open lend transactions."""
+    result = LoanAccrualService.run()
+    print(f"Accrued interest on {result['accrued']} transaction(s), {result['newly_overdue']} newly overdue")
+    return result
+
+
+@shared_task
+def snapshot_wallet_balances():
+    """Nightly wallet balance snapshots so historical balances read a short tail of entries."""
+    written = WalletService.take_snapshots()
+    print(f"Wrote {written} wallet snapshot(s)")
+    return written
+
+
+@shared_task
+def flush_mail_outbox():
+    """Send buffered mail in batches over a single SMTP connection."""
+    sent = flush_outbox()
+    if sent:
+        print(f"Flushed {sent} email(s) from the outbox")
+    return sent
+
+
+@shared_task
+def flush_mail_digests():
+    """Send one digest email per user for pending low-priority alerts."""
+    sent = flush_digests()
+    if sent:
+        print(f"Sent {sent} digest email(s)")
+    return sent
+
+
+@shared_task
+def reconcile_unread_notification_counts():
+    """Rewrite cached unread notification counters that drifted from the database."""
+    fixed = NotificationService.reconcile_unread_counts()
+    if fixed:
+        print(f"Reconciled unread notification count for {fixed} user(s)")
+    return fixed
+
+
+@shared_task
+def archive_read_notifications():
+    """Move old read notifications out of the hot table."""
+    archived = NotificationService.archive_read_notifications()
+    if archived:
+        print(f"Archived {archived} read notification(s)")
+    return archived
@@ -0,0 +1,436 @@
+import json
+from datetime import date, datetime
+from smtplib import SMTPRecipientsRefused, SMTPServerDisconnected
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, SimpleTestCase, TestCase, override_settings
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.apps.chatbot.views import chat_with_ai
+from src.apps.common.mail import (
+    DEAD_LETTER_KEY,
+    DIGEST_RECIPIENTS_KEY,
+    OUTBOX_KEY,
+    MailPriority,
+    digest_key,
+    enqueue_mail,
+    flush_digests,
+    flush_outbox,
+)
+from src.apps.common.recurrence import RecurrenceError, next_occurrence, occurrences_between, validate_rule
+from src.apps.common.replica import ReplicaReadMixin, StickyWritesMiddleware
+from src.apps.common.tasks import send_user_mail
+from src.apps.common.throttling import AccountRateThrottle, RedisSlidingWindowThrottle
+from src.apps.notification.models import Notification
+from src.utility.db_router import ReplicaRouter, mark_recent_write, replica_reads, sticky_key
+from src.utility.redis_client import get_redis_connection
+
+
+BAD_ADDRESS = "refused@example.com"
+_locmem_send = locmem.EmailBackend.send_messages
+
+
+def refuse_bad_address(backend, messages):
+    if any(BAD_ADDRESS in message.to for message in messages):
+        raise SMTPRecipientsRefused({BAD_ADDRESS: (550, b"No such user")})
+    return _locmem_send(backend, messages)
+
+
+class MailOutboxTests(SimpleTestCase):
+
+    def setUp(self):
+        self.redis = get_redis_connection()
+        self.keys = [
+            OUTBOX_KEY, DEAD_LETTER_KEY, DIGEST_RECIPIENTS_KEY, digest_key(BAD_ADDRESS), digest_key("a@example.com"),
+        ]
+        self.redis.delete(*self.keys)
+        self.addCleanup(self.redis.delete, *self.keys)
+
+    def outbox(self):
+        return [json.loads(item) for item in self.redis.lrange(OUTBOX_KEY, 0, -1)]
+
+    def test_flush_sends_the_batch(self):
+        for i in range(3):
+            enqueue_mail(f"Subject {i}", "Body", ["a@example.com"])
+
+        self.assertEqual(flush_outbox(batch_size=2), 3)
+        self.assertEqual([message.subject for message in mail.outbox], ["Subject 0", "Subject 1", "Subject 2"])
+        self.assertEqual(self.outbox(), [])
+
+    @mock.patch.object(locmem.EmailBackend, "send_messages", refuse_bad_address)
+    def test_failed_message_is_requeued_without_resending_the_rest(self):
+        enqueue_mail("First", "Body", ["a@example.com"])
+        enqueue_mail("Refused", "Body", [BAD_ADDRESS])
+        enqueue_mail("Last", "Body", ["a@example.com"])
+
+        self.assertEqual(flush_outbox(), 2)
+        self.assertEqual([message.subject for message in mail.outbox], ["First", "Last"])
+        pending = self.outbox()
+        self.assertEqual(len(pending), 1)
+        self.assertEqual(pending[0]["subject"], "Refused")
+        self.assertEqual(pending[0]["tries"], 1)
+
+        # The next flush retries only the failed message
+        enqueue_mail("Next", "Body", ["a@example.com"])
+        self.assertEqual(flush_outbox(), 1)
+        self.assertEqual([message.subject for message in mail.outbox], ["First", "Last", "Next"])
+        self.assertEqual(self.outbox()[0]["tries"], 2)
+
+    @override_settings(MAIL_MAX_TRIES=2)
+    @mock.patch.object(locmem.EmailBackend, "send_messages", refuse_bad_address)
+    def test_message_is_dead_lettered_after_max_tries(self):
+        enqueue_mail("Refused", "Body", [BAD_ADDRESS])
+
+        flush_outbox()
+        self.assertEqual(len(self.outbox()), 1)
+        flush_outbox()
+        self.assertEqual(self.outbox(), [])
+        dead = [json.loads(item) for item in self.redis.lrange(DEAD_LETTER_KEY, 0, -1)]
+        self.assertEqual([(item["subject"], item["tries"]) for item in dead], [("Refused", 2)])
+
+    def test_unreachable_server_puts_the_batch_back_untouched(self):
+        enqueue_mail("First", "Body", ["a@example.com"])
+        enqueue_mail("Second", "Body", ["a@example.com"])
+
+        with mock.patch.object(locmem.EmailBackend, "open", side_effect=SMTPServerDisconnected("down")):
+            with self.assertRaises(SMTPServerDisconnected):
+                flush_outbox()
+
+        self.assertEqual(mail.outbox, [])
+        self.assertEqual(
+            [(item["subject"], item.get("tries")) for item in self.outbox()], [("First", None), ("Second", None)]
+        )
+
+    @mock.patch.object(locmem.EmailBackend, "send_messages", refuse_bad_address)
+    def test_failed_digest_keeps_the_alerts(self):
+        enqueue_mail("Alert 1", "Body", [BAD_ADDRESS], priority=MailPriority.DIGEST)
+        enqueue_mail("Alert 2", "Body", [BAD_ADDRESS], priority=MailPriority.DIGEST)
+        enqueue_mail("Alert 3", "Body", ["a@example.com"], priority=MailPriority.DIGEST)
+
+        self.assertEqual(flush_digests(), 1)
+        self.assertEqual([message.to for message in mail.outbox], [["a@example.com"]])
+        pending = [json.loads(item) for item in self.redis.lrange(digest_key(BAD_ADDRESS), 0, -1)]
+        self.assertEqual([(item["subject"], item["tries"]) for item in pending], [("Alert 1", 1), ("Alert 2", 1)])
+        self.assertTrue(self.redis.sismember(DIGEST_RECIPIENTS_KEY, BAD_ADDRESS))
+
+
+class StickyWritesMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        for name, value in (("replica_available", True), ("mark_recent_write", None)):
+            patcher = mock.patch(f"src.apps.common.replica.{name}", return_value=value)
+            self.addCleanup(patcher.stop)
+            setattr(self, name, patcher.start())
+
+    def request(self, method, user):
+        request = getattr(self.factory, method)("/")
+        request.user = user
+        return request
+
+    def test_sync_chain_marks_the_writer(self):
+        middleware = StickyWritesMiddleware(lambda request: HttpResponse())
+
+        self.assertFalse(iscoroutinefunction(middleware))
+        middleware(self.request("post", mock.Mock(is_authenticated=True, pk=7)))
+        middleware(self.request("get", mock.Mock(is_authenticated=True, pk=8)))
+
+        self.mark_recent_write.assert_called_once_with(7)
+
+    async def test_async_chain_stays_async(self):
+        async def view(request):
+            return HttpResponse(status=201)
+
+        middleware = StickyWritesMiddleware(view)
+
+        self.assertTrue(iscoroutinefunction(middleware))
+        response = await middleware(self.request("post", mock.Mock(is_authenticated=True, pk=7)))
+        await middleware(self.request("post", AnonymousUser()))
+
+        self.assertEqual(response.status_code, 201)
+        self.mark_recent_write.assert_called_once_with(7)
+
+
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        patcher = mock.patch("src.utility.db_router.replica_available", return_value=True)
+        self.addCleanup(patcher.stop)
+        patcher.start()
+        self.router = ReplicaRouter()
+
+    def test_reads_use_the_replica_only_inside_replica_reads(self):
+        self.assertIsNone(self.router.db_for_read(Notification))
+        with replica_reads():
+            self.assertEqual(self.router.db_for_read(Notification), "replica")
+            with replica_reads(False):
+                self.assertIsNone(self.router.db_for_read(Notification))
+        self.assertIsNone(self.router.db_for_read(Notification))
+
+    def test_open_transaction_keeps_reads_on_the_primary(self):
+        with replica_reads(), mock.patch(
+            "src.utility.db_router.connections", {"default": mock.Mock(in_atomic_block=True)}
+        ):
+            self.assertIsNone(self.router.db_for_read(Notification))
+
+    def test_writes_and_migrations_stay_on_default(self):
+        with replica_reads():
+            self.assertEqual(self.router.db_for_write(Notification), "default")
+        self.assertTrue(self.router.allow_migrate("default", "notification"))
+        self.assertFalse(self.router.allow_migrate("replica", "notification"))
+
+
+class ReplicaReadMixinTests(SimpleTestCase):
+
+    class ReportView(ReplicaReadMixin, APIView):
+        def get(self, request):
+            return Response({"db": ReplicaRouter().db_for_read(Notification)})
+
+        def post(self, request):
+            return self.get(request)
+
+    def setUp(self):
+        for target in ("src.utility.db_router.replica_available", "src.apps.common.replica.replica_available"):
+            patcher = mock.patch(target, return_value=True)
+            self.addCleanup(patcher.stop)
+            patcher.start()
+        self.user = get_user_model()(pk=4242, username="reporter")
+        cache.delete(sticky_key(self.user.pk))
+        self.addCleanup(cache.delete, sticky_key(self.user.pk))
+
+    def call(self, method="get"):
+        request = getattr(APIRequestFactory(), method)("/")
+        force_authenticate(request, self.user)
+        return self.ReportView.as_view()(request).data["db"]
+
+    def test_safe_requests_read_from_the_replica_and_restore_routing(self):
+        self.assertEqual(self.call(), "replica")
+        self.assertIsNone(self.call("post"))
+        self.assertIsNone(ReplicaRouter().db_for_read(Notification))
+
+    def test_recent_writer_reads_from_the_primary(self):
+        mark_recent_write(self.user.pk)
+
+        self.assertIsNone(self.call())
+
+
+class AsyncApiViewErrorTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("async-user", "async@example.com", "pw")
+
+    def setUp(self):
+        self.factory = AsyncRequestFactory()
+
+    def post(self, body, token=None):
+        token = token or str(AccessToken.for_user(self.user))
+        return self.factory.post(
+            "/chatbot/chat/", data=body, content_type="application/json", headers={"Authorization": f"Bearer {token}"}
+        )
+
+    async def test_invalid_body_is_a_standard_validation_error(self):
+        response = await chat_with_ai(self.post({}))
+
+        self.assertEqual(response.status_code, 400)
+        body = json.loads(response.content)
+        self.assertEqual(body["type"], "validation_error")
+        self.assertEqual([(error["code"], error["attr"]) for error in body["errors"]], [("required", "message")])
+
+    async def test_bad_token_errors_are_flattened(self):
+        response = await chat_with_ai(self.post({"message": "Hi"}, token="not-a-token"))
+
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+        body = json.loads(response.content)
+        self.assertEqual(body["type"], "client_error")
+        for error in body["errors"]:
+            self.assertIsInstance(error["detail"], str)
+            self.assertNotIn("{", error["detail"])
+
+    async def test_wrong_method(self):
+        response = await chat_with_ai(self.factory.get("/chatbot/chat/"))
+
+        self.assertEqual(response.status_code, 405)
+        self.assertEqual(json.loads(response.content)["errors"][0]["code"], "method_not_allowed")
+
+
+@mock.patch("src.apps.common.tasks.enqueue_mail")
+class SendUserMailTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        User = get_user_model()
+        cls.alice = User.objects.create_user("mail-alice", "alice@example.com", "pw")
+        cls.bob = User.objects.create_user("mail-bob", "bob@example.com", "pw")
+        cls.carol = User.objects.create_user("mail-carol", "carol@example.com", "pw")
+
+    def test_resolves_ids_and_emails_in_bulk(self, enqueue):
+        # one query per recipient form and one INSERT, however many recipients
+        with self.assertNumQueries(3):
+            send_user_mail(
+                "Hi", ["bob@example.com", "carol@example.com", "nobody@example.com"], "Hello", user_ids=[self.alice.pk]
+            )
+
+        recipients = enqueue.call_args.args[2]
+        self.assertCountEqual(
+            recipients, ["alice@example.com", "bob@example.com", "carol@example.com", "nobody@example.com"]
+        )
+        self.assertCountEqual(
+            Notification.objects.values_list("recipient_id", flat=True), [self.alice.pk, self.bob.pk, self.carol.pk]
+        )
+
+    def test_user_given_by_id_and_email_is_notified_once(self, enqueue):
+        send_user_mail("Hi", ["alice@example.com"], "Hello", user_ids=[self.alice.pk])
+
+        self.assertEqual(enqueue.call_args.args[2], ["alice@example.com"])
+        self.assertEqual(Notification.objects.filter(recipient=self.alice).count(), 1)
+
+    def test_without_notifications_only_mail_is_sent(self, enqueue):
+        send_user_mail("Hi", ["bob@example.com"], "Hello", create_notification=False)
+
+        enqueue.assert_called_once()
+        self.assertFalse(Notification.objects.exists())
+
+
+class TwoPerMinuteThrottle(RedisSlidingWindowThrottle):
+    scope = "test"
+    rate = "2/min"
+
+
+class SlidingWindowThrottleTests(SimpleTestCase):
+
+    def setUp(self):
+        self.request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1")
+        self.request.user = AnonymousUser()
+        self.key = TwoPerMinuteThrottle().get_cache_key(self.request, None)
+        self.redis = get_redis_connection()
+        self.redis.delete(self.key)
+        self.addCleanup(self.redis.delete, self.key)
+
+    def allow_at(self, seconds):
+        throttle = TwoPerMinuteThrottle()
+        with mock.patch("src.apps.common.throttling.time.time", return_value=1_000_000 + seconds):
+            return throttle.allow_request(self.request, None), throttle.wait()
+
+    def test_window_slides_from_the_oldest_request(self):
+        self.assertEqual(self.allow_at(0), (True, None))
+        self.assertEqual(self.allow_at(30), (True, None))
+        # A fixed window would reset at 60s; the first request only ages out at 60s
+        self.assertEqual(self.allow_at(45), (False, 15))
+        self.assertEqual(self.allow_at(61)[0], True)
+        self.assertEqual(self.allow_at(62), (False, 28))
+
+    def test_refused_requests_are_not_counted(self):
+        self.allow_at(0)
+        self.allow_at(1)
+        for second in range(2, 10):
+            self.assertFalse(self.allow_at(second)[0])
+
+        self.assertTrue(self.allow_at(61)[0])
+
+
+class TwoPerMinuteAccountThrottle(AccountRateThrottle):
+    scope = "test"
+    rate = "2/min"
+
+
+class ThrottleKeyTests(SimpleTestCase):
+
+    def key(self, throttle, request):
+        request.user = AnonymousUser()
+        return throttle.get_cache_key(request, None)
+
+    def post(self, data, address):
+        request = Request(
+            APIRequestFactory().post("/", data, format="json", REMOTE_ADDR=address), parsers=[JSONParser()]
+        )
+        request.user = AnonymousUser()
+        return request
+
+    def test_forwarded_for_is_ignored_without_proxies(self):
+        spoofed = RequestFactory().get("/", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="203.0.113.9")
+
+        self.assertEqual(self.key(TwoPerMinuteThrottle(), spoofed), "throttle:test:10.0.0.1")
+
+    def test_forwarded_for_hop_behind_a_proxy(self):
+        request = RequestFactory().get("/", REMOTE_ADDR="10.0.0.2", HTTP_X_FORWARDED_FOR="1.2.3.4, 203.0.113.9")
+
+        with override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, "NUM_PROXIES": 1}):
+            self.assertEqual(self.key(TwoPerMinuteThrottle(), request), "throttle:test:203.0.113.9")
+
+    def test_account_throttle_keys_on_the_named_account(self):
+        throttle = TwoPerMinuteAccountThrottle()
+
+        self.assertEqual(
+            throttle.get_cache_key(self.post({"username": " Alice "}, "10.0.0.1"), None),
+            throttle.get_cache_key(self.post({"username": "alice"}, "10.0.0.2"), None),
+        )
+        self.assertEqual(
+            throttle.get_cache_key(self.post({"email": "a@example.com"}, "10.0.0.1"), None),
+            "throttle:test:account:a@example.com",
+        )
+        self.assertIsNone(throttle.get_cache_key(self.post({"otp": "123456"}, "10.0.0.1"), None))
+
+    def test_rotating_addresses_share_the_account_budget(self):
+        redis = get_redis_connection()
+        redis.delete("throttle:test:account:alice")
+        self.addCleanup(redis.delete, "throttle:test:account:alice")
+
+        allowed = [
+            TwoPerMinuteAccountThrottle().allow_request(self.post({"username": "alice"}, address), None)
+            for address in ("10.0.0.1", "10.0.0.2", "10.0.0.3")
+        ]
+
+        self.assertEqual(allowed, [True, True, False])
+
+
+class RecurrenceTests(SimpleTestCase):
+
+    def test_next_occurrence_of_a_monthly_rule(self):
+        self.assertEqual(
+            next_occurrence("FREQ=MONTHLY;BYMONTHDAY=-1", date(2025, 1, 31), date(2025, 1, 31)), date(2025, 2, 28)
+        )
+        self.assertEqual(
+            next_occurrence("RRULE:FREQ=MONTHLY;BYMONTHDAY=-1", date(2025, 1, 31), date(2025, 1, 31), inclusive=True),
+            date(2025, 1, 31),
+        )
+
+    def test_datetimes_in_give_datetimes_out(self):
+        self.assertEqual(
+            next_occurrence("FREQ=WEEKLY;BYDAY=MO", datetime(2025, 1, 6, 9), datetime(2025, 1, 8)),
+            datetime(2025, 1, 13, 9),
+        )
+
+    def test_series_end(self):
+        self.assertIsNone(next_occurrence("FREQ=DAILY;UNTIL=20250103", date(2025, 1, 1), date(2025, 1, 3)))
+
+    def test_occurrences_between(self):
+        rule = "FREQ=WEEKLY;BYDAY=MO,FR"
+
+        self.assertEqual(
+            occurrences_between(rule, date(2025, 1, 1), date(2025, 1, 6), date(2025, 1, 13)),
+            [date(2025, 1, 6), date(2025, 1, 10), date(2025, 1, 13)],
+        )
+        self.assertEqual(
+            occurrences_between(rule, date(2025, 1, 1), date(2025, 1, 6), date(2025, 1, 13), limit=1),
+            [date(2025, 1, 6)],
+        )
+
+    def test_rejected_rules(self):
+        for rule in ("", "FREQ=DAILY;COUNT=3", "FREQ=SOMETIMES"):
+            with self.subTest(rule=rule), self.assertRaises(RecurrenceError):
+                validate_rule(rule, date(2025, 1, 1))
@@ -15,6 +15,20 @@ class EventSerializer(serializers.ModelSerializer):
 
 
 
+class EventSummarySerializer(EventSerializer):
+	"""
+	Event with its totals, used by the event list. total_expenses and
+	expense_count are queryset annotations; payers comes from the
+	per-payer sums the view passes in the serializer context.
+	"""
+	total_expenses = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+	expense_count = serializers.IntegerField(read_only=True)
+	payers = serializers.SerializerMethodField()
+
+	def get_payers(self, obj):
+		return self.context.get('payer_totals', {}).get(obj.id, [])
+
+
 class EventExpenseSerializer(serializers.ModelSerializer):
 	"""
 	Serializer for the EventExpense model.
@@ -1,4 +1,10 @@
-from django.db.models import Sum
+from collections import defaultdict
+from decimal import Decimal
+
+from django.db.models import Count, DecimalField, Sum, Value
+from django.db.models.functions import Coalesce
+
+from src.apps.expense.services import DebtSimplificationService
 from .models import EventExpense
 
 class EventExpenseService:
@@ -11,3 +17,63 @@ class EventExpenseService:
         ).aggregate(total_amount=Sum('amount'))['total_amount']
 
         return total if total is not None else 0.0
+
+    @staticmethod
+    def annotate_totals(events):
+        """Add total_expenses and expense_count to an Event queryset (one joined aggregate)."""
+        return events.annotate(
+            total_expenses=Coalesce(
+                Sum('event_expenses__amount'), Value(Decimal('0')), output_field=DecimalField()
+            ),
+            expense_count=Count('event_expenses'),
+        )
+
+    @staticmethod
+    def payer_totals(event_ids):
+        """Per-payer sums for many events with one grouped query: {event_id: [payer, ...]}."""
+        rows = (
+            EventExpense.objects.filter(event_id__in=event_ids)
+            .values('event_id', 'paid_by_id', 'paid_by__username')
+            .annotate(total=Sum('amount'))
+            .order_by('event_id', '-total')
+        )
+        payers = defaultdict(list)
+        for row in rows:
+            payers[row['event_id']].append({
+                'user': {'id': row['paid_by_id'], 'username': row['paid_by__username']},
+                'total': row['total'],
+            })
+        return payers
+
+    @staticmethod
+    def settlement_breakdown(event_id):
+        """
+        Split the event's spend equally between everyone who paid for
+        something and list the fewest payments that even it out.
+        """
+        payers = EventExpenseService.payer_totals([event_id]).get(event_id, [])
+        total = sum((payer['total'] for payer in payers), Decimal('0'))
+        share = (total / len(payers)).quantize(DebtSimplificationService.CENT) if payers else Decimal('0')
+
+        positions = {payer['user']['id']: payer['total'] - share for payer in payers}
+        usernames = {payer['user']['id']: payer['user']['username'] for payer in payers}
+        settlements = DebtSimplificationService.simplify(
+            {user_id: amount for user_id, amount in positions.items() if abs(amount) >= DebtSimplificationService.CENT}
+        )
+        return {
+            'total_expenses': total,
+            'participant_count': len(payers),
+            'per_person_share': share,
+            'balances': [
+                {'user': payer['user'], 'paid': payer['total'], 'net': positions[payer['user']['id']]}
+                for payer in payers
+            ],
+            'settlements': [
+                {
+                    'from': {'id': payer_id, 'username': usernames[payer_id]},
+                    'to': {'id': payee_id, 'username': usernames[payee_id]},
+                    'amount': amount,
+                }
+                for payer_id, payee_id, amount in settlements
+            ],
+        }
@@ -1,3 +1,96 @@
+from datetime import date
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .models import Event, EventExpense
+from .services import EventExpenseService
+
+User = get_user_model()
+
+
+def make_user(username):
+    return User.objects.create_user(username, f"{username}@example.com", "pw")
+
+
+class EventTestCase(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice, cls.bob = make_user("me"), make_user("alice"), make_user("bob")
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def event(self, name, day, *expenses):
+        event = Event.objects.create(name=name, date=day, created_by=self.user)
+        for payer, amount in expenses:
+            EventExpense.objects.create(event=event, amount=Decimal(amount), paid_by=payer)
+        return event
+
+
+class EventListTests(EventTestCase):
+
+    def test_list_carries_totals_and_payers_in_fixed_queries(self):
+        self.event("Picnic", date(2025, 3, 1), (self.user, '100'), (self.alice, '40'), (self.alice, '10'))
+        self.event("Empty", date(2025, 3, 2))
+        Event.objects.create(name="Not mine", date=date(2025, 3, 3), created_by=self.alice)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('events-list-create'))
+        self.event("Later", date(2025, 3, 4), (self.bob, '5'))
+        with self.assertNumQueries(3):
+            self.client.get(reverse('events-list-create'))
+
+        rows = {row['name']: row for row in response.data['results']}
+        self.assertEqual(list(rows), ["Empty", "Picnic"])
+        self.assertEqual((rows["Picnic"]['total_expenses'], rows["Picnic"]['expense_count']), ('150.00', 3))
+        self.assertEqual(
+            [(payer['user']['username'], payer['total']) for payer in rows["Picnic"]['payers']],
+            [("me", Decimal('100')), ("alice", Decimal('50'))],
+        )
+        self.assertEqual((rows["Empty"]['total_expenses'], rows["Empty"]['payers']), ('0.00', []))
+
+
+class SettlementBreakdownTests(EventTestCase):
+
+    def test_payers_even_out_against_an_equal_share(self):
+        event = self.event(
+            "Trip", date(2025, 3, 1), (self.user, '90'), (self.alice, '30'), (self.alice, '15'), (self.bob, '0.01'),
+        )
+
+        breakdown = EventExpenseService.settlement_breakdown(event.pk)
+
+        self.assertEqual(
+            (breakdown['total_expenses'], breakdown['participant_count'], breakdown['per_person_share']),
+            (Decimal('135.01'), 3, Decimal('45.00')),
+        )
+        self.assertEqual(
+            {item['user']['username']: item['net'] for item in breakdown['balances']},
+            {"me": Decimal('45'), "alice": Decimal('0'), "bob": Decimal('-44.99')},
+        )
+        self.assertEqual(
+            [(item['from']['username'], item['to']['username'], item['amount']) for item in breakdown['settlements']],
+            [("bob", "me", Decimal('44.99'))],
+        )
+
+    def test_event_without_expenses(self):
+        breakdown = EventExpenseService.settlement_breakdown(self.event("Empty", date(2025, 3, 1)).pk)
+
+        self.assertEqual(breakdown['total_expenses'], Decimal('0'))
+        self.assertEqual((breakdown['balances'], breakdown['settlements']), ([], []))
+
+    def test_only_the_creator_sees_the_settlement(self):
+        event = self.event("Trip", date(2025, 3, 1), (self.user, '10'), (self.alice, '20'))
+        url = reverse('events-settlement', args=[event.pk])
+
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['settlements'][0]['amount'], Decimal('5'))
 
-# Create your tests here.
+        self.client.force_authenticate(self.alice)
+        self.assertEqual(self.client.get(url).status_code, 403)
@@ -2,13 +2,14 @@ from django.urls import path
 from .views import (
 	EventListCreateView, EventRetrieveUpdateDestroyView,
 	EventExpenseListCreateView, EventExpenseRetrieveUpdateDestroyView,
-    EventTotalExpensesView
+    EventTotalExpensesView, EventSettlementView
 )
 
 urlpatterns = [
 	# URLs for Event model
 	path('', EventListCreateView.as_view(), name='events-list-create'),
 	path('<int:pk>/', EventRetrieveUpdateDestroyView.as_view(), name='events-detail'),
+	path('<int:pk>/settlement/', EventSettlementView.as_view(), name='events-settlement'),
 
 	# URLs for EventExpense model
 	path('expenses/', EventExpenseListCreateView.as_view(), name='event-expenses-list-create'),
@@ -2,7 +2,8 @@ from rest_framework.response import Response
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
 from .models import Event, EventExpense
-from .serializers import EventSerializer, EventExpenseSerializer
+from .serializers import EventSerializer, EventSummarySerializer, EventExpenseSerializer
+from src.apps.expense.pagination import StandardResultsSetPagination
 from django.shortcuts import get_object_or_404
 from rest_framework.exceptions import ValidationError, PermissionDenied
 from .services import EventExpenseService
@@ -20,11 +21,32 @@ class EventListCreateView(generics.ListCreateAPIView):
     serializer_class = EventSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return EventSummarySerializer
+        return EventSerializer
+
     def get_queryset(self):
         """
-        Filters the queryset to return only events created by the authenticated user.
+        Filters the queryset to return only events created by the authenticated user,
+        annotated with their expense totals.
+        """
+        queryset = self.queryset.filter(created_by=self.request.user).select_related('created_by')
+        return EventExpenseService.annotate_totals(queryset).order_by('-date', '-id')
+
+    def list(self, request, *args, **kwargs):
+        """
+        Per-payer sums for the whole page come from one extra grouped query.
         """
-        return self.queryset.filter(created_by=self.request.user)
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        events = page if page is not None else list(queryset)
+        context = self.get_serializer_context()
+        context['payer_totals'] = EventExpenseService.payer_totals([event.id for event in events])
+        serializer = EventSummarySerializer(events, many=True, context=context)
+        if page is not None:
+            return self.get_paginated_response(serializer.data)
+        return Response(serializer.data)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -50,6 +72,7 @@ class EventExpenseListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = EventExpenseSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = StandardResultsSetPagination
 
     def get_queryset(self):
         """
@@ -65,7 +88,11 @@ class EventExpenseListCreateView(generics.ListCreateAPIView):
         if event.created_by != self.request.user:
             raise PermissionDenied("You do not have permission to view expenses for this event.")
             
-        return EventExpense.objects.filter(event__id=event_id)
+        return (
+            EventExpense.objects.filter(event__id=event_id)
+            .select_related('paid_by', 'event')
+            .order_by('-id')
+        )
 
     def perform_create(self, serializer):
         """
@@ -114,3 +141,17 @@ class EventTotalExpensesView(generics.GenericAPIView):
             
         total_expenses = EventExpenseService.calculate_total_expenses(event_id)
         return Response({"total_expenses": total_expenses}, status=status.HTTP_200_OK)
+
+
+class EventSettlementView(generics.GenericAPIView):
+    """
+    Settlement breakdown for an event: what each payer paid, their balance
+    against an equal share, and the fewest payments that even it out.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, *args, **kwargs):
+        event = get_object_or_404(Event, id=pk)
+        if event.created_by != self.request.user:
+            raise PermissionDenied("You do not have permission to view settlements for this event.")
+        return Response(EventExpenseService.settlement_breakdown(event.id), status=status.HTTP_200_OK)
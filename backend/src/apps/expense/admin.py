@@ -1,9 +1,10 @@
 from django.contrib import admin
 from .models import Expense, Category
-from .models import Group,  ExpenseShare, Settlement
+from .models import Group,  ExpenseShare, Settlement, RecurringExpense
 # Register your models here.
 admin.site.register(Expense) 
 admin.site.register(Category)
 admin.site.register(Group)
 admin.site.register(ExpenseShare)
-admin.site.register(Settlement) 
\ No newline at end of file
+admin.site.register(Settlement) 
+admin.site.register(RecurringExpense)
@@ -0,0 +1,46 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from src.apps.expense.models import Expense, ExpenseShare, Group
+from src.apps.expense.services import GroupBalanceService, GroupMembershipService
+
+
+@receiver(post_save, sender=Expense)
+@receiver(post_delete, sender=Expense)
+def invalidate_group_balances_on_expense(sender, instance, **kwargs):
+    GroupBalanceService.invalidate(instance.group_id)
+
+
+@receiver(post_save, sender=ExpenseShare)
+@receiver(post_delete, sender=ExpenseShare)
+def invalidate_group_balances_on_share(sender, instance, **kwargs):
+    if ExpenseShare.expense.is_cached(instance):
+        group_id = instance.expense.group_id
+    else:
+        group_id = Expense.objects.filter(pk=instance.expense_id).values_list('group_id', flat=True).first()
+    GroupBalanceService.invalidate(group_id)
+
+
+@receiver(m2m_changed, sender=Group.members.through)
+def invalidate_group_caches_on_membership(sender, instance, action, pk_set, **kwargs):
+    if action == 'pre_clear':
+        # pk_set is empty for clear(), so note who is about to be removed
+        if isinstance(instance, Group):
+            instance._cleared_member_ids = list(instance.members.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if isinstance(instance, Group):
+        GroupBalanceService.invalidate(instance.pk)
+        member_ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_member_ids', ())
+        GroupMembershipService.invalidate(member_ids or ())
+    else:
+        # Changed from the user side: pk_set holds group ids
+        GroupMembershipService.invalidate([instance.pk])
+        for group_id in pk_set or ():
+            GroupBalanceService.invalidate(group_id)
+
+
+@receiver(pre_delete, sender=Group)
+def invalidate_memberships_on_group_delete(sender, instance, **kwargs):
+    GroupMembershipService.invalidate(list(instance.members.values_list('pk', flat=True)))
\ No newline at end of file
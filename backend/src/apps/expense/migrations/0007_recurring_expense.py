@@ -0,0 +1,46 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:35
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0006_expense_ai_fields_and_receipt_support'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RecurringExpense',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('description', models.CharField(blank=True, default='', max_length=255)),
+                ('payment_method', models.CharField(choices=[('cash', 'Cash'), ('esewa', 'eSewa'), ('khalti', 'Khalti'), ('bank', 'Bank'), ('card', 'Card'), ('other', 'Other')], default='cash', max_length=20)),
+                ('merchant', models.CharField(blank=True, default='', max_length=255)),
+                ('note', models.TextField(blank=True, default='')),
+                ('recurrence_rule', models.CharField(help_text='RRULE, e.g. FREQ=MONTHLY;BYMONTHDAY=1', max_length=255)),
+                ('start_date', models.DateField()),
+                ('next_date', models.DateField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('category', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to='expense.category')),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recurring_expenses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['next_date'],
+            },
+        ),
+        migrations.AddField(
+            model_name='expense',
+            name='recurring_expense',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='occurrences', to='expense.recurringexpense'),
+        ),
+        migrations.AddIndex(
+            model_name='recurringexpense',
+            index=models.Index(fields=['is_active', 'next_date'], name='recurringexpense_due_idx'),
+        ),
+    ]
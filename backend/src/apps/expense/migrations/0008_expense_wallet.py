@@ -0,0 +1,20 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0007_recurring_expense'),
+        ('income', '0002_wallet_income_wallet'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='expense',
+            name='wallet',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='expenses', to='income.wallet'),
+        ),
+    ]
@@ -3,6 +3,8 @@ from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone  # ✅ correct import
 
+from src.apps.common.models import FieldTrackerMixin
+
 
 
 User = get_user_model()
@@ -24,7 +26,7 @@ class Category(models.Model):
         return self.name
 
 
-class Expense(models.Model):
+class Expense(FieldTrackerMixin, models.Model):
     SOURCE_TYPE_CHOICES = (
         ('manual', 'Manual'),
         ('receipt', 'Receipt'),
@@ -74,6 +76,15 @@ class Expense(models.Model):
     split_type = models.CharField(max_length=20, choices=SPLIT_TYPE_CHOICES, default='equal')
     is_settled = models.BooleanField(default=False)
 
+    recurring_expense = models.ForeignKey(
+        'RecurringExpense', on_delete=models.SET_NULL, null=True, blank=True, related_name='occurrences'
+    )
+    wallet = models.ForeignKey(
+        'income.Wallet', on_delete=models.SET_NULL, null=True, blank=True, related_name='expenses'
+    )
+
+    tracked_fields = ('image', 'amount', 'wallet', 'date')
+
     class Meta:
         ordering = ['-date']
 
@@ -83,10 +94,10 @@ class Expense(models.Model):
         if self.date and not self.expense_date:
             self.expense_date = self.date
 
-        if self.pk:
-            old = Expense.objects.filter(pk=self.pk).first()
-            if old and old.image and old.image != self.image:
-                old.image.delete(save=False)
+        # Replace/clear: remove the previous file, known from the loaded row
+        old_image = self.previous('image') if self.pk else None
+        if old_image and self.has_changed('image'):
+            self.image.storage.delete(old_image)
         super().save(*args, **kwargs)
 
     def delete(self, *args, **kwargs):
@@ -98,6 +109,37 @@ class Expense(models.Model):
         return f"{self.description}: {self.amount} on {self.date}"
 
 
+class RecurringExpense(models.Model):
+    """
+    Template for a bill that repeats on an RRULE schedule (rent, subscriptions, EMI).
+    Occurrences are created as regular personal expenses by the
+    materialize_recurring_expenses beat job, a rolling window at a time.
+    """
+    created_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='recurring_expenses')
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    description = models.CharField(max_length=255, blank=True, default='')
+    category = models.ForeignKey(Category, on_delete=models.SET_NULL, null=True, blank=True)
+    payment_method = models.CharField(max_length=20, choices=Expense.PAYMENT_METHOD_CHOICES, default='cash')
+    merchant = models.CharField(max_length=255, blank=True, default='')
+    note = models.TextField(blank=True, default='')
+
+    recurrence_rule = models.CharField(max_length=255, help_text='RRULE, e.g. FREQ=MONTHLY;BYMONTHDAY=1')
+    start_date = models.DateField()
+    # Date of the next occurrence that has not been materialized yet
+    next_date = models.DateField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['next_date']
+        indexes = [
+            models.Index(fields=['is_active', 'next_date'], name='recurringexpense_due_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.description}: {self.amount} ({self.recurrence_rule})"
+
+
 class ExpenseShare(models.Model):
     """
     Represents how much a user owes for an expense.
@@ -1,18 +1,33 @@
 from rest_framework import permissions
 
+from .models import ExpenseShare, Group
+from .services import GroupMembershipService
+
 class IsExpenseAccessible(permissions.BasePermission):
     """
     - If expense is simple (no group), only the creator can access.
     - If expense is group-based, only members of that group can access.
+    - Groups are accessible to their members; shares to their user or to
+      anyone who can access the expense.
+
+    Membership is checked against the request's cached group ids.
     """
 
     def has_object_permission(self, request, view, obj):
         if not request.user or not request.user.is_authenticated:
             return False
 
+        if isinstance(obj, Group):
+            return GroupMembershipService.is_member(request, obj.pk)
+
+        if isinstance(obj, ExpenseShare):
+            if obj.user_id == request.user.pk:
+                return True
+            obj = obj.expense
+
         # Case 1: Simple expense (no group linked)
-        if obj.group is None:
-            return obj.created_by == request.user
+        if obj.group_id is None:
+            return obj.created_by_id == request.user.pk
 
         # Case 2: Group expense
-        return obj.group.members.filter(id=request.user.id).exists()
\ No newline at end of file
+        return GroupMembershipService.is_member(request, obj.group_id)
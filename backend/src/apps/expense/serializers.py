@@ -1,6 +1,8 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
-from .models import Group, Expense, ExpenseShare, Settlement, Category
+from src.apps.common.recurrence import RecurrenceError, validate_rule
+from src.apps.income.models import Wallet
+from .models import Group, Expense, ExpenseShare, Settlement, Category, RecurringExpense
 
 User = get_user_model()
 
@@ -66,6 +68,9 @@ class ExpenseSerializer(serializers.ModelSerializer):
         required=False,
         allow_null=True
     )
+    wallet_id = serializers.PrimaryKeyRelatedField(
+        queryset=Wallet.objects.all(), source="wallet", required=False, allow_null=True
+    )
     shares = ExpenseShareCreateSerializer(many=True, required=False, write_only=True)
     split_details = ExpenseShareSerializer(many=True, source='shares', read_only=True)
 
@@ -73,12 +78,17 @@ class ExpenseSerializer(serializers.ModelSerializer):
         model = Expense
         fields = [
             'id', 'paid_by', 'amount', 'description', 'date', 'updated',
-            'category', 'category_id', 'group', 'split_type', 'shares', 'split_details', 'created_by', 'is_settled',
+            'category', 'category_id', 'group', 'wallet_id', 'split_type', 'shares', 'split_details', 'created_by', 'is_settled',
             'image', 'source_type', 'payment_method', 'merchant', 'expense_date', 'note',
             'ocr_text', 'ai_confidence', 'engine_used', 'ai_amount', 'ai_date', 'ai_merchant',
         ]
         read_only_fields = ['updated', 'paid_by', 'created_by', 'is_settled']
 
+    def validate_wallet_id(self, wallet):
+        if wallet and wallet.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError("Wallet not found.")
+        return wallet
+
     def validate(self, attrs):
         expense_date = attrs.get('expense_date')
         date = attrs.get('date')
@@ -129,6 +139,35 @@ class ExpenseSerializer(serializers.ModelSerializer):
 
         return instance
 
+# ---------------------
+# Recurring Expense Serializer
+# ---------------------
+
+class RecurringExpenseSerializer(serializers.ModelSerializer):
+    category = CategorySerializer(read_only=True)
+    category_id = serializers.PrimaryKeyRelatedField(
+        queryset=Category.objects.all(), source="category", write_only=True, required=False, allow_null=True
+    )
+
+    class Meta:
+        model = RecurringExpense
+        fields = [
+            'id', 'amount', 'description', 'category', 'category_id', 'payment_method', 'merchant', 'note',
+            'recurrence_rule', 'start_date', 'next_date', 'is_active', 'created_by', 'created_at',
+        ]
+        read_only_fields = ['next_date', 'created_by', 'created_at']
+
+    def validate(self, attrs):
+        rule = attrs.get('recurrence_rule', getattr(self.instance, 'recurrence_rule', ''))
+        start_date = attrs.get('start_date', getattr(self.instance, 'start_date', None))
+        if rule and start_date:
+            try:
+                attrs['recurrence_rule'] = validate_rule(rule, start_date)
+            except RecurrenceError as e:
+                raise serializers.ValidationError({'recurrence_rule': str(e)})
+        return attrs
+
+
 # ---------------------
 # Group Serializer
 # ---------------------
@@ -138,11 +177,10 @@ class GroupSerializer(serializers.ModelSerializer):
     member_ids = serializers.PrimaryKeyRelatedField(
         many=True, queryset=User.objects.all(), write_only=True
     )
-    expenses = ExpenseSerializer(many=True, read_only=True)
 
     class Meta:
         model = Group
-        fields = ['id', 'name', 'members', 'member_ids', 'expenses']
+        fields = ['id', 'name', 'members', 'member_ids']
 
     def create(self, validated_data):
         members = validated_data.pop('member_ids', [])
@@ -152,6 +190,21 @@ class GroupSerializer(serializers.ModelSerializer):
         return group
 
 
+class GroupSummarySerializer(serializers.ModelSerializer):
+    """
+    Lightweight group row for the group list. The figures come from
+    annotations added by GroupBalanceService.annotate_summaries.
+    """
+    member_count = serializers.IntegerField(read_only=True)
+    total_spent = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+    last_activity = serializers.DateField(read_only=True)
+    my_balance = serializers.DecimalField(max_digits=12, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Group
+        fields = ['id', 'name', 'member_count', 'total_spent', 'last_activity', 'my_balance']
+
+
 # ---------------------
 # Settlement Serializer
 # ---------------------
@@ -162,3 +215,24 @@ class SettlementSerializer(serializers.ModelSerializer):
     class Meta:
         model = Settlement
         fields = ['id', 'expense_share', 'settled_by', 'amount_settled', 'date_settled']
+
+
+class BulkSettlementSerializer(serializers.Serializer):
+    """
+    Settle up either with one counterparty (optionally within a group) or a
+    list of share ids. Exactly one of the two must be given.
+    """
+    counterparty = serializers.PrimaryKeyRelatedField(queryset=User.objects.all(), required=False)
+    group = serializers.PrimaryKeyRelatedField(queryset=Group.objects.all(), required=False)
+    share_ids = serializers.ListField(
+        child=serializers.IntegerField(), required=False, allow_empty=False, max_length=1000
+    )
+
+    def validate(self, attrs):
+        if ('counterparty' in attrs) == ('share_ids' in attrs):
+            raise serializers.ValidationError("Provide either counterparty or share_ids.")
+        if 'group' in attrs and 'counterparty' not in attrs:
+            raise serializers.ValidationError({"group": "group can only be combined with counterparty."})
+        if attrs.get('counterparty') == self.context['request'].user:
+            raise serializers.ValidationError({"counterparty": "You cannot settle up with yourself."})
+        return attrs
@@ -6,6 +6,23 @@ from datetime import date, timedelta
 from django.db.models import Sum, F
 from django.db.models.functions import Coalesce, ExtractWeekDay
 from django.db.models import DecimalField
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import Count, Exists, OuterRef, Q, Subquery
+from collections import defaultdict
+from decimal import Decimal
+import heapq
+
+from src.apps.common.recurrence import RecurrenceError, next_occurrence, occurrences_between
+from src.apps.lend.models import Transaction
+from .models import Expense, ExpenseShare, Group, RecurringExpense, Settlement
+
+User = get_user_model()
 
 class FinancialSummaryService:
     def __init__(self, user, income_model, expense_model):
@@ -156,3 +173,483 @@ class TransactionService:
 
         # Sort all transactions by date (most recent first)
         return sorted(transactions, key=lambda x: x['date'], reverse=True)
+
+
+class RecurringExpenseService:
+
+    @staticmethod
+    def schedule(recurring, today=None):
+        """
+        Point next_date at the first occurrence that has not been materialized,
+        starting no earlier than today. Deactivates finished series.
+        """
+        today = today or timezone.localdate()
+        base = max(recurring.start_date, today)
+        last = recurring.occurrences.aggregate(last=Max('date'))['last'] if recurring.pk else None
+        try:
+            if last and last >= base:
+                recurring.next_date = next_occurrence(recurring.recurrence_rule, recurring.start_date, last)
+            else:
+                recurring.next_date = next_occurrence(
+                    recurring.recurrence_rule, recurring.start_date, base, inclusive=True
+                )
+        except RecurrenceError:
+            recurring.next_date = None
+        if recurring.next_date is None:
+            recurring.is_active = False
+        return recurring
+
+    @staticmethod
+    def materialize_due(batch_size=None, lookahead_days=None, max_per_template=None):
+        """
+        Create the expenses for every recurring template with an occurrence
+        inside the rolling window (today + lookahead_days).
+
+        Templates are claimed in batches with SELECT ... FOR UPDATE SKIP LOCKED;
+        each batch bulk-creates its expenses and advances next_date in one
+        transaction. Batches walk the due set once in pk order, so a template
+        that fell behind catches up at most max_per_template occurrences per
+        pass. Returns the number of expenses created.
+        """
+        batch_size = batch_size or settings.RECURRING_EXPENSE_BATCH_SIZE
+        if lookahead_days is None:
+            lookahead_days = settings.RECURRING_EXPENSE_LOOKAHEAD_DAYS
+        max_per_template = max_per_template or settings.RECURRING_EXPENSE_MAX_PER_RUN
+        horizon = timezone.localdate() + timedelta(days=lookahead_days)
+
+        created = 0
+        last_pk = 0
+        while True:
+            with transaction.atomic():
+                templates = list(
+                    RecurringExpense.objects.select_for_update(skip_locked=True)
+                    .filter(is_active=True, next_date__lte=horizon, pk__gt=last_pk)
+                    .order_by('pk')[:batch_size]
+                )
+                if not templates:
+                    return created
+
+                expenses = []
+                for template in templates:
+                    try:
+                        dates = occurrences_between(
+                            template.recurrence_rule, template.start_date,
+                            template.next_date, horizon, limit=max_per_template,
+                        )
+                        after = dates[-1] if dates else horizon
+                        template.next_date = next_occurrence(template.recurrence_rule, template.start_date, after)
+                    except RecurrenceError:
+                        dates, template.next_date = [], None
+                    if template.next_date is None:
+                        template.is_active = False
+
+                    expenses.extend(
+                        Expense(
+                            amount=template.amount,
+                            description=template.description,
+                            category_id=template.category_id,
+                            payment_method=template.payment_method,
+                            merchant=template.merchant,
+                            note=template.note,
+                            date=occurrence,
+                            expense_date=occurrence,
+                            created_by_id=template.created_by_id,
+                            paid_by_id=template.created_by_id,
+                            recurring_expense=template,
+                        )
+                        for occurrence in dates
+                    )
+
+                Expense.objects.bulk_create(expenses)
+                RecurringExpense.objects.bulk_update(templates, ['next_date', 'is_active'])
+            created += len(expenses)
+            last_pk = templates[-1].pk
+            if len(templates) < batch_size:
+                return created
+
+
+class DebtSimplificationService:
+    """
+    Turns outstanding debts into the fewest settlements that clear them.
+
+    Unsettled ExpenseShares (the share's user owes the expense's payer) and
+    accepted, unpaid lend Transactions are summed per (debtor, creditor) pair
+    with one grouped query each, folded into a net position per user, and
+    matched greedily: the largest debtor pays the largest creditor until one
+    side reaches zero. That needs at most n - 1 payments for n users and runs
+    in O(n log n), so groups with hundreds of members stay fast.
+    """
+    CENT = Decimal('0.01')
+
+    @staticmethod
+    def share_debts(shares):
+        """(debtor_id, creditor_id, amount) for each pair in an ExpenseShare queryset."""
+        rows = (
+            shares.filter(is_settled=False)
+            .exclude(user_id=F('expense__paid_by_id'))
+            .values_list('user_id', 'expense__paid_by_id')
+            .annotate(total=Sum('amount_owed'))
+            .order_by()
+        )
+        return list(rows)
+
+    @staticmethod
+    def lend_debts(transactions):
+        """(debtor_id, creditor_id, amount) for each pair in a lend Transaction queryset."""
+        rows = (
+            transactions.filter(status=Transaction.ACCEPTED)
+            .values_list('initiator_id', 'participant_id', 'transaction_type')
+            .annotate(total=Sum('amount'))
+            .order_by()
+        )
+        debts = []
+        for initiator_id, participant_id, transaction_type, total in rows:
+            if transaction_type == Transaction.LEND:
+                debts.append((participant_id, initiator_id, total))
+            else:
+                debts.append((initiator_id, participant_id, total))
+        return debts
+
+    @staticmethod
+    def net_positions(debts):
+        """Net amount per user: positive is owed to them, negative is owed by them."""
+        positions = defaultdict(Decimal)
+        for debtor_id, creditor_id, amount in debts:
+            positions[debtor_id] -= amount
+            positions[creditor_id] += amount
+        return {
+            user_id: amount.quantize(DebtSimplificationService.CENT)
+            for user_id, amount in positions.items()
+            if abs(amount) >= DebtSimplificationService.CENT
+        }
+
+    @staticmethod
+    def simplify(positions):
+        """Greedy min-cash-flow: a list of (payer_id, payee_id, amount)."""
+        # heapq is a min-heap, so amounts are negated; the counter breaks ties
+        # without comparing user ids of different types
+        creditors = [(-amount, i, user_id) for i, (user_id, amount) in enumerate(positions.items()) if amount > 0]
+        debtors = [(amount, i, user_id) for i, (user_id, amount) in enumerate(positions.items()) if amount < 0]
+        heapq.heapify(creditors)
+        heapq.heapify(debtors)
+
+        settlements = []
+        while creditors and debtors:
+            credit, c_order, creditor_id = heapq.heappop(creditors)
+            debt, d_order, debtor_id = heapq.heappop(debtors)
+            amount = min(-credit, -debt)
+            settlements.append((debtor_id, creditor_id, amount))
+            if -credit - amount >= DebtSimplificationService.CENT:
+                heapq.heappush(creditors, (credit + amount, c_order, creditor_id))
+            if -debt - amount >= DebtSimplificationService.CENT:
+                heapq.heappush(debtors, (debt + amount, d_order, debtor_id))
+        return settlements
+
+    @staticmethod
+    def for_group(group_id, include_lend=False):
+        debts = DebtSimplificationService.share_debts(ExpenseShare.objects.filter(expense__group_id=group_id))
+        if include_lend:
+            debts += DebtSimplificationService.lend_debts(
+                Transaction.objects.filter(
+                    initiator__group_members=group_id, participant__group_members=group_id
+                )
+            )
+        return DebtSimplificationService.summarize(debts)
+
+    @staticmethod
+    def with_counterparties(user_id, positions):
+        """
+        One payment per counterparty, to or from the user. Every debt involves
+        the user, so each counterparty's position is their net with the user.
+        """
+        settlements = []
+        for other_id, amount in positions.items():
+            if other_id == user_id:
+                continue
+            if amount > 0:
+                settlements.append((user_id, other_id, amount))
+            else:
+                settlements.append((other_id, user_id, -amount))
+        settlements.sort(key=lambda settlement: settlement[2], reverse=True)
+        return settlements
+
+    @staticmethod
+    def for_user(user):
+        """
+        Everything the user owes or is owed, across all groups and lend
+        records, netted per counterparty. Unlike for_group, debts are not
+        re-routed between other people: each payment is to or from the user.
+        """
+        debts = DebtSimplificationService.share_debts(
+            ExpenseShare.objects.filter(Q(user=user) | Q(expense__paid_by=user))
+        )
+        debts += DebtSimplificationService.lend_debts(
+            Transaction.objects.filter(Q(initiator=user) | Q(participant=user))
+        )
+        return DebtSimplificationService.summarize(
+            debts, lambda positions: DebtSimplificationService.with_counterparties(user.pk, positions)
+        )
+
+    @staticmethod
+    def summarize(debts, settle=None):
+        positions = DebtSimplificationService.net_positions(debts)
+        settlements = (settle or DebtSimplificationService.simplify)(positions)
+        user_ids = set(positions).union(*((payer_id, payee_id) for payer_id, payee_id, _ in settlements))
+        usernames = dict(User.objects.filter(pk__in=user_ids).values_list('pk', 'username'))
+
+        def user_ref(user_id):
+            return {'id': user_id, 'username': usernames.get(user_id)}
+
+        return {
+            'balances': [
+                {'user': user_ref(user_id), 'net': amount}
+                for user_id, amount in sorted(positions.items(), key=lambda item: item[1])
+            ],
+            'settlements': [
+                {'from': user_ref(payer_id), 'to': user_ref(payee_id), 'amount': amount}
+                for payer_id, payee_id, amount in settlements
+            ],
+            'pairwise_count': len(debts),
+        }
+
+
+class GroupBalanceService:
+    """
+    Paid-vs-owed per group member, computed in a single query and cached
+    until an expense, share or membership change in the group invalidates it.
+    """
+    CACHE_TIMEOUT = 60 * 60
+
+    @staticmethod
+    def cache_key(group_id):
+        return f"expense:group_balances:{group_id}"
+
+    @staticmethod
+    def invalidate(group_id):
+        """Drop the cached balances once the current transaction commits."""
+        if group_id is None:
+            return
+        key = GroupBalanceService.cache_key(group_id)
+        transaction.on_commit(lambda: GroupBalanceService._delete(key))
+
+    @staticmethod
+    def _delete(key):
+        try:
+            cache.delete(key)
+        except Exception:
+            pass
+
+    @staticmethod
+    def _sum(queryset, group_by, field):
+        return Coalesce(
+            Subquery(
+                queryset.values(group_by).annotate(total=Sum(field)).values('total')[:1],
+                output_field=DecimalField(),
+            ),
+            Decimal('0'),
+            output_field=DecimalField(),
+        )
+
+    @staticmethod
+    def compute(group_id):
+        group_expenses = Expense.objects.filter(group_id=group_id)
+        open_shares = ExpenseShare.objects.filter(expense__group_id=group_id, is_settled=False).exclude(
+            user_id=F('expense__paid_by_id')
+        )
+        members = (
+            User.objects.filter(group_members=group_id)
+            .annotate(
+                total_paid=GroupBalanceService._sum(
+                    group_expenses.filter(paid_by=OuterRef('pk')).order_by(), 'paid_by', 'amount'
+                ),
+                owes=GroupBalanceService._sum(
+                    open_shares.filter(user=OuterRef('pk')).order_by(), 'user', 'amount_owed'
+                ),
+                is_owed=GroupBalanceService._sum(
+                    open_shares.filter(expense__paid_by=OuterRef('pk')).order_by(), 'expense__paid_by', 'amount_owed'
+                ),
+            )
+            .values('id', 'username', 'total_paid', 'owes', 'is_owed')
+            .order_by('username')
+        )
+        return [
+            {
+                'user': {'id': member['id'], 'username': member['username']},
+                'total_paid': member['total_paid'],
+                'owes': member['owes'],
+                'is_owed': member['is_owed'],
+                'net_balance': member['is_owed'] - member['owes'],
+            }
+            for member in members
+        ]
+
+    @staticmethod
+    def annotate_summaries(groups, user):
+        """
+        Add member_count, total_spent, last_activity and my_balance to a Group
+        queryset. Each is a correlated subquery, so the list stays one query
+        and no aggregate joins multiply rows.
+        """
+        open_shares = ExpenseShare.objects.filter(
+            expense__group_id=OuterRef('pk'), is_settled=False
+        ).exclude(user_id=F('expense__paid_by_id')).order_by()
+        return groups.annotate(
+            member_count=Coalesce(
+                Subquery(
+                    Group.members.through.objects.filter(group_id=OuterRef('pk'))
+                    .order_by().values('group_id').annotate(total=Count('pk')).values('total')[:1]
+                ),
+                0,
+            ),
+            total_spent=GroupBalanceService._sum(
+                Expense.objects.filter(group_id=OuterRef('pk')).order_by(), 'group_id', 'amount'
+            ),
+            last_activity=Subquery(
+                Expense.objects.filter(group_id=OuterRef('pk')).order_by('-updated').values('updated')[:1]
+            ),
+            my_owed=GroupBalanceService._sum(
+                open_shares.filter(expense__paid_by=user), 'expense__group_id', 'amount_owed'
+            ),
+            my_owes=GroupBalanceService._sum(
+                open_shares.filter(user=user), 'expense__group_id', 'amount_owed'
+            ),
+        ).annotate(my_balance=F('my_owed') - F('my_owes'))
+
+    @staticmethod
+    def get(group_id):
+        key = GroupBalanceService.cache_key(group_id)
+        try:
+            balances = cache.get(key)
+        except Exception:
+            return GroupBalanceService.compute(group_id)
+        if balances is None:
+            balances = GroupBalanceService.compute(group_id)
+            try:
+                cache.set(key, balances, GroupBalanceService.CACHE_TIMEOUT)
+            except Exception:
+                pass
+        return balances
+
+
+class SettlementService:
+
+    @staticmethod
+    def shares_with(user, counterparty, group_id=None):
+        """Unsettled shares between two users, in either direction."""
+        shares = ExpenseShare.objects.filter(
+            Q(user=user, expense__paid_by=counterparty) | Q(user=counterparty, expense__paid_by=user)
+        )
+        if group_id is not None:
+            shares = shares.filter(expense__group_id=group_id)
+        return shares
+
+    @staticmethod
+    def shares_by_id(user, share_ids):
+        """The given shares, limited to ones the user owes or is owed."""
+        return ExpenseShare.objects.filter(id__in=share_ids).filter(Q(user=user) | Q(expense__paid_by=user))
+
+    @staticmethod
+    @transaction.atomic
+    def bulk_settle(user, shares):
+        """
+        Settle every unsettled share in ``shares`` with a fixed number of
+        statements: lock the rows, bulk-create their Settlements, flip the
+        shares with one UPDATE and the now fully settled expenses with another.
+        """
+        rows = list(
+            shares.filter(is_settled=False)
+            .exclude(user_id=F('expense__paid_by_id'))
+            .select_for_update(of=('self',))
+            .values_list('id', 'expense_id', 'amount_owed', 'expense__group_id')
+        )
+        if not rows:
+            return {'settled_shares': 0, 'amount_settled': Decimal('0'), 'expenses_settled': 0}
+
+        share_ids = [share_id for share_id, _, _, _ in rows]
+        expense_ids = {expense_id for _, expense_id, _, _ in rows}
+
+        Settlement.objects.bulk_create([
+            Settlement(expense_share_id=share_id, settled_by=user, amount_settled=amount)
+            for share_id, _, amount, _ in rows
+        ])
+        ExpenseShare.objects.filter(id__in=share_ids).update(is_settled=True)
+        # The payer's own share is not a debt, so it does not keep the expense open
+        open_debts = ExpenseShare.objects.filter(expense=OuterRef('pk'), is_settled=False).exclude(
+            user_id=OuterRef('paid_by_id')
+        )
+        expenses_settled = (
+            Expense.objects.filter(id__in=expense_ids, is_settled=False)
+            .filter(~Exists(open_debts))
+            .update(is_settled=True)
+        )
+
+        for group_id in {group_id for _, _, _, group_id in rows}:
+            GroupBalanceService.invalidate(group_id)
+
+        return {
+            'settled_shares': len(rows),
+            'amount_settled': sum((amount for _, _, amount, _ in rows), Decimal('0')),
+            'expenses_settled': expenses_settled,
+        }
+
+
+class GroupMembershipService:
+    """
+    The ids of the groups a user belongs to, loaded once per request and
+    cached per user for a short time, so permission checks and list filters
+    test membership in memory instead of querying the members table.
+    Membership changes invalidate the per-user entry (see signals.py).
+    """
+    CACHE_TIMEOUT = 60
+    REQUEST_ATTR = '_expense_group_ids'
+
+    @staticmethod
+    def cache_key(user_id):
+        return f"expense:user_groups:{user_id}"
+
+    @staticmethod
+    def load(user_id):
+        return frozenset(Group.objects.filter(members=user_id).values_list('id', flat=True))
+
+    @staticmethod
+    def group_ids(request):
+        group_ids = getattr(request, GroupMembershipService.REQUEST_ATTR, None)
+        if group_ids is not None:
+            return group_ids
+
+        user_id = request.user.pk
+        key = GroupMembershipService.cache_key(user_id)
+        try:
+            group_ids = cache.get(key)
+        except Exception:
+            group_ids = None
+        if group_ids is None:
+            group_ids = GroupMembershipService.load(user_id)
+            try:
+                cache.set(key, group_ids, GroupMembershipService.CACHE_TIMEOUT)
+            except Exception:
+                pass
+
+        setattr(request, GroupMembershipService.REQUEST_ATTR, group_ids)
+        return group_ids
+
+    @staticmethod
+    def is_member(request, group_id):
+        try:
+            return int(group_id) in GroupMembershipService.group_ids(request)
+        except (TypeError, ValueError):
+            return False
+
+    @staticmethod
+    def invalidate(user_ids):
+        keys = [GroupMembershipService.cache_key(user_id) for user_id in user_ids]
+        if not keys:
+            return
+        transaction.on_commit(lambda: GroupMembershipService._delete(keys))
+
+    @staticmethod
+    def _delete(keys):
+        try:
+            cache.delete_many(keys)
+        except Exception:
+            pass
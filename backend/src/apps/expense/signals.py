@@ -4,6 +4,7 @@ from django.db.models import Avg
 from decimal import Decimal
 
 from src.apps.expense.models import Expense, ExpenseShare
+from src.apps.common.mail import MailPriority
 from src.apps.common.tasks import send_user_mail
 from src.apps.notification.models import Notification  # optional
 
@@ -31,16 +32,17 @@ def expense_anomaly_alert(sender, instance, created, **kwargs):
 
     # Check if current expense is unusually large
     if avg_expense > 0 and instance.amount >= ANOMALY_FACTOR * avg_expense:
-        subject = f"Unusual Expense Alert: {category.name}"
+        category_name = category.name if category else "Uncategorized"
+        subject = f"Unusual Expense Alert: {category_name}"
         message = (
             f"⚠️ You just added an expense of ${instance.amount}, "
             f"which is more than 1.5× the average of your previous expenses (${avg_expense:.2f}) "
             f"in this category for this month."
         )
-        recipients = [user.email]
-
         # Send email + create notification
-        send_user_mail.delay(subject, recipients, message)
+        send_user_mail.delay(
+            subject, [], message, user_ids=[str(instance.paid_by_id)], priority=MailPriority.DIGEST
+        )
         # Optional: also save in DB
         # Notification.objects.create(recipient=user, message=message)
 
@@ -61,4 +63,4 @@ def update_expense_shares_on_settlement(sender, instance, **kwargs):
         # Check if there are any unsettled shares to avoid unnecessary updates
         if unsettled_shares.exists():
             # Update all of them in a single database query for efficiency
-            unsettled_shares.update(is_settled=True)
\ No newline at end of file
+            unsettled_shares.update(is_settled=True)
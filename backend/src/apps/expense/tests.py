@@ -1,3 +1,329 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from src.apps.lend.models import Transaction
+from .models import Expense, ExpenseShare, Group, RecurringExpense, Settlement
+from .services import (
+    DebtSimplificationService, GroupBalanceService, GroupMembershipService, RecurringExpenseService, SettlementService,
+)
+
+User = get_user_model()
+
+
+def make_user(username):
+    return User.objects.create_user(username, f"{username}@example.com", "pw")
+
+
+def equal_split(group, paid_by, amount, members):
+    """A group expense split equally, shares for every member as ExpenseSerializer creates them."""
+    expense = Expense.objects.create(
+        amount=amount, description="Dinner", date=date(2025, 1, 10),
+        created_by=paid_by, paid_by=paid_by, group=group, split_type='equal',
+    )
+    per_user = Decimal(amount) / len(members)
+    for member in members:
+        ExpenseShare.objects.create(expense=expense, user=member, amount_owed=per_user)
+    return expense
+
+
+class SimplifyTests(SimpleTestCase):
+
+    def test_largest_debtor_pays_largest_creditor(self):
+        positions = {'a': Decimal('-30'), 'b': Decimal('-10'), 'c': Decimal('25'), 'd': Decimal('15')}
+
+        settlements = DebtSimplificationService.simplify(positions)
+
+        self.assertEqual(settlements[0], ('a', 'c', Decimal('25')))
+        self.assertLessEqual(len(settlements), len(positions) - 1)
+        paid = {user: Decimal('0') for user in positions}
+        for payer, payee, amount in settlements:
+            paid[payer] += amount
+            paid[payee] -= amount
+        self.assertEqual({user: -amount for user, amount in paid.items()}, positions)
+
+    def test_net_positions_cancel_out_and_drop_settled_users(self):
+        debts = [('a', 'b', Decimal('10')), ('b', 'a', Decimal('10')), ('c', 'a', Decimal('5'))]
+
+        self.assertEqual(
+            DebtSimplificationService.net_positions(debts), {'a': Decimal('5.00'), 'c': Decimal('-5.00')}
+        )
+
+
+class SettleUpTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice, cls.bob = make_user("me"), make_user("alice"), make_user("bob")
+
+    def setUp(self):
+        patcher = mock.patch('src.apps.lend.signals.send_user_mail')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def payments(self, result):
+        return {(item['from']['username'], item['to']['username'], item['amount']) for item in result['settlements']}
+
+    def test_payments_are_only_to_or_from_the_user(self):
+        # Alice owes me 10 and I owe Bob 10: not "Alice pays Bob"
+        trip = Group.objects.create(name="Trip")
+        trip.members.add(self.user, self.alice, self.bob)
+        equal_split(trip, self.user, '20', [self.user, self.alice])
+        equal_split(trip, self.bob, '20', [self.user, self.bob])
+
+        result = DebtSimplificationService.for_user(self.user)
+
+        self.assertEqual(
+            self.payments(result), {('alice', 'me', Decimal('10.00')), ('me', 'bob', Decimal('10.00'))}
+        )
+
+    def test_shares_and_lend_records_net_per_counterparty(self):
+        flat = Group.objects.create(name="Flat")
+        flat.members.add(self.user, self.bob)
+        equal_split(flat, self.bob, '20', [self.user, self.bob])
+        Transaction.objects.create(
+            initiator=self.user, participant=self.bob, transaction_type=Transaction.LEND,
+            amount=Decimal('4'), status=Transaction.ACCEPTED,
+        )
+
+        result = DebtSimplificationService.for_user(self.user)
+
+        self.assertEqual(self.payments(result), {('me', 'bob', Decimal('6.00'))})
+
+    def test_group_simplification_still_routes_between_members(self):
+        trip = Group.objects.create(name="Trip")
+        trip.members.add(self.user, self.alice, self.bob)
+        equal_split(trip, self.user, '20', [self.user, self.alice])
+        equal_split(trip, self.bob, '20', [self.user, self.bob])
+
+        result = DebtSimplificationService.for_group(trip.pk)
+
+        self.assertEqual(self.payments(result), {('alice', 'bob', Decimal('10.00'))})
+
+
+class GroupBalanceCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice = make_user("me"), make_user("alice")
+        cls.group = Group.objects.create(name="Trip")
+        cls.group.members.add(cls.user, cls.alice)
+
+    def setUp(self):
+        cache.delete(GroupBalanceService.cache_key(self.group.pk))
+
+    def balance(self, username):
+        return next(item for item in GroupBalanceService.get(self.group.pk) if item['user']['username'] == username)
+
+    def test_new_expense_drops_the_cached_balances(self):
+        self.assertEqual(self.balance("alice")['owes'], Decimal('0'))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            equal_split(self.group, self.user, '20', [self.user, self.alice])
+
+        self.assertEqual(self.balance("alice")['owes'], Decimal('10'))
+        self.assertEqual(self.balance("me")['net_balance'], Decimal('10'))
+
+
+class BulkSettleTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice, cls.bob = make_user("me"), make_user("alice"), make_user("bob")
+        cls.group = Group.objects.create(name="Trip")
+        cls.group.members.add(cls.user, cls.alice, cls.bob)
+
+    def test_settling_every_debtor_settles_the_expense(self):
+        expense = equal_split(self.group, self.user, '30', [self.user, self.alice, self.bob])
+
+        first = SettlementService.bulk_settle(self.user, SettlementService.shares_with(self.user, self.alice))
+        expense.refresh_from_db()
+        self.assertEqual(first['expenses_settled'], 0)
+        self.assertFalse(expense.is_settled)
+
+        second = SettlementService.bulk_settle(self.user, SettlementService.shares_with(self.user, self.bob))
+        expense.refresh_from_db()
+        self.assertEqual(second, {'settled_shares': 1, 'amount_settled': Decimal('10'), 'expenses_settled': 1})
+        self.assertTrue(expense.is_settled)
+
+    def test_settles_both_directions_with_a_counterparty(self):
+        mine = equal_split(self.group, self.user, '20', [self.user, self.alice])
+        theirs = equal_split(self.group, self.alice, '40', [self.user, self.alice])
+
+        result = SettlementService.bulk_settle(self.user, SettlementService.shares_with(self.user, self.alice))
+
+        self.assertEqual(result['settled_shares'], 2)
+        self.assertEqual(result['expenses_settled'], 2)
+        self.assertEqual(Settlement.objects.filter(settled_by=self.user).count(), 2)
+        self.assertEqual(Expense.objects.filter(pk__in=[mine.pk, theirs.pk], is_settled=True).count(), 2)
+
+    def test_own_share_is_not_settled_by_id(self):
+        expense = equal_split(self.group, self.user, '20', [self.user, self.alice])
+        share_ids = list(expense.shares.values_list('id', flat=True))
+
+        result = SettlementService.bulk_settle(self.user, SettlementService.shares_by_id(self.user, share_ids))
+
+        self.assertEqual(result['settled_shares'], 1)
+        self.assertEqual(result['amount_settled'], Decimal('10'))
+        self.assertFalse(ExpenseShare.objects.get(expense=expense, user=self.user).is_settled)
+
+    def test_nothing_to_settle(self):
+        result = SettlementService.bulk_settle(self.user, SettlementService.shares_with(self.user, self.bob))
+
+        self.assertEqual(result, {'settled_shares': 0, 'amount_settled': Decimal('0'), 'expenses_settled': 0})
+
+
+class MaterializeRecurringTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = make_user("me")
+
+    def template(self, days_behind):
+        start = timezone.localdate() - timedelta(days=days_behind)
+        return RecurringExpense.objects.create(
+            created_by=self.user, amount=Decimal('5'), description="Tea", recurrence_rule="FREQ=DAILY",
+            start_date=start, next_date=start,
+        )
+
+    def test_catch_up_is_capped_per_pass_with_full_batches(self):
+        templates = [self.template(10) for _ in range(3)]
+
+        created = RecurringExpenseService.materialize_due(batch_size=1, lookahead_days=0, max_per_template=3)
+
+        self.assertEqual(created, 9)
+        for template in templates:
+            template.refresh_from_db()
+            self.assertEqual(template.occurrences.count(), 3)
+            self.assertEqual(template.next_date, timezone.localdate() - timedelta(days=7))
+
+    def test_up_to_date_template_creates_today_only(self):
+        template = self.template(0)
+
+        self.assertEqual(RecurringExpenseService.materialize_due(lookahead_days=0), 1)
+        self.assertEqual(RecurringExpenseService.materialize_due(lookahead_days=0), 0)
+
+        expense = template.occurrences.get()
+        self.assertEqual(
+            (expense.date, expense.paid_by_id, expense.amount), (timezone.localdate(), self.user.pk, Decimal('5'))
+        )
+        template.refresh_from_db()
+        self.assertEqual(template.next_date, timezone.localdate() + timedelta(days=1))
+
+
+class GroupListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice = make_user("me"), make_user("alice")
+        cls.quiet, cls.older, cls.recent = (Group.objects.create(name=name) for name in ("Quiet", "Older", "Recent"))
+        for group in (cls.quiet, cls.older, cls.recent):
+            group.members.add(cls.user, cls.alice)
+        Group.objects.create(name="Not mine").members.add(cls.alice)
+
+        equal_split(cls.older, cls.alice, '40', [cls.user, cls.alice])
+        Expense.objects.filter(group=cls.older).update(updated=date(2025, 1, 1))
+        equal_split(cls.recent, cls.user, '30', [cls.user, cls.alice])
+        equal_split(cls.recent, cls.user, '10', [cls.user, cls.alice])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_summaries_are_ordered_by_activity_with_idle_groups_last(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('group-list-create'))
+
+        rows = {row['name']: row for row in response.data['results']}
+        self.assertEqual(list(rows), ["Recent", "Older", "Quiet"])
+        self.assertEqual(
+            (rows["Recent"]['member_count'], rows["Recent"]['total_spent'], rows["Recent"]['my_balance']),
+            (2, '40.00', '20.00'),
+        )
+        self.assertEqual((rows["Older"]['last_activity'], rows["Older"]['my_balance']), ('2025-01-01', '-20.00'))
+        self.assertEqual((rows["Quiet"]['last_activity'], rows["Quiet"]['total_spent']), (None, '0.00'))
+
+    def test_group_expenses_are_paginated_newest_first(self):
+        for day in range(1, 13):
+            Expense.objects.create(
+                amount=Decimal('1'), description="Snack", date=date(2025, 2, day),
+                created_by=self.user, paid_by=self.user, group=self.quiet,
+            )
+        url = reverse('group-expense-list', args=[self.quiet.pk])
+
+        first = self.client.get(url).data
+        second = self.client.get(first['next']).data
+
+        self.assertEqual(first['count'], 12)
+        self.assertEqual(
+            [row['date'] for row in first['results'] + second['results']],
+            [date(2025, 2, day).isoformat() for day in range(12, 0, -1)],
+        )
+
+    def test_non_member_sees_no_group_expenses(self):
+        self.client.force_authenticate(make_user("stranger"))
+
+        response = self.client.get(reverse('group-expense-list', args=[self.recent.pk]))
+
+        self.assertEqual(response.data['count'], 0)
+
+
+class GroupMembershipCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice, cls.outsider = make_user("me"), make_user("alice"), make_user("outsider")
+        cls.group = Group.objects.create(name="Trip")
+        cls.group.members.add(cls.user, cls.alice)
+        cls.expense = equal_split(cls.group, cls.alice, '20', [cls.user, cls.alice])
+
+    def setUp(self):
+        cache.delete_many([GroupMembershipService.cache_key(user.pk) for user in (self.user, self.outsider)])
+
+    def request_for(self, user):
+        request = RequestFactory().get("/")
+        request.user = user
+        return request
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def test_ids_are_loaded_once_and_then_served_from_the_cache(self):
+        with self.assertNumQueries(1):
+            first = self.request_for(self.user)
+            self.assertTrue(GroupMembershipService.is_member(first, self.group.pk))
+            self.assertTrue(GroupMembershipService.is_member(first, str(self.group.pk)))
+            self.assertFalse(GroupMembershipService.is_member(first, "not-an-id"))
+
+        with self.assertNumQueries(0):
+            self.assertEqual(GroupMembershipService.group_ids(self.request_for(self.user)), {self.group.pk})
+
+    def test_membership_changes_from_either_side_reach_the_cache(self):
+        client = self.client_for(self.outsider)
+        self.assertEqual(client.get(reverse('group-detail', args=[self.group.pk])).status_code, 404)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.members.add(self.outsider)
+        self.assertEqual(client.get(reverse('group-detail', args=[self.group.pk])).status_code, 200)
+        self.assertEqual(client.get(reverse('expense-list-create'), {'group_id': self.group.pk}).data['count'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.outsider.group_members.remove(self.group)
+        self.assertEqual(client.get(reverse('group-detail', args=[self.group.pk])).status_code, 404)
+        self.assertEqual(client.get(reverse('expense-list-create'), {'group_id': self.group.pk}).data['count'], 0)
+
+    def test_group_shares_are_only_visible_to_members(self):
+        share = self.expense.shares.get(user=self.user)
+        url = reverse('expenseshare-detail', args=[share.pk])
+
+        self.assertEqual(self.client_for(self.user).get(url).status_code, 200)
+        self.assertEqual(self.client_for(self.outsider).get(url).status_code, 403)
@@ -8,9 +8,16 @@ from .views import (
     MonthlyAnalyticsView,
     GroupListCreate,
     GroupDetail,
+    GroupExpenseList,
     ExpenseShareList,
     ExpenseShareDetail,
-    SettlementCreate
+    SettlementCreate,
+    RecurringExpenseListCreateView,
+    RecurringExpenseDetailView,
+    GroupBalanceView,
+    GroupDebtSimplificationView,
+    SettleUpView,
+    BulkSettlementCreate,
 )
 # from .view1 import ExpenseExportView
 
@@ -24,14 +31,23 @@ urlpatterns = [
     path('expenses/<int:pk>/', ExpenseRetrieveUpdateDestroyView.as_view(), name='expense-detail-v2'),
     path('categories/', CategoryListCreateView.as_view(), name='category-list-create'),
 
+    # Recurring expense templates
+    path('recurring/', RecurringExpenseListCreateView.as_view(), name='recurring-expense-list-create'),
+    path('recurring/<int:pk>/', RecurringExpenseDetailView.as_view(), name='recurring-expense-detail'),
+
     # Group URLs
     path('groups/', GroupListCreate.as_view(), name='group-list-create'),
     path('groups/<int:pk>/', GroupDetail.as_view(), name='group-detail'),
+    path('groups/<int:pk>/expenses/', GroupExpenseList.as_view(), name='group-expense-list'),
+    path('groups/<int:pk>/balances/', GroupBalanceView.as_view(), name='group-balances'),
+    path('groups/<int:pk>/simplify/', GroupDebtSimplificationView.as_view(), name='group-debt-simplify'),
 
     # Expense Share and Settlement URLs
     path('expenseshares/', ExpenseShareList.as_view(), name='expenseshare-list'),
     path('expenseshares/<int:pk>/', ExpenseShareDetail.as_view(), name='expenseshare-detail'),
     path('settlements/', SettlementCreate.as_view(), name='settlement-create'),
+    path('settlements/bulk/', BulkSettlementCreate.as_view(), name='settlement-bulk-create'),
+    path('settle-up/', SettleUpView.as_view(), name='settle-up'),
 
     # Reporting URLs
     path('report/', FinancialSummaryView.as_view(), name='financial-summary'),
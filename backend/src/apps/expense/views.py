@@ -6,20 +6,27 @@ from decimal import Decimal
 from django.contrib.auth import get_user_model
 from rest_framework.views import APIView
 from rest_framework import serializers
-from django.db.models import Q
+from django.db.models import F, Q
 from django.db.models import Sum
 from django.db.models.functions import Coalesce
 from django.db.models import DecimalField
 from datetime import date, datetime
-from .models import Expense, Category, Group, ExpenseShare, Settlement
-from .serializers import ExpenseSerializer, CategorySerializer, GroupSerializer, ExpenseShareSerializer, SettlementSerializer
+from .models import Expense, Category, Group, ExpenseShare, Settlement, RecurringExpense
+from .serializers import (
+    ExpenseSerializer, CategorySerializer, GroupSerializer, GroupSummarySerializer, ExpenseShareSerializer,
+    SettlementSerializer, RecurringExpenseSerializer, BulkSettlementSerializer,
+)
 from .filters import ExpenseFilter
 from .pagination import StandardResultsSetPagination
-from .services import FinancialSummaryService, TransactionService
+from .services import (
+    FinancialSummaryService, TransactionService, RecurringExpenseService, DebtSimplificationService, GroupBalanceService,
+    SettlementService, GroupMembershipService,
+)
 from .permissions import IsExpenseAccessible
 
 # Import Income model
 from src.apps.income.models import Income
+from src.apps.common.replica import ReplicaReadMixin
 
 User = get_user_model()
 
@@ -49,6 +56,8 @@ class ExpenseListCreateView(generics.ListCreateAPIView):
         search = self.request.query_params.get('search')
 
         if group_id:
+            if not GroupMembershipService.is_member(self.request, group_id):
+                return Expense.objects.none()
             queryset = Expense.objects.filter(group_id=group_id)
         else:
             queryset = Expense.objects.filter(paid_by=user, group__isnull=True)
@@ -154,6 +163,49 @@ class ExpenseRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
 # Category Views
 # -------------------------------
 
+# -------------------------------
+# Recurring Expense Views
+# -------------------------------
+
+class RecurringExpenseListCreateView(generics.ListCreateAPIView):
+    """
+    Lists and creates the user's recurring expense templates.
+    Occurrences are materialized as normal expenses by a beat job.
+    """
+    serializer_class = RecurringExpenseSerializer
+    pagination_class = StandardResultsSetPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return RecurringExpense.objects.filter(created_by=self.request.user).select_related('category')
+
+    def perform_create(self, serializer):
+        recurring = RecurringExpenseService.schedule(RecurringExpense(**serializer.validated_data))
+        serializer.save(created_by=self.request.user, next_date=recurring.next_date, is_active=recurring.is_active)
+
+
+class RecurringExpenseDetailView(generics.RetrieveUpdateDestroyAPIView):
+    """
+    Retrieve, update or delete a recurring expense template.
+    Expenses it already created are kept when the template is deleted.
+    """
+    serializer_class = RecurringExpenseSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return RecurringExpense.objects.filter(created_by=self.request.user).select_related('category')
+
+    def perform_update(self, serializer):
+        reschedule = {'recurrence_rule', 'start_date', 'is_active'} & {
+            field for field, value in serializer.validated_data.items()
+            if getattr(serializer.instance, field) != value
+        }
+        recurring = serializer.save()
+        if reschedule and recurring.is_active:
+            RecurringExpenseService.schedule(recurring)
+            recurring.save(update_fields=['next_date', 'is_active'])
+
+
 class CategoryListCreateView(generics.ListCreateAPIView):
     queryset = Category.objects.all()
     serializer_class = CategorySerializer
@@ -169,10 +221,19 @@ class CategoryListCreateView(generics.ListCreateAPIView):
 # -------------------------------
 
 class GroupListCreate(generics.ListCreateAPIView):
+    """
+    Lists the user's groups as summaries (member count, total spent, last
+    activity, my balance). Expenses are served by GroupExpenseList.
+    """
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
     permission_classes = [IsAuthenticated]
 
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return GroupSummarySerializer
+        return GroupSerializer
+
     def get_queryset(self):
         user = self.request.user
         queryset = super().get_queryset()
@@ -181,10 +242,15 @@ class GroupListCreate(generics.ListCreateAPIView):
         
         if group_id:
             # Filter for a specific group, ensuring the user is a member of it.
-            return queryset.filter(id=group_id, members=user)
+            if not GroupMembershipService.is_member(self.request, group_id):
+                return queryset.none()
+            queryset = queryset.filter(id=group_id)
         else:
             # If no group_id is provided, list all groups the user is a member of.
-            return queryset.filter(members=user)
+            queryset = queryset.filter(id__in=GroupMembershipService.group_ids(self.request))
+        return GroupBalanceService.annotate_summaries(queryset, user).order_by(
+            F('last_activity').desc(nulls_last=True), '-id'
+        )
     
     def get_serializer_context(self):
         context = super().get_serializer_context()
@@ -194,7 +260,33 @@ class GroupListCreate(generics.ListCreateAPIView):
 class GroupDetail(generics.RetrieveUpdateDestroyAPIView):
     queryset = Group.objects.all()
     serializer_class = GroupSerializer
-    permission_classes = [IsAuthenticated, IsExpenseAccessible]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Only members can see or change a group
+        return Group.objects.filter(
+            id__in=GroupMembershipService.group_ids(self.request)
+        ).prefetch_related('members')
+
+
+class GroupExpenseList(generics.ListAPIView):
+    """
+    Paginated expenses of one group, newest first, with shares prefetched.
+    """
+    serializer_class = ExpenseSerializer
+    pagination_class = StandardResultsSetPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        group_id = self.kwargs['pk']
+        if not GroupMembershipService.is_member(self.request, group_id):
+            return Expense.objects.none()
+        return (
+            Expense.objects.filter(group_id=group_id)
+            .select_related('paid_by', 'category')
+            .prefetch_related('shares__user')
+            .order_by('-date', '-id')
+        )
 
 
 # -------------------------------
@@ -225,8 +317,8 @@ class ExpenseShareList(generics.ListAPIView):
 
             # Check if the user is the one who paid, or is a member of the expense's group,
             # or is listed as a share receiver.
-            if not (expense.paid_by == user or
-                    (expense.group and user in expense.group.members.all()) or
+            if not (expense.paid_by_id == user.pk or
+                    GroupMembershipService.is_member(self.request, expense.group_id) or
                     expense.shares.filter(user=user).exists()):
                 return ExpenseShare.objects.none() # Return empty queryset if user has no access
 
@@ -279,11 +371,75 @@ class SettlementCreate(generics.CreateAPIView):
         headers = self.get_success_headers(serializer.data)
         return Response(serializer.data, status=status.HTTP_201_CREATED, headers=headers)
 
+class BulkSettlementCreate(generics.GenericAPIView):
+    """
+    Settle many shares at once: everything between the user and a
+    counterparty (optionally within one group), or an explicit list of
+    share ids. Runs in one transaction with set-based updates.
+    """
+    serializer_class = BulkSettlementSerializer
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        if 'counterparty' in data:
+            group = data.get('group')
+            shares = SettlementService.shares_with(request.user, data['counterparty'], group.pk if group else None)
+        else:
+            shares = SettlementService.shares_by_id(request.user, data['share_ids'])
+
+        result = SettlementService.bulk_settle(request.user, shares)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class GroupBalanceView(APIView):
+    """
+    Paid-vs-owed per member of a group, computed in the database and cached,
+    so clients no longer download every expense to work it out.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, format=None):
+        if not GroupMembershipService.is_member(request, pk):
+            return Response({"detail": "Group not found."}, status=status.HTTP_404_NOT_FOUND)
+        return Response({"group": pk, "balances": GroupBalanceService.get(pk)}, status=status.HTTP_200_OK)
+
+
+class GroupDebtSimplificationView(APIView):
+    """
+    Net balance per member of a group and the minimal set of payments that
+    settles every unsettled share. Pass ?include_lend=true to also fold in
+    accepted lend transactions between members.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk, format=None):
+        if not GroupMembershipService.is_member(request, pk):
+            return Response({"detail": "Group not found."}, status=status.HTTP_404_NOT_FOUND)
+        include_lend = request.query_params.get('include_lend', '').lower() in ('1', 'true', 'yes')
+        result = DebtSimplificationService.for_group(pk, include_lend=include_lend)
+        return Response(result, status=status.HTTP_200_OK)
+
+
+class SettleUpView(APIView):
+    """
+    The user's outstanding group shares and lend records, netted into at most
+    one payment per counterparty.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, format=None):
+        return Response(DebtSimplificationService.for_user(request.user), status=status.HTTP_200_OK)
+
+
 # -------------------------------
 # Reporting Views
 # -------------------------------
 
-class FinancialSummaryView(APIView):
+class FinancialSummaryView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, format=None):
@@ -298,7 +454,7 @@ class FinancialSummaryView(APIView):
         return Response(summary, status=status.HTTP_200_OK)
 
 
-class RecentTransactionsView(APIView):
+class RecentTransactionsView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, format=None):
@@ -307,7 +463,7 @@ class RecentTransactionsView(APIView):
         return Response(transactions, status=status.HTTP_200_OK)
 
 
-class MonthlyAnalyticsView(APIView):
+class MonthlyAnalyticsView(ReplicaReadMixin, APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, format=None):
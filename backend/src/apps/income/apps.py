@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ExpenseConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "src.apps.income"
+
+    def ready(self):
+        import src.apps.income.signals  # noqa: F401
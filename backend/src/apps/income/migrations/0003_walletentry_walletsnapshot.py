@@ -0,0 +1,42 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0008_expense_wallet'),
+        ('income', '0002_wallet_income_wallet'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('amount', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('kind', models.CharField(choices=[('opening', 'Opening balance'), ('income', 'Income'), ('expense', 'Expense'), ('adjustment', 'Adjustment')], max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('expense', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='wallet_entries', to='expense.expense')),
+                ('income', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='wallet_entries', to='income.income')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='entries', to='income.wallet')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['wallet', 'created_at'], name='wallet_entry_wallet_ts_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WalletSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('as_of', models.DateTimeField()),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=15)),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='snapshots', to='income.wallet')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('wallet', 'as_of'), name='wallet_snapshot_unique_as_of')],
+            },
+        ),
+    ]
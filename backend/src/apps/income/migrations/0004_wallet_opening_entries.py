@@ -0,0 +1,33 @@
+from django.db import migrations
+from django.db.models import OuterRef, Subquery
+
+
+def create_opening_entries(apps, schema_editor):
+    """Give every wallet with a balance an opening entry, so balances equal the sum of their entries."""
+    Wallet = apps.get_model('income', 'Wallet')
+    WalletEntry = apps.get_model('income', 'WalletEntry')
+    entries = [
+        WalletEntry(wallet_id=wallet_id, amount=balance, kind='opening')
+        for wallet_id, balance in Wallet.objects.exclude(balance=0).values_list('id', 'balance').iterator()
+    ]
+    WalletEntry.objects.bulk_create(entries, batch_size=1000)
+    # created_at is auto_now_add; date the openings back to when each wallet was created
+    WalletEntry.objects.filter(kind='opening').update(
+        created_at=Subquery(Wallet.objects.filter(id=OuterRef('wallet_id')).values('created_at')[:1])
+    )
+
+
+def remove_opening_entries(apps, schema_editor):
+    WalletEntry = apps.get_model('income', 'WalletEntry')
+    WalletEntry.objects.filter(kind='opening', income__isnull=True, expense__isnull=True).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('income', '0003_walletentry_walletsnapshot'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_opening_entries, remove_opening_entries),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-19 21:34
+
+from datetime import datetime, time
+
+import django.utils.timezone
+from django.db import migrations, models
+from django.db.models import F, Q
+from django.utils import timezone
+
+
+def date_entries_by_source(apps, schema_editor):
+    """
+    Existing entries count from when they were recorded, except those whose
+    Income/Expense is dated on an earlier day, which count from that date.
+    Snapshots were built from insert times and are dropped; the nightly task
+    rebuilds them.
+    """
+    WalletEntry = apps.get_model('income', 'WalletEntry')
+    WalletSnapshot = apps.get_model('income', 'WalletSnapshot')
+    WalletEntry.objects.update(effective_at=F('created_at'))
+
+    changed = []
+    linked = (
+        WalletEntry.objects.filter(Q(income__isnull=False) | Q(expense__isnull=False))
+        .values_list('id', 'created_at', 'income__date', 'expense__date')
+    )
+    for pk, created_at, income_date, expense_date in linked.iterator():
+        day = income_date or expense_date
+        if day < timezone.localdate(created_at):
+            changed.append(WalletEntry(pk=pk, effective_at=timezone.make_aware(datetime.combine(day, time.min))))
+    WalletEntry.objects.bulk_update(changed, ['effective_at'], batch_size=1000)
+
+    WalletSnapshot.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('expense', '0008_expense_wallet'),
+        ('income', '0004_wallet_opening_entries'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='walletentry',
+            name='effective_at',
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.RunPython(date_entries_by_source, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='walletentry',
+            name='wallet_entry_wallet_ts_idx',
+        ),
+        migrations.AddIndex(
+            model_name='walletentry',
+            index=models.Index(fields=['wallet', 'effective_at'], name='wallet_entry_wallet_eff_idx'),
+        ),
+    ]
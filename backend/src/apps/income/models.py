@@ -1,5 +1,7 @@
 from django.db import models
+from django.utils import timezone
 from src.apps.auth.models import User
+from src.apps.common.models import FieldTrackerMixin
 class Category(models.Model):
     name = models.CharField(max_length=100)
     icon = models.CharField(max_length=100, blank=True, null=True, default='food-apple')
@@ -8,7 +10,7 @@ class Category(models.Model):
         return self.name
 
 # Create your models here.
-class Income(models.Model):
+class Income(FieldTrackerMixin, models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     amount = models.DecimalField(max_digits=10, decimal_places=2)
     description = models.TextField()
@@ -18,6 +20,8 @@ class Income(models.Model):
     updated = models.DateField(auto_now=True)
     wallet = models.ForeignKey('Wallet', on_delete=models.SET_NULL, null=True, blank=True, related_name='incomes')
 
+    tracked_fields = ('amount', 'wallet', 'date')
+
     def __str__(self):
         return f"{self.user} - {self.amount} - {self.date}"
 
@@ -40,4 +44,53 @@ class Wallet(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
-        return f"{self.name} ({self.user.username})"
\ No newline at end of file
+        return f"{self.name} ({self.user.username})"
+
+class WalletEntry(models.Model):
+    """
+    One signed movement of a wallet's balance. Wallet.balance is kept equal to
+    the sum of its entries by applying each entry with an F() update.
+
+    ``effective_at`` is when the movement counts for historical balances: the
+    start of the source Income/Expense date when that is in the past, else
+    the time it was recorded.
+    """
+    KIND_CHOICES = (
+        ('opening', 'Opening balance'),
+        ('income', 'Income'),
+        ('expense', 'Expense'),
+        ('adjustment', 'Adjustment'),
+    )
+
+    wallet = models.ForeignKey(Wallet, on_delete=models.CASCADE, related_name='entries')
+    amount = models.DecimalField(max_digits=15, decimal_places=2)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    income = models.ForeignKey(Income, on_delete=models.SET_NULL, null=True, blank=True, related_name='wallet_entries')
+    expense = models.ForeignKey(
+        'expense.Expense', on_delete=models.SET_NULL, null=True, blank=True, related_name='wallet_entries'
+    )
+    effective_at = models.DateTimeField(default=timezone.now)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['wallet', 'effective_at'], name='wallet_entry_wallet_eff_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.wallet_id}: {self.amount} ({self.kind})"
+
+
+class WalletSnapshot(models.Model):
+    """Balance of a wallet including every entry effective up to ``as_of``."""
+    wallet = models.ForeignKey(Wallet, on_delete=models.CASCADE, related_name='snapshots')
+    as_of = models.DateTimeField()
+    balance = models.DecimalField(max_digits=15, decimal_places=2)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['wallet', 'as_of'], name='wallet_snapshot_unique_as_of'),
+        ]
+
+    def __str__(self):
+        return f"{self.wallet_id} @ {self.as_of}: {self.balance}"
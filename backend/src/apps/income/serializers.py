@@ -1,4 +1,5 @@
 from .models import Income, Category, Wallet
+from .services import WalletService
 from rest_framework import serializers
 
 class IncomeCategorySerializer(serializers.ModelSerializer):
@@ -14,6 +15,29 @@ class WalletSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'name', 'balance', 'type', 'icon', 'color', 'identifier', 'created_at']
         read_only_fields = ['created_at']
 
+    def create(self, validated_data):
+        # The opening balance goes through the ledger like any other movement
+        balance = validated_data.pop('balance', None)
+        wallet = Wallet.objects.create(**validated_data)
+        if balance:
+            WalletService.apply(wallet.pk, balance, 'opening')
+            wallet.refresh_from_db(fields=['balance'])
+        return wallet
+
+    def update(self, instance, validated_data):
+        # Only the edited columns are written: the instance's balance may be
+        # stale, and balance moves belong to the ledger (WalletService).
+        balance = validated_data.pop('balance', None)
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        if validated_data:
+            instance.save(update_fields=list(validated_data))
+        if balance is not None:
+            WalletService.set_balance(instance, balance)
+        else:
+            instance.refresh_from_db(fields=['balance'])
+        return instance
+
 class IncomeSerializer(serializers.ModelSerializer):
     user = serializers.HiddenField(default=serializers.CurrentUserDefault()) 
     category_id = serializers.PrimaryKeyRelatedField(
@@ -30,20 +54,7 @@ class IncomeSerializer(serializers.ModelSerializer):
         model = Income
         fields = ['id', 'user', 'amount', 'description', 'category_id', 'wallet_id', 'category', 'wallet', 'group', 'date', 'updated']
 
-    def create(self, validated_data):
-        user = self.context['request'].user
-        
-        # Extract wallet if present
-        wallet = validated_data.get('wallet')
-        amount = validated_data.get('amount')
-        
-        income = Income.objects.create(**validated_data)
-        
-        # If wallet is linked, update its balance
-        if wallet and amount:
-            wallet.balance += amount
-            wallet.save(update_fields=['balance'])
-            
-        return income
-
-
+    def validate_wallet_id(self, wallet):
+        if wallet and wallet.user_id != self.context['request'].user.id:
+            raise serializers.ValidationError("Wallet not found.")
+        return wallet
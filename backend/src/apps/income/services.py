@@ -0,0 +1,182 @@
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import DateTimeField, DecimalField, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Wallet, WalletEntry, WalletSnapshot
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class WalletService:
+
+    @staticmethod
+    def effective_at(day):
+        """
+        When a movement dated ``day`` counts: the start of that day, or now
+        for today's (and undated) movements.
+        """
+        if day is None or day == timezone.localdate():
+            return timezone.now()
+        return timezone.make_aware(datetime.combine(day, time.min))
+
+    @staticmethod
+    def apply(wallet_id, amount, kind, income=None, expense=None, effective_at=None):
+        """
+        Record a signed movement on a wallet and move its balance with a single
+        UPDATE ... SET balance = balance + amount, so concurrent writers never
+        overwrite each other. Snapshots at or after ``effective_at`` no longer
+        hold and are dropped. Returns the entry, or None when nothing changed.
+        """
+        if not wallet_id or not amount:
+            return None
+        effective_at = effective_at or timezone.now()
+        with transaction.atomic():
+            if not Wallet.objects.filter(pk=wallet_id).update(balance=F('balance') + amount):
+                return None
+            WalletSnapshot.objects.filter(wallet_id=wallet_id, as_of__gte=effective_at).delete()
+            return WalletEntry.objects.create(
+                wallet_id=wallet_id, amount=amount, kind=kind, income=income, expense=expense,
+                effective_at=effective_at,
+            )
+
+    @staticmethod
+    def set_balance(wallet, balance, kind='adjustment'):
+        """Move a wallet to an explicit balance by recording the difference as an entry."""
+        with transaction.atomic():
+            current = Wallet.objects.select_for_update().values_list('balance', flat=True).get(pk=wallet.pk)
+            WalletService.apply(wallet.pk, balance - current, kind)
+        wallet.refresh_from_db(fields=['balance'])
+        return wallet
+
+    @staticmethod
+    def sync(instance, kind, sign, created):
+        """
+        Mirror a saved Income (sign 1) or Expense (sign -1) in its wallet,
+        effective on its date. An edit that changes the amount, the wallet or
+        the date reverses the old movement and applies the new one.
+        """
+        source = {kind: instance}
+        effective_at = WalletService.effective_at(instance.date)
+        if created:
+            WalletService.apply(instance.wallet_id, sign * instance.amount, kind, effective_at=effective_at, **source)
+            return
+        if not any(instance.has_changed(name) for name in ('amount', 'wallet', 'date')):
+            return
+        previous_amount = instance.previous('amount')
+        with transaction.atomic():
+            if previous_amount is not None:
+                WalletService.apply(
+                    instance.previous('wallet'), -sign * previous_amount, kind,
+                    effective_at=WalletService.effective_at(instance.previous('date') or instance.date), **source
+                )
+            WalletService.apply(instance.wallet_id, sign * instance.amount, kind, effective_at=effective_at, **source)
+
+    @staticmethod
+    def reverse(instance, kind, sign):
+        """
+        Undo a deleted Income or Expense, effective on its date so historical
+        balances drop it too. Called before the row goes away; the reversing
+        entry is not linked to it, as the delete nulls those links.
+        """
+        WalletService.apply(
+            instance.wallet_id, -sign * instance.amount, kind, effective_at=WalletService.effective_at(instance.date)
+        )
+
+    @staticmethod
+    def balance_as_of(wallet_id, when):
+        """
+        Balance including every entry effective up to ``when``: the nearest
+        snapshot at or before it plus the entries effective since.
+        """
+        snapshot = (
+            WalletSnapshot.objects.filter(wallet_id=wallet_id, as_of__lte=when)
+            .order_by('-as_of')
+            .values('as_of', 'balance')
+            .first()
+        )
+        entries = WalletEntry.objects.filter(wallet_id=wallet_id, effective_at__lte=when)
+        balance = Decimal('0')
+        if snapshot:
+            entries = entries.filter(effective_at__gt=snapshot['as_of'])
+            balance = snapshot['balance']
+        return balance + (entries.aggregate(total=Sum('amount'))['total'] or Decimal('0'))
+
+    @staticmethod
+    def default_snapshot_time():
+        """Start of the current day in the active timezone."""
+        return timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+
+    @staticmethod
+    def take_snapshots(as_of=None, batch_size=None):
+        """
+        Snapshot every wallet that moved since its previous snapshot, rolling
+        that snapshot forward with the entries in between. Returns the number
+        of snapshots written.
+        """
+        as_of = as_of or WalletService.default_snapshot_time()
+        batch_size = batch_size or settings.WALLET_SNAPSHOT_BATCH_SIZE
+
+        latest = WalletSnapshot.objects.filter(wallet=OuterRef('pk'), as_of__lte=as_of).order_by('-as_of')
+        since = (
+            WalletEntry.objects.filter(
+                wallet=OuterRef('pk'), effective_at__lte=as_of, effective_at__gt=OuterRef('last_as_of')
+            )
+            .values('wallet')
+            .annotate(total=Sum('amount'))
+            .values('total')
+        )
+        wallets = (
+            Wallet.objects.annotate(
+                last_as_of=Coalesce(Subquery(latest.values('as_of')[:1]), Value(EPOCH), output_field=DateTimeField()),
+                last_balance=Subquery(latest.values('balance')[:1]),
+            )
+            .annotate(delta=Coalesce(Subquery(since), Value(Decimal('0')), output_field=DecimalField()))
+            .order_by('pk')
+            .values('pk', 'last_as_of', 'last_balance', 'delta')
+        )
+
+        written = 0
+        last_pk = 0
+        while True:
+            rows = list(wallets.filter(pk__gt=last_pk)[:batch_size])
+            if not rows:
+                return written
+            snapshots = [
+                WalletSnapshot(
+                    wallet_id=row['pk'], as_of=as_of, balance=(row['last_balance'] or Decimal('0')) + row['delta']
+                )
+                for row in rows
+                if row['last_as_of'] < as_of and (row['delta'] or row['last_balance'] is None)
+            ]
+            # ignore_conflicts keeps a re-run for the same day from failing
+            WalletSnapshot.objects.bulk_create(snapshots, ignore_conflicts=True)
+            written += len(snapshots)
+            last_pk = rows[-1]['pk']
+            if len(rows) < batch_size:
+                return written
+
+    @staticmethod
+    def parse_as_of(value):
+        """
+        Parse the ``as_of`` query parameter. A bare date means the end of that
+        day; a missing value means now. Returns None when it cannot be parsed.
+        """
+        if not value:
+            return timezone.now()
+        try:
+            day = parse_date(value)
+            when = None if day else parse_datetime(value)
+        except ValueError:
+            return None
+        if day is not None:
+            return timezone.make_aware(datetime.combine(day + timedelta(days=1), time.min)) - timedelta(microseconds=1)
+        if when is None:
+            return None
+        return when if timezone.is_aware(when) else timezone.make_aware(when)
@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from src.apps.expense.models import Expense
+from .models import Income
+from .services import WalletService
+
+
+@receiver(post_save, sender=Income)
+def credit_wallet_for_income(sender, instance, created, **kwargs):
+    WalletService.sync(instance, 'income', 1, created)
+
+
+@receiver(pre_delete, sender=Income)
+def reverse_income_wallet_entry(sender, instance, **kwargs):
+    WalletService.reverse(instance, 'income', 1)
+
+
+@receiver(post_save, sender=Expense)
+def debit_wallet_for_expense(sender, instance, created, **kwargs):
+    WalletService.sync(instance, 'expense', -1, created)
+
+
+@receiver(pre_delete, sender=Expense)
+def reverse_expense_wallet_entry(sender, instance, **kwargs):
+    WalletService.reverse(instance, 'expense', -1)
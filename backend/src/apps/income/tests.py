@@ -1,3 +1,105 @@
-from django.test import TestCase
+from datetime import date
+from decimal import Decimal
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import RequestFactory, TestCase
+
+from src.apps.expense.models import Expense
+from .models import Wallet, WalletEntry, WalletSnapshot
+from .serializers import WalletSerializer
+from .services import WalletService
+
+
+def end_of(day):
+    return WalletService.parse_as_of(day.isoformat())
+
+
+class WalletHistoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("wallet-user", "wallet@example.com", "pw")
+
+    def setUp(self):
+        self.wallet = Wallet.objects.create(user=self.user, name="Cash")
+
+    def expense(self, amount, day):
+        return Expense.objects.create(
+            amount=Decimal(amount), description="Groceries", date=day, created_by=self.user, paid_by=self.user,
+            wallet=self.wallet,
+        )
+
+    def test_backdated_expense_counts_from_its_date(self):
+        self.expense('30', date(2025, 1, 10))
+
+        self.assertEqual(WalletService.balance_as_of(self.wallet.pk, end_of(date(2025, 1, 9))), Decimal('0'))
+        self.assertEqual(WalletService.balance_as_of(self.wallet.pk, end_of(date(2025, 1, 10))), Decimal('-30'))
+
+    def test_backdated_expense_drops_later_snapshots(self):
+        self.expense('10', date(2025, 1, 1))
+        WalletService.take_snapshots(as_of=end_of(date(2025, 1, 20)))
+
+        self.expense('5', date(2025, 1, 15))
+
+        self.assertFalse(WalletSnapshot.objects.filter(wallet=self.wallet).exists())
+        self.assertEqual(WalletService.balance_as_of(self.wallet.pk, end_of(date(2025, 1, 20))), Decimal('-15'))
+        WalletService.take_snapshots(as_of=end_of(date(2025, 1, 20)))
+        self.assertEqual(WalletSnapshot.objects.get(wallet=self.wallet).balance, Decimal('-15'))
+
+    def test_redating_moves_the_movement(self):
+        expense = self.expense('20', date(2025, 1, 10))
+
+        expense.date = date(2025, 2, 10)
+        expense.save()
+
+        self.assertEqual(WalletService.balance_as_of(self.wallet.pk, end_of(date(2025, 1, 31))), Decimal('0'))
+        self.assertEqual(WalletService.balance_as_of(self.wallet.pk, end_of(date(2025, 2, 10))), Decimal('-20'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('-20'))
+
+    def test_deleted_expense_leaves_history(self):
+        self.expense('20', date(2025, 1, 10)).delete()
+
+        self.assertEqual(WalletService.balance_as_of(self.wallet.pk, end_of(date(2025, 1, 10))), Decimal('0'))
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('0'))
+
+
+class WalletSerializerTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("rename-user", "rename@example.com", "pw")
+
+    def setUp(self):
+        self.wallet = Wallet.objects.create(user=self.user, name="Cash")
+        request = RequestFactory().patch("/")
+        request.user = self.user
+        self.context = {'request': request}
+
+    def update(self, wallet, **data):
+        serializer = WalletSerializer(wallet, data=data, partial=True, context=self.context)
+        serializer.is_valid(raise_exception=True)
+        return serializer.save()
+
+    def test_rename_does_not_overwrite_a_concurrent_movement(self):
+        stale = Wallet.objects.get(pk=self.wallet.pk)
+        WalletService.apply(self.wallet.pk, Decimal('50'), 'adjustment')
+
+        renamed = self.update(stale, name="Pocket")
+
+        self.wallet.refresh_from_db()
+        self.assertEqual((self.wallet.name, self.wallet.balance), ("Pocket", Decimal('50')))
+        self.assertEqual(renamed.balance, Decimal('50'))
+
+    def test_explicit_balance_is_recorded_as_an_adjustment(self):
+        WalletService.apply(self.wallet.pk, Decimal('50'), 'adjustment')
+
+        self.update(Wallet.objects.get(pk=self.wallet.pk), name="Pocket", balance='80')
+
+        self.wallet.refresh_from_db()
+        self.assertEqual(self.wallet.balance, Decimal('80'))
+        self.assertEqual(
+            list(WalletEntry.objects.filter(wallet=self.wallet).order_by('pk').values_list('amount', flat=True)),
+            [Decimal('50'), Decimal('30')],
+        )
@@ -1,5 +1,5 @@
 from django.urls import path    
-from .views import IncomeListCreateView, IncomeRetrieveUpdateDestroyView, CategoryListCreateView, WalletListCreateView, WalletRetrieveUpdateDestroyView
+from .views import IncomeListCreateView, IncomeRetrieveUpdateDestroyView, CategoryListCreateView, WalletListCreateView, WalletRetrieveUpdateDestroyView, WalletBalanceView
 
 urlpatterns = [
     path("", IncomeListCreateView.as_view(), name="income-list-create"),
@@ -7,4 +7,5 @@ urlpatterns = [
     path("categories/", CategoryListCreateView.as_view(), name="income-category-list-create"),
     path("wallets/", WalletListCreateView.as_view(), name="wallet-list-create"),
     path("wallets/<int:pk>/", WalletRetrieveUpdateDestroyView.as_view(), name="wallet-retrieve-update-destroy"),
+    path("wallets/<int:pk>/balance/", WalletBalanceView.as_view(), name="wallet-balance"),
 ]
\ No newline at end of file
@@ -1,9 +1,13 @@
 from django.shortcuts import render
 from .models import Income, Category, Wallet
 from .serializers import IncomeSerializer, IncomeCategorySerializer, WalletSerializer
+from .services import WalletService
 from rest_framework.generics import GenericAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
 from .filters import IncomeFilter
 from rest_framework.permissions import IsAuthenticated
+from src.apps.common.replica import ReplicaReadMixin
 
 # Create your views here.
 class IncomeListCreateView(ListCreateAPIView):
@@ -40,4 +44,26 @@ class WalletRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
-        return Wallet.objects.filter(user=self.request.user)
\ No newline at end of file
+        return Wallet.objects.filter(user=self.request.user)
+
+
+class WalletBalanceView(ReplicaReadMixin, GenericAPIView):
+    """
+    Balance of a wallet as of ``?as_of=`` (a date means the end of that day,
+    default now), read from the nearest snapshot plus later entries.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return Wallet.objects.filter(user=self.request.user)
+
+    def get(self, request, *args, **kwargs):
+        wallet = self.get_object()
+        as_of = WalletService.parse_as_of(request.query_params.get('as_of'))
+        if as_of is None:
+            raise ValidationError({'as_of': 'Use YYYY-MM-DD or an ISO 8601 datetime.'})
+        return Response({
+            'wallet': wallet.pk,
+            'as_of': as_of.isoformat(),
+            'balance': WalletService.balance_as_of(wallet.pk, as_of),
+        })
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:42
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lend', '0005_alter_transaction_transaction_type'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['initiator', 'created_at'], name='lend_txn_initiator_ts_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['participant', 'created_at'], name='lend_txn_participant_ts_idx'),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('lend', '0006_transaction_user_created_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='transaction',
+            name='accrued_interest',
+            field=models.DecimalField(decimal_places=2, default=0, help_text='Simple interest accrued so far, refreshed by the nightly accrual job.', max_digits=12),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='interest_accrued_on',
+            field=models.DateField(blank=True, help_text='The date accrued_interest was last computed for.', null=True),
+        ),
+        migrations.AddField(
+            model_name='transaction',
+            name='is_overdue',
+            field=models.BooleanField(default=False, help_text='Set by the nightly accrual job when an accepted transaction is past its due date.'),
+        ),
+    ]
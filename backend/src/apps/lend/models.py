@@ -1,8 +1,9 @@
 from django.db import models
 from src.apps.auth.models import User
+from src.apps.common.models import FieldTrackerMixin
 
 
-class Transaction(models.Model):
+class Transaction(FieldTrackerMixin, models.Model):
  
     LEND = 'L'
     BORROW = 'B'
@@ -81,10 +82,31 @@ class Transaction(models.Model):
         default=False,
         help_text="Indicates if both the initiator and the participant have verified the transaction."
     )
+    accrued_interest = models.DecimalField(
+        max_digits=12,
+        decimal_places=2,
+        default=0,
+        help_text="Simple interest accrued so far, refreshed by the nightly accrual job."
+    )
+    is_overdue = models.BooleanField(
+        default=False,
+        help_text="Set by the nightly accrual job when an accepted transaction is past its due date."
+    )
+    interest_accrued_on = models.DateField(
+        null=True,
+        blank=True,
+        help_text="The date accrued_interest was last computed for."
+    )
+
 
+    tracked_fields = ('status',)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['initiator', 'created_at'], name='lend_txn_initiator_ts_idx'),
+            models.Index(fields=['participant', 'created_at'], name='lend_txn_participant_ts_idx'),
+        ]
 
     def __str__(self):
         return f"{self.initiator} {self.get_transaction_type_display()} {self.amount} to {self.participant}"
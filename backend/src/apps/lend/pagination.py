@@ -0,0 +1,9 @@
+from rest_framework.pagination import CursorPagination
+
+
+class TransactionCursorPagination(CursorPagination):
+    """Keyset pagination backed by the (initiator|participant, created_at) indexes."""
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-id')
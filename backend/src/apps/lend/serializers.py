@@ -30,9 +30,11 @@ class TransactionSerializer(serializers.ModelSerializer):
             'updated_at',
             'verified_by_initiator',
             'verified_by_participant',
-            'is_verified'
+            'is_verified',
+            'accrued_interest',
+            'is_overdue',
         ]
-        read_only_fields = ['initiator', 'participant_username']
+        read_only_fields = ['initiator', 'participant_username', 'accrued_interest', 'is_overdue']
 
     def validate(self, data):
         # Ensure the `verified_by_participant` field is not set on creation.
@@ -0,0 +1,201 @@
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DateField, DecimalField, DurationField, ExpressionWrapper, F, Q, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce, ExtractDay, Greatest, Round, TruncDate
+from django.utils import timezone
+
+from src.apps.notification.services import NotificationService
+from .models import Transaction
+
+
+class TransactionSummaryService:
+    """
+    Per-counterparty totals for a user's lend/borrow records, computed with
+    one grouped query over the initiator OR participant relationship.
+    """
+
+    @staticmethod
+    def _total(condition):
+        return Coalesce(
+            Sum('amount', filter=condition), Value(Decimal('0')), output_field=DecimalField()
+        )
+
+    @staticmethod
+    def counterparties(user):
+        # Money flows from the user when they lent, or when the other side
+        # recorded borrowing from them.
+        i_lent = (
+            Q(initiator=user, transaction_type=Transaction.LEND)
+            | Q(participant=user, transaction_type=Transaction.BORROW)
+        )
+        i_borrowed = (
+            Q(initiator=user, transaction_type=Transaction.BORROW)
+            | Q(participant=user, transaction_type=Transaction.LEND)
+        )
+        # Outstanding is everything not yet paid back, pending records
+        # included; only accepted records can be overdue.
+        outstanding = ~Q(status=Transaction.PAID)
+        overdue = Q(status=Transaction.ACCEPTED, due_date__lt=timezone.localdate())
+        total = TransactionSummaryService._total
+
+        rows = (
+            Transaction.objects.filter(Q(initiator=user) | Q(participant=user))
+            .annotate(
+                counterparty_id=Case(When(initiator=user, then=F('participant_id')), default=F('initiator_id')),
+                counterparty_username=Case(
+                    When(initiator=user, then=F('participant__username')), default=F('initiator__username')
+                ),
+            )
+            .values('counterparty_id', 'counterparty_username')
+            .annotate(
+                lent=total(outstanding & i_lent),
+                borrowed=total(outstanding & i_borrowed),
+                pending_count=Count('id', filter=Q(status=Transaction.PENDING)),
+                pending_amount=total(Q(status=Transaction.PENDING)),
+                overdue_count=Count('id', filter=overdue),
+                overdue_lent=total(overdue & i_lent),
+                overdue_borrowed=total(overdue & i_borrowed),
+            )
+            .order_by()
+        )
+
+        counterparties = [
+            {
+                'user': {'id': row['counterparty_id'], 'username': row['counterparty_username']},
+                'net_lent': row['lent'],
+                'net_borrowed': row['borrowed'],
+                'net_balance': row['lent'] - row['borrowed'],
+                'pending_count': row['pending_count'],
+                'pending_amount': row['pending_amount'],
+                'overdue_count': row['overdue_count'],
+                'overdue_lent': row['overdue_lent'],
+                'overdue_borrowed': row['overdue_borrowed'],
+            }
+            for row in rows
+        ]
+        counterparties.sort(key=lambda item: abs(item['net_balance']), reverse=True)
+        return counterparties
+
+    @staticmethod
+    def summary(user):
+        counterparties = TransactionSummaryService.counterparties(user)
+        totals = {
+            field: sum((item[field] for item in counterparties), Decimal('0'))
+            for field in ('net_lent', 'net_borrowed', 'net_balance', 'overdue_lent', 'overdue_borrowed')
+        }
+        totals['pending_count'] = sum(item['pending_count'] for item in counterparties)
+        totals['overdue_count'] = sum(item['overdue_count'] for item in counterparties)
+        return {'totals': totals, 'counterparties': counterparties}
+
+
+class LoanAccrualService:
+    """
+    Nightly bookkeeping for open (accepted, unpaid) transactions: simple
+    interest accrued since creation and the overdue flag.
+    """
+    DAYS_PER_YEAR = Decimal('365')
+    CENT = Decimal('0.01')
+
+    @staticmethod
+    def interest(amount, rate, start, today):
+        days = max((today - start).days, 0)
+        return (amount * rate / Decimal('100') * days / LoanAccrualService.DAYS_PER_YEAR).quantize(
+            LoanAccrualService.CENT, rounding=ROUND_HALF_UP
+        )
+
+    @staticmethod
+    def accrued_interest_expression(today):
+        """
+        interest() as a database expression, so accrual is a single UPDATE:
+        amount * rate / 100 * days since the loan's creation date / 365,
+        rounded to the cent.
+        """
+        elapsed = ExpressionWrapper(
+            Value(today, output_field=DateField()) - TruncDate('created_at'), output_field=DurationField()
+        )
+        days = Greatest(ExtractDay(elapsed), Value(0))
+        return Round(
+            ExpressionWrapper(
+                F('amount') * F('interest_rate') * days / (Decimal('100') * LoanAccrualService.DAYS_PER_YEAR),
+                output_field=DecimalField(max_digits=20, decimal_places=10),
+            ),
+            2,
+        )
+
+    @staticmethod
+    def accrue_interest(today, batch_size):
+        """
+        Recompute accrued_interest in the database, one UPDATE per keyset
+        batch of pks, without loading the loans. Returns rows updated.
+        """
+        open_loans = Transaction.objects.filter(status=Transaction.ACCEPTED, interest_rate__gt=0)
+        accrued = LoanAccrualService.accrued_interest_expression(today)
+        updated = 0
+        last_pk = 0
+        while True:
+            # pk of the batch_size-th remaining loan, or None for the final partial batch
+            batch_end = (
+                open_loans.filter(pk__gt=last_pk).order_by('pk')
+                .values_list('pk', flat=True)[batch_size - 1:batch_size].first()
+            )
+            batch = open_loans.filter(pk__gt=last_pk)
+            if batch_end is not None:
+                batch = batch.filter(pk__lte=batch_end)
+            updated += batch.update(accrued_interest=accrued, interest_accrued_on=today)
+            if batch_end is None:
+                return updated
+            last_pk = batch_end
+
+    @staticmethod
+    def refresh_overdue(today):
+        """
+        Flip is_overdue with set-based UPDATEs and return the loans that just
+        became overdue, for notification.
+        """
+        past_due = Q(status=Transaction.ACCEPTED, due_date__lt=today)
+        newly_overdue = list(
+            Transaction.objects.filter(past_due, is_overdue=False)
+            .select_related('initiator', 'participant')
+            .only(
+                'id', 'amount', 'accrued_interest', 'due_date', 'transaction_type',
+                'initiator__id', 'initiator__username', 'participant__id', 'participant__username',
+            )
+        )
+        Transaction.objects.filter(id__in=[loan.id for loan in newly_overdue]).update(is_overdue=True)
+        # Paid or rescheduled loans lose the flag
+        Transaction.objects.filter(is_overdue=True).exclude(past_due).update(is_overdue=False)
+        return newly_overdue
+
+    @staticmethod
+    def overdue_digests(loans):
+        """One message per user listing every loan of theirs that just became overdue."""
+        lines = defaultdict(list)
+        for loan in loans:
+            lender, borrower = (
+                (loan.initiator, loan.participant)
+                if loan.transaction_type == Transaction.LEND
+                else (loan.participant, loan.initiator)
+            )
+            due = f"{loan.amount} (+{loan.accrued_interest} interest) due {loan.due_date}"
+            lines[lender.pk].append(f"- {borrower.username} owes you {due}")
+            lines[borrower.pk].append(f"- You owe {lender.username} {due}")
+
+        return [
+            (user_id, f"{len(items)} loan(s) are now overdue:\n" + "\n".join(items))
+            for user_id, items in lines.items()
+        ]
+
+    @staticmethod
+    def run(today=None, batch_size=None):
+        today = today or timezone.localdate()
+        batch_size = batch_size or settings.LEND_ACCRUAL_BATCH_SIZE
+        accrued = LoanAccrualService.accrue_interest(today, batch_size)
+        with transaction.atomic():
+            newly_overdue = LoanAccrualService.refresh_overdue(today)
+            NotificationService.bulk_notify(LoanAccrualService.overdue_digests(newly_overdue))
+        return {'accrued': accrued, 'newly_overdue': len(newly_overdue)}
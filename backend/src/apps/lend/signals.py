@@ -10,7 +10,7 @@ def transaction_status_handler(sender, instance, created, **kwargs):
     """
     subject = "Transaction Update"
     message = ""
-    recipients = []
+    recipient_ids = []
 
     # Case 1: New transaction created
     if created:
@@ -20,38 +20,32 @@ def transaction_status_handler(sender, instance, created, **kwargs):
             f"{instance.amount} with a due date of {instance.due_date}. "
             f"Please review and verify the transaction."
         )
-        recipients = [instance.participant.email]
+        recipient_ids = [instance.participant_id]
 
     # Case 2: Existing transaction updated
-    else:
-        # Check for status changes
-        try:
-            old_instance = sender.objects.get(pk=instance.pk)
-            if old_instance.status != instance.status:
-                if instance.status == Transaction.ACCEPTED:
-                    subject = "Transaction Accepted"
-                    message = (
-                        f"The transaction with {instance.initiator.username} has been accepted. "
-                        "It is now ready for payment."
-                    )
-                    recipients = [instance.initiator.email, instance.participant.email]
-                
-                elif instance.status == Transaction.PAID:
-                    subject = "Transaction Paid"
-                    message = (
-                        f"The transaction with {instance.initiator.username} has been marked as PAID. "
-                        f"Thank you for using our service."
-                    )
-                    recipients = [instance.initiator.email, instance.participant.email]
+    elif instance.has_changed('status'):
+        # The tracker still holds the status as loaded, so the change is visible here
+        if instance.status == Transaction.ACCEPTED:
+            subject = "Transaction Accepted"
+            message = (
+                f"The transaction with {instance.initiator.username} has been accepted. "
+                "It is now ready for payment."
+            )
+            recipient_ids = [instance.initiator_id, instance.participant_id]
 
-        except sender.DoesNotExist:
-            # This case should not happen under normal circumstances for updates
-            pass
+        elif instance.status == Transaction.PAID:
+            subject = "Transaction Paid"
+            message = (
+                f"The transaction with {instance.initiator.username} has been marked as PAID. "
+                f"Thank you for using our service."
+            )
+            recipient_ids = [instance.initiator_id, instance.participant_id]
 
     # Send the email if there are recipients
-    if recipients and message:
+    if recipient_ids and message:
         send_user_mail.delay(
             subject=subject,
             message=message,
-            recipients=recipients
+            recipients=[],
+            user_ids=[str(pk) for pk in recipient_ids]
         )
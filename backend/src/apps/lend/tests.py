@@ -1,3 +1,201 @@
-from django.test import TestCase
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.test import SimpleTestCase, TestCase, skipUnlessDBFeature
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from .models import Transaction
+from src.apps.notification.models import Notification
+from .services import LoanAccrualService, TransactionSummaryService
+
+User = get_user_model()
+
+
+def make_user(username):
+    return User.objects.create_user(username, f"{username}@example.com", "pw")
+
+
+class LendTestCase(TestCase):
+    """Status mails are queued on every save; keep them off the broker."""
+
+    @classmethod
+    def setUpClass(cls):
+        patcher = mock.patch('src.apps.lend.signals.send_user_mail')
+        patcher.start()
+        cls.addClassCleanup(patcher.stop)
+        super().setUpClass()
+
+
+def record(initiator, participant, amount, transaction_type=Transaction.LEND, status=Transaction.ACCEPTED, **fields):
+    return Transaction.objects.create(
+        initiator=initiator, participant=participant, amount=Decimal(amount),
+        transaction_type=transaction_type, status=status, **fields,
+    )
+
+
+class TransactionSummaryTests(LendTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice, cls.bob = make_user("me"), make_user("alice"), make_user("bob")
+
+    def by_counterparty(self):
+        return {item['user']['username']: item for item in TransactionSummaryService.counterparties(self.user)}
+
+    def test_nets_both_directions_per_counterparty(self):
+        record(self.user, self.alice, '100')
+        # alice recorded borrowing from me, so I lent again
+        record(self.alice, self.user, '20', Transaction.BORROW)
+        record(self.alice, self.user, '30')
+        record(self.bob, self.user, '50')
+
+        rows = self.by_counterparty()
+
+        self.assertEqual(
+            (rows['alice']['net_lent'], rows['alice']['net_borrowed'], rows['alice']['net_balance']),
+            (Decimal('120'), Decimal('30'), Decimal('90')),
+        )
+        self.assertEqual(rows['bob']['net_balance'], Decimal('-50'))
+        self.assertEqual(list(rows), ['alice', 'bob'])
+
+    def test_pending_is_outstanding_and_paid_is_not(self):
+        record(self.user, self.alice, '40', status=Transaction.PENDING)
+        record(self.user, self.alice, '10')
+        record(self.user, self.alice, '500', status=Transaction.PAID)
+
+        totals = TransactionSummaryService.summary(self.user)['totals']
+
+        self.assertEqual(totals['net_lent'], Decimal('50'))
+        self.assertEqual(totals['pending_count'], 1)
+        self.assertEqual(self.by_counterparty()['alice']['pending_amount'], Decimal('40'))
+
+    def test_only_accepted_records_are_overdue(self):
+        yesterday = timezone.localdate() - timedelta(days=1)
+        record(self.user, self.alice, '10', due_date=yesterday)
+        record(self.user, self.alice, '20', status=Transaction.PENDING, due_date=yesterday)
+        record(self.bob, self.user, '30', due_date=timezone.localdate())
+
+        totals = TransactionSummaryService.summary(self.user)['totals']
+
+        self.assertEqual((totals['overdue_count'], totals['overdue_lent']), (1, Decimal('10')))
+        self.assertEqual(totals['overdue_borrowed'], Decimal('0'))
+
+    def test_summary_endpoint(self):
+        record(self.user, self.alice, '10')
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        response = client.get(reverse('transaction-summary'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(response.data['totals']['net_balance']), Decimal('10'))
+        self.assertEqual(response.data['counterparties'][0]['user']['username'], 'alice')
+
+
+class TransactionListTests(LendTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice = make_user("me"), make_user("alice")
+        cls.records = [record(cls.user, cls.alice, '1') for _ in range(8)]
+        cls.records += [record(cls.alice, cls.user, '2') for _ in range(7)]
+        record(cls.alice, make_user("bob"), '3')
+
+    def test_cursor_pages_cover_both_sides_newest_first(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        first = client.get(reverse('transaction-list-create')).data
+        second = client.get(first['next']).data
+
+        self.assertEqual(len(first['results']), 10)
+        self.assertIsNone(second['next'])
+        self.assertEqual(
+            [item['id'] for item in first['results'] + second['results']],
+            [item.pk for item in reversed(self.records)],
+        )
+
+
+class InterestTests(SimpleTestCase):
+
+    def test_simple_interest_rounds_to_the_cent(self):
+        interest = LoanAccrualService.interest(Decimal('1000'), Decimal('12'), date(2025, 1, 1), date(2025, 1, 31))
+
+        self.assertEqual(interest, Decimal('9.86'))
+
+    def test_no_interest_before_the_loan_starts(self):
+        self.assertEqual(
+            LoanAccrualService.interest(Decimal('1000'), Decimal('12'), date(2025, 2, 1), date(2025, 1, 1)),
+            Decimal('0.00'),
+        )
+
+
+class LoanAccrualTests(LendTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user, cls.alice = make_user("me"), make_user("alice")
+
+    def setUp(self):
+        self.today = timezone.localdate()
+
+    @skipUnlessDBFeature('has_native_duration_field')
+    def test_accrual_in_the_database_matches_interest(self):
+        loans = [
+            record(self.user, self.alice, amount, interest_rate=Decimal(rate))
+            for amount, rate in (('1000', '12'), ('333.33', '7.5'), ('50', '0'))
+        ]
+        record(self.user, self.alice, '1000', status=Transaction.PENDING, interest_rate=Decimal('12'))
+        Transaction.objects.update(created_at=timezone.now() - timedelta(days=200))
+
+        self.assertEqual(LoanAccrualService.accrue_interest(self.today, batch_size=1), 2)
+
+        for loan in loans[:2]:
+            loan.refresh_from_db()
+            created = timezone.localdate(loan.created_at)
+            self.assertEqual(
+                loan.accrued_interest,
+                LoanAccrualService.interest(loan.amount, loan.interest_rate, created, self.today),
+            )
+            self.assertEqual(loan.interest_accrued_on, self.today)
+
+    def test_overdue_flag_follows_due_date_and_status(self):
+        two_days_ago = self.today - timedelta(days=2)
+        late = record(self.user, self.alice, '10', due_date=two_days_ago)
+        on_time = record(self.user, self.alice, '20', due_date=self.today)
+        pending = record(self.user, self.alice, '30', status=Transaction.PENDING, due_date=two_days_ago)
+
+        self.assertEqual(LoanAccrualService.refresh_overdue(self.today), [late])
+        self.assertEqual(LoanAccrualService.refresh_overdue(self.today), [])
+        self.assertEqual(
+            set(Transaction.objects.filter(is_overdue=True).values_list('pk', flat=True)), {late.pk}
+        )
+
+        Transaction.objects.filter(pk=late.pk).update(status=Transaction.PAID)
+        LoanAccrualService.refresh_overdue(self.today)
+        self.assertFalse(Transaction.objects.filter(pk__in=[late.pk, on_time.pk, pending.pk], is_overdue=True).exists())
+
+    def test_one_digest_per_user(self):
+        record(self.user, self.alice, '10', due_date=self.today - timedelta(days=1))
+        record(self.alice, self.user, '20', due_date=self.today - timedelta(days=1))
+
+        digests = dict(LoanAccrualService.overdue_digests(LoanAccrualService.refresh_overdue(self.today)))
+
+        self.assertEqual(set(digests), {self.user.pk, self.alice.pk})
+        self.assertTrue(digests[self.user.pk].startswith("2 loan(s) are now overdue:"))
+        self.assertIn("- alice owes you 10.00", digests[self.user.pk])
+        self.assertIn("- You owe alice 20.00", digests[self.user.pk])
+
+    @skipUnlessDBFeature('has_native_duration_field')
+    def test_nightly_run_notifies_each_user_once(self):
+        record(self.user, self.alice, '10', due_date=self.today - timedelta(days=1))
+
+        LoanAccrualService.run(self.today)
+        LoanAccrualService.run(self.today)
+
+        self.assertEqual(Notification.objects.filter(recipient=self.user).count(), 1)
+        self.assertEqual(Notification.objects.filter(recipient=self.alice).count(), 1)
@@ -3,13 +3,17 @@ from .views import (
     TransactionListCreateView,
     TransactionRetrieveUpdateDestroyView,
     TransactionVerificationView,
-    TransactionMarkPaidView
+    TransactionMarkPaidView,
+    TransactionSummaryView,
 )
 
 urlpatterns = [
     # URL for listing all transactions and creating a new one
     path('', TransactionListCreateView.as_view(), name='transaction-list-create'),
 
+    # Per-counterparty totals (net lent/borrowed, pending, overdue)
+    path('summary/', TransactionSummaryView.as_view(), name='transaction-summary'),
+
     # URL for retrieving, updating, or deleting a specific transaction
     path('<int:id>/', TransactionRetrieveUpdateDestroyView.as_view(), name='transaction-detail'),
     
@@ -6,8 +6,11 @@ from django.db import transaction as db_transaction
 from django.db.models import Q
 
 from .models import Transaction
+from .pagination import TransactionCursorPagination
 from .serializers import TransactionSerializer, TransactionVerificationSerializer
+from .services import TransactionSummaryService
 from .permissions import IsParticipantOrReadOnly, IsInitiatorOrReadOnly, IsInitiator, IsParticipant
+from src.apps.common.replica import ReplicaReadMixin
 
 
 class TransactionListCreateView(generics.ListCreateAPIView):
@@ -17,6 +20,7 @@ class TransactionListCreateView(generics.ListCreateAPIView):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = TransactionCursorPagination
 
     def get_queryset(self):
         """
@@ -24,7 +28,7 @@ class TransactionListCreateView(generics.ListCreateAPIView):
         """
         return self.queryset.filter(
             Q(initiator=self.request.user) | Q(participant=self.request.user)
-        )
+        ).select_related('initiator', 'participant')
 
     def perform_create(self, serializer):
         """
@@ -42,6 +46,17 @@ class TransactionListCreateView(generics.ListCreateAPIView):
                 instance.save(update_fields=["verified_by_participant"])
 
 
+class TransactionSummaryView(ReplicaReadMixin, APIView):
+    """
+    Net lent, net borrowed, pending and overdue amounts per counterparty,
+    plus overall totals, in a single grouped query.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(TransactionSummaryService.summary(request.user), status=status.HTTP_200_OK)
+
+
 class TransactionRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     """
     API endpoint that allows retrieving, updating, or deleting a specific transaction.
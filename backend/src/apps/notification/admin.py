@@ -1,6 +1,7 @@
 from django.contrib import admin
 
 # Register your models here.
-from .models import Notification
+from .models import Notification, NotificationArchive
 
 admin.site.register(Notification)
+admin.site.register(NotificationArchive)
@@ -0,0 +1,41 @@
+from channels.db import database_sync_to_async
+from channels.generic.websocket import AsyncJsonWebsocketConsumer
+
+from .services import NotificationService, notification_group_name
+
+
+class NotificationConsumer(AsyncJsonWebsocketConsumer):
+    """
+    Per-user notification channel.
+
+    On connect the client receives its current unread count; afterwards the
+    server pushes every new notification together with the updated count, and
+    a bare count whenever notifications are marked as read.
+    """
+
+    async def connect(self):
+        user = self.scope.get("user")
+        if user is None or not user.is_authenticated:
+            await self.close(code=4401)
+            return
+
+        self.group_name = notification_group_name(user.pk)
+        await self.channel_layer.group_add(self.group_name, self.channel_name)
+        await self.accept()
+
+        unread_count = await database_sync_to_async(NotificationService.unread_count)(user.pk)
+        await self.send_json({"type": "unread_count", "unread_count": unread_count})
+
+    async def disconnect(self, code):
+        if hasattr(self, "group_name"):
+            await self.channel_layer.group_discard(self.group_name, self.channel_name)
+
+    async def notification_created(self, event):
+        await self.send_json({
+            "type": "notification",
+            "notification": event["notification"],
+            "unread_count": event["unread_count"],
+        })
+
+    async def notification_unread_count(self, event):
+        await self.send_json({"type": "unread_count", "unread_count": event["unread_count"]})
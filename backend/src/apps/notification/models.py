@@ -1,6 +1,8 @@
 from django.db import models
 from django.contrib.auth import get_user_model
 
+from src.apps.common.cache import CachedCounter
+
 User = get_user_model()
 
 class Notification(models.Model):
@@ -13,6 +15,50 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            # Only unread rows are indexed; keeps badge counts and reconciliation cheap
+            models.Index(
+                fields=["recipient"],
+                condition=models.Q(is_read=False),
+                name="notification_unread_idx",
+            ),
+            models.Index(fields=["recipient", "created_at"], name="notification_recipient_ts_idx"),
+            # Lets the retention job find archivable rows without scanning unread ones
+            models.Index(
+                fields=["created_at"],
+                condition=models.Q(is_read=True),
+                name="notification_read_ts_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"To {self.recipient.username}: {self.message[:30]}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Read notifications moved out of the hot table by the retention job.
+    Rows keep the id they had in Notification.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    recipient = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="archived_notifications"
+    )
+    message = models.TextField()
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(fields=["recipient", "created_at"], name="notif_archive_recipient_ts_idx"),
+        ]
 
     def __str__(self):
         return f"To {self.recipient.username}: {self.message[:30]}"
+
+
+unread_notification_counter = CachedCounter(
+    prefix="notification:unread_count",
+    loader=lambda user_id: Notification.objects.filter(recipient_id=user_id, is_read=False).count(),
+)
@@ -0,0 +1,193 @@
+from collections import Counter
+from datetime import timedelta
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive, unread_notification_counter
+
+
+def notification_group_name(user_id):
+    return f"notifications_{user_id}"
+
+
+class NotificationService:
+
+    @staticmethod
+    def notify_users(recipient_ids, message):
+        """
+        Create the same in-app notification for every recipient with a single INSERT.
+        """
+        return NotificationService.bulk_notify(
+            (recipient_id, message) for recipient_id in recipient_ids
+        )
+
+    @staticmethod
+    def bulk_notify(items):
+        """
+        Create one notification per (recipient_id, message) pair with a single INSERT.
+        Connected clients get them pushed once the transaction commits.
+        """
+        notifications = [
+            Notification(recipient_id=recipient_id, message=message)
+            for recipient_id, message in items
+        ]
+        if not notifications:
+            return []
+        notifications = Notification.objects.bulk_create(notifications)
+        transaction.on_commit(lambda: NotificationService._on_created(notifications))
+        return notifications
+
+    @staticmethod
+    def _on_created(notifications):
+        created = Counter(n.recipient_id for n in notifications)
+        for recipient_id, count in created.items():
+            unread_notification_counter.incr(recipient_id, count)
+        NotificationService.push_created(notifications)
+
+    @staticmethod
+    def mark_read(notification):
+        """
+        Mark one notification as read. The conditional UPDATE makes sure the
+        unread counter is only decremented once, even for concurrent requests.
+        """
+        updated = Notification.objects.filter(pk=notification.pk, is_read=False).update(is_read=True)
+        notification.is_read = True
+        if updated:
+            unread_notification_counter.decr(notification.recipient_id, updated)
+            NotificationService.push_unread_count(notification.recipient_id)
+        return notification
+
+    @staticmethod
+    def mark_all_read(user_id):
+        updated = Notification.objects.filter(recipient_id=user_id, is_read=False).update(is_read=True)
+        if updated:
+            unread_notification_counter.decr(user_id, updated)
+        NotificationService.push_unread_count(user_id)
+        return updated
+
+    @staticmethod
+    def unread_count(user_id):
+        """Served from the cached counter; falls back to COUNT(*) when the cache is cold or down."""
+        return max(unread_notification_counter.get(user_id), 0)
+
+    @staticmethod
+    def unread_counts(user_ids):
+        """Exact counts straight from the database, using the partial unread index."""
+        counts = dict(
+            Notification.objects.filter(recipient_id__in=user_ids, is_read=False)
+            .values_list('recipient')
+            .annotate(total=Count('id'))
+        )
+        return {user_id: counts.get(user_id, 0) for user_id in user_ids}
+
+    @staticmethod
+    def push_created(notifications):
+        """
+        Push new notifications and the recipients' unread counts over WebSockets.
+        Delivery is best effort: the rows are already stored either way.
+        """
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            counts = {
+                recipient_id: NotificationService.unread_count(recipient_id)
+                for recipient_id in {n.recipient_id for n in notifications}
+            }
+            for notification in notifications:
+                async_to_sync(channel_layer.group_send)(
+                    notification_group_name(notification.recipient_id),
+                    {
+                        "type": "notification.created",
+                        "notification": {
+                            "id": notification.pk,
+                            "message": notification.message,
+                            "is_read": notification.is_read,
+                            "created_at": notification.created_at.isoformat(),
+                        },
+                        "unread_count": counts[notification.recipient_id],
+                    },
+                )
+        except Exception as e:
+            print(f"Failed to push notifications. Error: {e}")
+
+    @staticmethod
+    def push_unread_count(user_id):
+        channel_layer = get_channel_layer()
+        if channel_layer is None:
+            return
+        try:
+            async_to_sync(channel_layer.group_send)(
+                notification_group_name(user_id),
+                {
+                    "type": "notification.unread_count",
+                    "unread_count": NotificationService.unread_count(user_id),
+                },
+            )
+        except Exception as e:
+            print(f"Failed to push unread count for user {user_id}. Error: {e}")
+
+    @staticmethod
+    def reconcile_unread_counts(batch_size=500):
+        """
+        Correct drift in the cached unread counters against the database.
+        Only counters that are currently cached are rewritten; cold ones are
+        loaded from the database on their next read anyway.
+        """
+        user_ids = get_user_model().objects.values_list("pk", flat=True).order_by("pk")
+        fixed = 0
+        batch = []
+        for user_id in user_ids.iterator(chunk_size=batch_size):
+            batch.append(user_id)
+            if len(batch) == batch_size:
+                fixed += NotificationService._reconcile_batch(batch)
+                batch = []
+        if batch:
+            fixed += NotificationService._reconcile_batch(batch)
+        return fixed
+
+    @staticmethod
+    def _reconcile_batch(user_ids):
+        cached = unread_notification_counter.get_many(user_ids)
+        if not cached:
+            return 0
+        actual = NotificationService.unread_counts(list(cached))
+        stale = {user_id: actual[user_id] for user_id, value in cached.items() if value != actual[user_id]}
+        unread_notification_counter.set_many(stale)
+        return len(stale)
+
+    @staticmethod
+    def archive_read_notifications(retention_days=None, batch_size=None):
+        """
+        Move read notifications older than the retention period into
+        NotificationArchive, one short transaction per batch. Returns the
+        number of rows moved.
+        """
+        retention_days = retention_days or settings.NOTIFICATION_RETENTION_DAYS
+        batch_size = batch_size or settings.NOTIFICATION_ARCHIVE_BATCH_SIZE
+        cutoff = timezone.now() - timedelta(days=retention_days)
+        archived = 0
+        while True:
+            with transaction.atomic():
+                rows = list(
+                    Notification.objects.select_for_update(skip_locked=True)
+                    .filter(is_read=True, created_at__lt=cutoff)
+                    .order_by("created_at")
+                    .values("id", "recipient_id", "message", "created_at")[:batch_size]
+                )
+                if not rows:
+                    return archived
+                # ignore_conflicts keeps a retried batch from failing on rows it already copied
+                NotificationArchive.objects.bulk_create(
+                    [NotificationArchive(**row) for row in rows], ignore_conflicts=True
+                )
+                Notification.objects.filter(id__in=[row["id"] for row in rows]).delete()
+            archived += len(rows)
+            if len(rows) < batch_size:
+                return archived
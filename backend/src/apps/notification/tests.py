@@ -1,3 +1,143 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from channels.db import database_sync_to_async
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import AccessToken
+
+from src.asgi import application
+from .models import Notification, NotificationArchive, unread_notification_counter
+from .services import NotificationService
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class NotificationPushTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("push-user", "push@example.com", "pw")
+
+    def setUp(self):
+        unread_notification_counter.reset(self.user.pk)
+
+    def communicator(self, token=None):
+        query = f"?token={token}" if token else ""
+        return WebsocketCommunicator(application, f"/ws/notifications/{query}")
+
+    def notify(self, message):
+        with self.captureOnCommitCallbacks(execute=True):
+            NotificationService.notify_users([self.user.pk], message)
+
+    async def test_anonymous_connection_is_refused(self):
+        connected, code = await self.communicator().connect()
+
+        self.assertFalse(connected)
+        self.assertEqual(code, 4401)
+
+    async def test_new_notification_is_pushed_with_the_unread_count(self):
+        communicator = self.communicator(str(AccessToken.for_user(self.user)))
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual(await communicator.receive_json_from(), {"type": "unread_count", "unread_count": 0})
+
+        await database_sync_to_async(self.notify)("Rent is due")
+
+        event = await communicator.receive_json_from()
+        self.assertEqual(event["type"], "notification")
+        self.assertEqual(event["notification"]["message"], "Rent is due")
+        self.assertEqual(event["unread_count"], 1)
+
+        notification = await Notification.objects.aget(recipient=self.user)
+        await database_sync_to_async(NotificationService.mark_read)(notification)
+        self.assertEqual(await communicator.receive_json_from(), {"type": "unread_count", "unread_count": 0})
+        await communicator.disconnect()
+
+
+class UnreadCounterTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("unread-user", "unread@example.com", "pw")
+
+    def setUp(self):
+        unread_notification_counter.reset(self.user.pk)
+        self.assertEqual(NotificationService.unread_count(self.user.pk), 0)
+
+    def notify(self, *messages):
+        with self.captureOnCommitCallbacks(execute=True):
+            return NotificationService.bulk_notify((self.user.pk, message) for message in messages)
+
+    def test_counter_follows_creation_and_reads(self):
+        first, second, third = self.notify("One", "Two", "Three")
+        self.assertEqual(NotificationService.unread_count(self.user.pk), 3)
+
+        NotificationService.mark_read(first)
+        # A second mark of the same row must not decrement again
+        NotificationService.mark_read(Notification.objects.get(pk=first.pk))
+        self.assertEqual(NotificationService.unread_count(self.user.pk), 2)
+
+        self.assertEqual(NotificationService.mark_all_read(self.user.pk), 2)
+        self.assertEqual(NotificationService.unread_count(self.user.pk), 0)
+
+    def test_badge_endpoint_is_served_from_the_counter(self):
+        self.notify("One")
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.assertNumQueries(0):
+            response = client.get(reverse('unread-notification-count'))
+
+        self.assertEqual(response.data, {"unread_count": 1})
+
+    def test_reconcile_corrects_drifted_counters(self):
+        self.notify("One", "Two")
+        unread_notification_counter.set(self.user.pk, 7)
+
+        self.assertEqual(NotificationService.reconcile_unread_counts(), 1)
+
+        self.assertEqual(NotificationService.unread_count(self.user.pk), 2)
+        self.assertEqual(NotificationService.reconcile_unread_counts(), 0)
+
+
+class NotificationRetentionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("archive-user", "archive@example.com", "pw")
+        cls.other = get_user_model().objects.create_user("archive-other", "archive-other@example.com", "pw")
+
+    def test_list_is_cursor_paginated_newest_first(self):
+        NotificationService.notify_users([self.user.pk] * 15 + [self.other.pk], "Hello")
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        first = client.get(reverse('notification-list')).data
+        second = client.get(first['next']).data
+
+        newest_first = Notification.objects.filter(recipient=self.user).order_by('-created_at', '-id')
+        self.assertEqual(len(first['results']), 10)
+        self.assertEqual(
+            [item['id'] for item in first['results'] + second['results']],
+            list(newest_first.values_list('id', flat=True)),
+        )
+        self.assertIsNone(second['next'])
+
+    def test_old_read_notifications_move_to_the_archive(self):
+        notifications = NotificationService.notify_users([self.user.pk] * 6, "Old")
+        old = timezone.now() - timedelta(days=200)
+        Notification.objects.filter(pk__in=[n.pk for n in notifications[:5]]).update(created_at=old, is_read=True)
+        # Old but unread stays in the hot table
+        Notification.objects.filter(pk=notifications[0].pk).update(is_read=False)
+
+        self.assertEqual(NotificationService.archive_read_notifications(retention_days=90, batch_size=3), 4)
+
+        self.assertCountEqual(
+            Notification.objects.values_list('pk', flat=True), [notifications[0].pk, notifications[5].pk]
+        )
+        archived = NotificationArchive.objects.order_by('pk')
+        self.assertEqual([row.pk for row in archived], [n.pk for n in notifications[1:5]])
+        self.assertEqual({(row.recipient_id, row.message) for row in archived}, {(self.user.pk, "Old")})
@@ -2,18 +2,21 @@ from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from .models import Notification
+from .pagination import NotificationCursorPagination
 from .serializers import NotificationSerializer
+from .services import NotificationService
 
 # List all notifications for the logged-in user
 class NotificationListView(generics.ListAPIView):
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = NotificationCursorPagination
 
     def get_queryset(self):
         """
         Filters notifications to only show the authenticated user's notifications.
         """
-        return Notification.objects.filter(recipient=self.request.user).order_by('-created_at')
+        return Notification.objects.filter(recipient=self.request.user).select_related('recipient')
 
 # Update a single notification to mark it as read
 class NotificationMarkAsReadView(generics.UpdateAPIView):
@@ -28,9 +31,9 @@ class NotificationMarkAsReadView(generics.UpdateAPIView):
 
     def perform_update(self, serializer):
         """
-        Saves the notification and explicitly sets is_read to True.
+        Marks the notification as read and keeps the unread counter in step.
         """
-        serializer.save(is_read=True)
+        NotificationService.mark_read(serializer.instance)
 
 # Mark all notifications for the user as read
 class NotificationMarkAllAsReadView(APIView):
@@ -40,7 +43,7 @@ class NotificationMarkAllAsReadView(APIView):
         """
         Marks all unread notifications for the authenticated user as read.
         """
-        Notification.objects.filter(recipient=request.user, is_read=False).update(is_read=True)
+        NotificationService.mark_all_read(request.user.pk)
         return Response(
             {"detail": "All notifications marked as read."},
             status=status.HTTP_200_OK
@@ -53,9 +56,7 @@ class UnreadNotificationCountView(APIView):
     def get(self, request, *args, **kwargs):
         """
         Returns the count of unread notifications for the authenticated user.
+        Served from the cached counter, so a warm read is a single key lookup.
         """
-        unread_count = Notification.objects.filter(
-            recipient=request.user,
-            is_read=False
-        ).count()
+        unread_count = NotificationService.unread_count(request.user.pk)
         return Response({"unread_count": unread_count}, status=status.HTTP_200_OK)
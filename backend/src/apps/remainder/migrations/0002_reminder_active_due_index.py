@@ -0,0 +1,19 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:33
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remainder', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='reminder',
+            index=models.Index(fields=['is_active', 'due_date'], name='reminder_active_due_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.5 on 2026-10-19 19:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remainder', '0002_reminder_active_due_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reminder',
+            name='recurrence_rule',
+            field=models.CharField(blank=True, default='', help_text='Optional RRULE (e.g. FREQ=MONTHLY;BYMONTHDAY=1). Recurring reminders move to their next occurrence instead of being deactivated.', max_length=255),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.5 on 2026-10-19 20:08
+
+from django.db import migrations, models
+from django.db.models import F
+
+
+def anchor_recurring_reminders(apps, schema_editor):
+    """Existing series start from their current due date."""
+    Reminder = apps.get_model('remainder', 'Reminder')
+    Reminder.objects.exclude(recurrence_rule='').update(recurrence_start=F('due_date'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('remainder', '0003_reminder_recurrence_rule'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='reminder',
+            name='recurrence_start',
+            field=models.DateTimeField(blank=True, help_text='Fixed start of the recurrence series, so occurrences stay on the rule even as due_date moves.', null=True),
+        ),
+        migrations.RunPython(anchor_recurring_reminders, migrations.RunPython.noop),
+    ]
@@ -30,6 +30,17 @@ class Reminder(models.Model):
         default=True,
         help_text='Whether the reminder is still active.'
     )
+    recurrence_rule = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        help_text='Optional RRULE (e.g. FREQ=MONTHLY;BYMONTHDAY=1). Recurring reminders move to their next occurrence instead of being deactivated.'
+    )
+    recurrence_start = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='Fixed start of the recurrence series, so occurrences stay on the rule even as due_date moves.'
+    )
     category = models.CharField(
         max_length=50,
         choices=CategoryChoices.choices,
@@ -41,6 +52,9 @@ class Reminder(models.Model):
         verbose_name = "Reminder"
         verbose_name_plural = "Reminders"
         ordering = ['due_date']
+        indexes = [
+            models.Index(fields=['is_active', 'due_date'], name='reminder_active_due_idx'),
+        ]
 
     def __str__(self):
         return f"[{self.category}] Reminder for {self.recipient.username} on {self.due_date.strftime('%Y-%m-%d %H:%M')}"
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+
+from src.apps.common.recurrence import RecurrenceError, validate_rule
 from .models import Reminder
 
 class ReminderSerializer(serializers.ModelSerializer):
@@ -7,5 +9,18 @@ class ReminderSerializer(serializers.ModelSerializer):
     """
     class Meta:
         model = Reminder
-        fields = ['id', 'message', 'due_date', 'recipient', 'is_active', 'category']
+        fields = ['id', 'message', 'due_date', 'recurrence_rule', 'recipient', 'is_active', 'category']
         read_only_fields = ['recipient', 'is_active']
+
+    def validate(self, attrs):
+        rule = attrs.get('recurrence_rule', getattr(self.instance, 'recurrence_rule', ''))
+        due_date = attrs.get('due_date', getattr(self.instance, 'due_date', None))
+        if rule and due_date:
+            try:
+                attrs['recurrence_rule'] = validate_rule(rule, due_date)
+            except RecurrenceError as e:
+                raise serializers.ValidationError({'recurrence_rule': str(e)})
+            if 'recurrence_rule' in self.initial_data or 'due_date' in self.initial_data:
+                # A new or rescheduled series starts from the due date the user picked
+                attrs['recurrence_start'] = due_date
+        return attrs
@@ -0,0 +1,70 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from src.apps.common.recurrence import RecurrenceError, next_occurrence
+from src.apps.notification.services import NotificationService
+from .models import Reminder
+
+
+class ReminderService:
+
+    @staticmethod
+    def sweep_due_reminders(batch_size=None):
+        """
+        Deliver every active reminder whose due date has passed. One-shot
+        reminders are deactivated; recurring ones move to their next occurrence.
+
+        Each batch is claimed with SELECT ... FOR UPDATE SKIP LOCKED, so several
+        workers can sweep at the same time without picking the same rows. The
+        notifications are bulk-created and the reminders bulk-deactivated in
+        the same transaction. Returns the number of reminders delivered.
+        """
+        batch_size = batch_size or settings.REMINDER_SWEEP_BATCH_SIZE
+        now = timezone.now()
+        delivered = 0
+        while True:
+            with transaction.atomic():
+                due = list(
+                    Reminder.objects.select_for_update(skip_locked=True)
+                    .filter(is_active=True, due_date__lte=now)
+                    .order_by('due_date')
+                    .only('id', 'recipient_id', 'message', 'due_date', 'recurrence_rule', 'recurrence_start')[:batch_size]
+                )
+                if not due:
+                    return delivered
+                NotificationService.bulk_notify(
+                    (reminder.recipient_id, f"Reminder: {reminder.message}") for reminder in due
+                )
+
+                one_shot = [reminder.id for reminder in due if not reminder.recurrence_rule]
+                Reminder.objects.filter(id__in=one_shot).update(is_active=False)
+
+                recurring = [reminder for reminder in due if reminder.recurrence_rule]
+                for reminder in recurring:
+                    ReminderService.advance(reminder, now)
+                Reminder.objects.bulk_update(recurring, ['due_date', 'is_active'])
+            delivered += len(due)
+            if len(due) < batch_size:
+                return delivered
+
+    @staticmethod
+    def advance(reminder, now):
+        """
+        Move a recurring reminder to its next occurrence after ``now``.
+        Occurrences missed while the sweeper was down are skipped rather than
+        delivered in a burst; a finished series is deactivated.
+
+        The rule is expanded from the fixed recurrence_start, not the moving
+        due_date, so rules like BYMONTHDAY=31 or BYSETPOS=-1 do not drift.
+        """
+        try:
+            dtstart = reminder.recurrence_start or reminder.due_date
+            next_due = next_occurrence(reminder.recurrence_rule, dtstart, now)
+        except RecurrenceError:
+            next_due = None
+        if next_due is None:
+            reminder.is_active = False
+        else:
+            reminder.due_date = next_due
+        return reminder
@@ -1,3 +1,104 @@
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.contrib.auth import get_user_model
 from django.test import TestCase
+from django.utils import timezone
+
+from src.apps.notification.models import Notification
+
+from .models import Reminder
+from .serializers import ReminderSerializer
+from .services import ReminderService
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=dt_timezone.utc)
+
+
+class ReminderAdvanceTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("reminder-user", "reminder@example.com", "pw")
+
+    def reminder(self, rule, due_date, recurrence_start=None):
+        return Reminder.objects.create(
+            recipient=self.user, message="Pay rent", due_date=due_date,
+            recurrence_rule=rule, recurrence_start=recurrence_start or due_date,
+        )
+
+    def test_advances_from_the_fixed_anchor(self):
+        # Expanding from due_date would give May 30; the series is anchored on the 31st
+        reminder = self.reminder("FREQ=MONTHLY", utc(2025, 4, 30, 9), recurrence_start=utc(2025, 1, 31, 9))
+
+        ReminderService.advance(reminder, utc(2025, 4, 30, 10))
+
+        self.assertEqual(reminder.due_date, utc(2025, 5, 31, 9))
+        self.assertTrue(reminder.is_active)
+
+    def test_skips_missed_occurrences(self):
+        reminder = self.reminder("FREQ=WEEKLY;BYDAY=MO", utc(2025, 1, 6, 9))
+
+        ReminderService.advance(reminder, utc(2025, 2, 5, 12))
+
+        self.assertEqual(reminder.due_date, utc(2025, 2, 10, 9))
+
+    def test_finished_series_is_deactivated(self):
+        reminder = self.reminder("FREQ=DAILY;UNTIL=20250103T090000Z", utc(2025, 1, 1, 9))
+
+        ReminderService.advance(reminder, utc(2025, 1, 3, 10))
+
+        self.assertFalse(reminder.is_active)
+
+    def test_sweep_keeps_the_anchor(self):
+        reminder = self.reminder("FREQ=MONTHLY;INTERVAL=2", utc(2020, 1, 31, 9))
+
+        self.assertEqual(ReminderService.sweep_due_reminders(), 1)
+
+        reminder.refresh_from_db()
+        self.assertEqual(reminder.recurrence_start, utc(2020, 1, 31, 9))
+        self.assertGreater(reminder.due_date, utc(2020, 1, 31, 9))
+        self.assertEqual(reminder.due_date.day, 31)
+        self.assertEqual(reminder.due_date.month % 2, 1)
+
+    def test_rescheduling_resets_the_anchor(self):
+        reminder = self.reminder("FREQ=MONTHLY", utc(2025, 1, 31, 9))
+
+        serializer = ReminderSerializer(reminder, data={'due_date': '2025-03-15T09:00:00Z'}, partial=True)
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+
+        self.assertEqual(reminder.recurrence_start, utc(2025, 3, 15, 9))
+
+
+class ReminderSweepTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create_user("sweep-user", "sweep@example.com", "pw")
+
+    def reminder(self, message, due_in, **fields):
+        return Reminder.objects.create(
+            recipient=self.user, message=message, due_date=timezone.now() + due_in, **fields
+        )
+
+    def test_delivers_every_due_reminder_across_batches(self):
+        due = [self.reminder(f"Due {i}", timedelta(hours=-i - 1)) for i in range(5)]
+        later = self.reminder("Later", timedelta(hours=1))
+        self.reminder("Done", timedelta(hours=-1), is_active=False)
+
+        self.assertEqual(ReminderService.sweep_due_reminders(batch_size=2), 5)
+
+        self.assertCountEqual(
+            Notification.objects.values_list('message', flat=True), [f"Reminder: Due {i}" for i in range(5)]
+        )
+        self.assertFalse(Reminder.objects.filter(pk__in=[r.pk for r in due], is_active=True).exists())
+        later.refresh_from_db()
+        self.assertTrue(later.is_active)
+
+    def test_second_sweep_finds_nothing(self):
+        self.reminder("Due", timedelta(minutes=-5))
 
-# Create your tests here.
+        self.assertEqual(ReminderService.sweep_due_reminders(), 1)
+        self.assertEqual(ReminderService.sweep_due_reminders(), 0)
+        self.assertEqual(Notification.objects.count(), 1)
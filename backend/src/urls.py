@@ -28,6 +28,7 @@ urlpatterns = [
                         path("notification/", include("src.apps.notification.urls")),
                         path("chatbot/", include("src.apps.chatbot.urls")),
                         path("event/", include("src.apps.event.urls")),
+                        path("reminder/", include("src.apps.remainder.urls")),
                         path("api/", include("src.api_urls")),
 ]
 
@@ -1,8 +1,23 @@
 import json
 import os
 
+from decouple import config
+
 
 class DBConfigHandler:
+    """
+    Builds ``settings.DATABASES`` from the environment, with optional
+    per-alias overrides from ``local.json``.
+
+    Connections are persistent (CONN_MAX_AGE) and health-checked before reuse.
+    Setting DATABASE_POOL=True switches to Django's psycopg 3 connection pool
+    instead, which requires the ``psycopg[pool]`` package. When
+    DATABASE_REPLICA_HOST is set a ``replica`` alias is added for
+    ReplicaRouter to send report reads to.
+    """
+
+    REPLICA_ALIAS = "replica"
+
     def __init__(self):
         pass
 
@@ -12,4 +27,55 @@ class DBConfigHandler:
         if not os.path.isfile(file_name):
             return {}
         with open(file_name, "r") as fp:
-            return json.load(fp)
\ No newline at end of file
+            return json.load(fp)
+
+    @staticmethod
+    def primary_config():
+        db = {
+            "ENGINE": "django.db.backends.postgresql",
+            "NAME": os.getenv("DATABASE_NAME", "mydb"),
+            "USER": os.getenv("DATABASE_USER", "myuser"),
+            "PASSWORD": os.getenv("DATABASE_PASSWORD", "mypassword"),
+            "HOST": os.getenv("DATABASE_HOST", "db"),  # must match docker-compose service name
+            "PORT": config("DATABASE_PORT", default=5432, cast=int),
+            "CONN_MAX_AGE": config("DATABASE_CONN_MAX_AGE", default=60, cast=int),
+            "CONN_HEALTH_CHECKS": True,
+        }
+        if config("DATABASE_POOL", default=False, cast=bool):
+            # The pool owns connection reuse; Django refuses persistent connections on top of it
+            db["CONN_MAX_AGE"] = 0
+            db["OPTIONS"] = {
+                "pool": {
+                    "min_size": config("DATABASE_POOL_MIN_SIZE", default=2, cast=int),
+                    "max_size": config("DATABASE_POOL_MAX_SIZE", default=10, cast=int),
+                    "timeout": config("DATABASE_POOL_TIMEOUT", default=10, cast=int),
+                },
+            }
+        return db
+
+    @staticmethod
+    def replica_config(primary):
+        host = os.getenv("DATABASE_REPLICA_HOST")
+        if not host:
+            return None
+        return {
+            **primary,
+            "HOST": host,
+            "PORT": config("DATABASE_REPLICA_PORT", default=primary["PORT"], cast=int),
+            "USER": os.getenv("DATABASE_REPLICA_USER", primary["USER"]),
+            "PASSWORD": os.getenv("DATABASE_REPLICA_PASSWORD", primary["PASSWORD"]),
+            # Tests run against the primary; the replica is just another view of it
+            "TEST": {"MIRROR": "default"},
+        }
+
+    @classmethod
+    def get_databases(cls):
+        primary = cls.primary_config()
+        databases = {"default": primary}
+        replica = cls.replica_config(primary)
+        if replica:
+            databases[cls.REPLICA_ALIAS] = replica
+
+        for alias, overrides in cls.get_db_config_for_current_env().items():
+            databases[alias] = {**databases.get(alias, primary), **overrides}
+        return databases
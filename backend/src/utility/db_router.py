@@ -0,0 +1,79 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+
+from src.utility.db_config import DBConfigHandler
+
+
+_replica_reads = ContextVar("replica_reads", default=False)
+
+
+def replica_available():
+    return DBConfigHandler.REPLICA_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route ORM reads in this block (and this task/thread only) to the replica."""
+    token = _replica_reads.set(enabled)
+    try:
+        yield
+    finally:
+        restore_replica_reads(token)
+
+
+def use_replica_reads():
+    """Start routing reads to the replica; pass the token to restore_replica_reads()."""
+    return _replica_reads.set(True)
+
+
+def restore_replica_reads(token):
+    _replica_reads.reset(token)
+
+
+def sticky_key(user_id):
+    return f"db:sticky:{user_id}"
+
+
+def mark_recent_write(user_id):
+    """Pin the user's reads to the primary until the replica has caught up."""
+    try:
+        cache.set(sticky_key(user_id), 1, settings.DATABASE_REPLICA_STICKY_SECONDS)
+    except Exception:
+        pass
+
+
+def has_recent_write(user_id):
+    try:
+        return cache.get(sticky_key(user_id)) is not None
+    except Exception:
+        # Without the marker we cannot promise read-your-writes, so stay on the primary
+        return True
+
+
+class ReplicaRouter:
+    """
+    Writes, migrations and ordinary reads use ``default``. Reads made inside
+    replica_reads() go to the ``replica`` alias when one is configured and
+    no transaction is open on the primary.
+    """
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or not replica_available():
+            return None
+        if connections["default"].in_atomic_block:
+            return None
+        return DBConfigHandler.REPLICA_ALIAS
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == "default"
@@ -0,0 +1,18 @@
+import redis
+from django.conf import settings
+
+from src.utility.singletone import SingletonMeta
+
+
+class RedisClient(metaclass=SingletonMeta):
+    """
+    Process-wide redis-py client for the data structures the Django cache API
+    cannot express (lists, sets, Lua scripts). Connections are pooled.
+    """
+
+    def __init__(self):
+        self.connection = redis.Redis.from_url(settings.REDIS_DATA_URL)
+
+
+def get_redis_connection() -> redis.Redis:
+    return RedisClient().connection
@@ -129,9 +129,15 @@ export const updateBudget = async (id, budgetData) => {
 
 // --- LEND / BORROW API ---
 
-// GET /lend/
-export const getTransactions = async () => {
-    return authenticatedFetch('/lend/', { method: 'GET' });
+// GET /lend/ (cursor paginated; pass the previous page's `next` to continue)
+export const getTransactions = async (nextUrl = null) => {
+    const query = nextUrl ? nextUrl.slice(nextUrl.indexOf('?')) : '';
+    return authenticatedFetch(`/lend/${query}`, { method: 'GET' });
+};
+
+// GET /lend/summary/
+export const getTransactionSummary = async () => {
+    return authenticatedFetch('/lend/summary/', { method: 'GET' });
 };
 
 // POST /lend/
@@ -52,3 +52,47 @@ export const fetchNotifications = async () => {
   if (!response.ok) throw new Error('Failed to fetch notifications');
   return response.json();
 };
+
+// Opens the per-user notification WebSocket and calls onMessage with each
+// server push ({ type: 'unread_count' | 'notification', unread_count, ... }).
+// onConnectionChange(true | false) reports when the socket opens or drops, so
+// callers can fall back to polling while it is down. Reconnects with backoff
+// until the returned unsubscribe function is called.
+export const subscribeToNotifications = (onMessage, onConnectionChange = () => {}) => {
+  let socket = null;
+  let closed = false;
+  let retryDelay = 1000;
+  let retryTimer = null;
+
+  const connect = async () => {
+    const accessToken = await AsyncStorage.getItem('access_token');
+    if (closed || !accessToken) return;
+    const wsUrl = `${API_BASE_URL.replace(/^http/, 'ws')}/ws/notifications/?token=${encodeURIComponent(accessToken)}`;
+    socket = new WebSocket(wsUrl);
+    socket.onopen = () => {
+      retryDelay = 1000;
+      onConnectionChange(true);
+    };
+    socket.onmessage = (event) => {
+      try {
+        onMessage(JSON.parse(event.data));
+      } catch (err) {
+        console.log('Invalid notification payload:', err);
+      }
+    };
+    socket.onclose = () => {
+      if (closed) return;
+      onConnectionChange(false);
+      retryTimer = setTimeout(connect, retryDelay);
+      retryDelay = Math.min(retryDelay * 2, 30000);
+    };
+  };
+
+  connect();
+
+  return () => {
+    closed = true;
+    if (retryTimer) clearTimeout(retryTimer);
+    if (socket) socket.close();
+  };
+};
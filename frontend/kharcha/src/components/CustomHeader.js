@@ -3,7 +3,7 @@ import { useFocusEffect, useNavigation } from '@react-navigation/native';
 import { LinearGradient } from 'expo-linear-gradient';
 import React, { useContext, useEffect, useState } from 'react';
 import { Image, Platform, SafeAreaView, Text, TouchableOpacity, View } from 'react-native';
-import { fetchUnreadCount } from '../api/notificationApi';
+import { fetchUnreadCount, subscribeToNotifications } from '../api/notificationApi';
 import { AuthContext } from '../context/AuthContext';
 import { ThemeContext } from '../context/ThemeContext';
 
@@ -29,7 +29,6 @@ const CustomHeader = ({
 
     useEffect(() => {
         let mounted = true;
-        let intervalId;
         const loadUnreadCount = async () => {
             setNotifLoading(true);
             try {
@@ -42,8 +41,32 @@ const CustomHeader = ({
             }
         };
         loadUnreadCount();
-        // Poll every 10 seconds
-        intervalId = setInterval(loadUnreadCount, 10000);
+        // Poll every 10 seconds until the notification socket is connected,
+        // and again whenever it drops (e.g. a server without WebSocket support)
+        let intervalId = null;
+        const startPolling = () => {
+            if (!intervalId) intervalId = setInterval(loadUnreadCount, 10000);
+        };
+        const stopPolling = () => {
+            if (intervalId) clearInterval(intervalId);
+            intervalId = null;
+        };
+        startPolling();
+        const unsubscribe = subscribeToNotifications(
+            (data) => {
+                if (mounted && typeof data.unread_count === 'number') setUnreadCount(data.unread_count);
+            },
+            (connected) => {
+                if (!mounted) return;
+                if (connected) {
+                    stopPolling();
+                    // Catch up on anything that arrived while disconnected
+                    loadUnreadCount();
+                } else {
+                    startPolling();
+                }
+            }
+        );
         // Listen for notificationRead event to update unread count
         const handleNotificationRead = async (e) => {
             await loadUnreadCount();
@@ -53,7 +76,8 @@ const CustomHeader = ({
         }
         return () => {
             mounted = false;
-            if (intervalId) clearInterval(intervalId);
+            stopPolling();
+            unsubscribe();
             if (typeof window !== 'undefined' && window.removeEventListener) {
                 window.removeEventListener('notificationRead', handleNotificationRead);
             }
@@ -27,7 +27,7 @@ const GroupList = ({
             </View>
             <View className="ml-4 flex-1">
               <Text className="text-lg font-bold text-white font-display mb-1">{item.name}</Text>
-              <Text className="text-sm text-text-muted font-body">{item.members ? item.members.length : 0} members</Text>
+              <Text className="text-sm text-text-muted font-body">{item.member_count ?? (item.members ? item.members.length : 0)} members</Text>
             </View>
             <MaterialCommunityIcons name="chevron-right" size={20} color="#52525B" />
           </TouchableOpacity>
@@ -1,4 +1,3 @@
-import AsyncStorage from '@react-native-async-storage/async-storage';
 import { useNavigation } from '@react-navigation/native';
 import { useEffect, useState } from 'react';
 import { ActivityIndicator, Alert, ScrollView, StyleSheet, Text, TextInput, TouchableOpacity, View } from 'react-native';
@@ -13,36 +12,14 @@ const EventScreen = () => {
   const [loading, setLoading] = useState(false);
   const [events, setEvents] = useState([]);
   const [fetching, setFetching] = useState(true);
-  const [eventExpenses, setEventExpenses] = useState({}); // { [eventId]: totalExpense }
 
   const loadEvents = async () => {
     setFetching(true);
     try {
       const data = await fetchEvents();
       const eventList = data.results || data;
+      // Totals come annotated on each event, no per-event summary request needed
       setEvents(eventList);
-      // Fetch total expense for each event
-      const accessToken = await AsyncStorage.getItem('access_token');
-      const summaryResults = {};
-      await Promise.all(
-        (eventList || []).map(async (ev) => {
-          try {
-            const res = await fetch(`${process.env.API_BASE_URL || 'http://127.0.0.1:8000'}/event/expenses/summary/?event_id=${ev.id}`, {
-              headers: { 'Authorization': `Bearer ${accessToken}` }
-            });
-            if (res.ok) {
-              const data = await res.json();
-              // Only total_expense is sent
-              summaryResults[ev.id] = typeof data.total_expenses === 'number' ? data.total_expenses : 0;
-            } else {
-              summaryResults[ev.id] = 0;
-            }
-          } catch {
-            summaryResults[ev.id] = 0;
-          }
-        })
-      );
-      setEventExpenses(summaryResults);
     } catch (e) {
       setEvents([]);
     } finally {
@@ -101,7 +78,7 @@ const EventScreen = () => {
                 <Text style={styles.eventDesc}>{ev.description}</Text>
                 <Text style={styles.eventMeta}>Date: {ev.date}</Text>
                 <Text style={styles.eventMeta}>Location: {ev.location}</Text>
-                <Text style={styles.eventMeta}>Total Expense: रू{eventExpenses[ev.id] ?? '...'}</Text>
+                <Text style={styles.eventMeta}>Total Expense: रू{Number(ev.total_expenses ?? 0)}</Text>
               </TouchableOpacity>
             ))}
         </ScrollView>
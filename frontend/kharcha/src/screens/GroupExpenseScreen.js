@@ -29,6 +29,7 @@ const GroupExpenseScreen = () => {
   // State for group expense log
   const [groupExpenses, setGroupExpenses] = useState([]);
   const [groupExpensesLoading, setGroupExpensesLoading] = useState(false);
+  const [groupExpensesNext, setGroupExpensesNext] = useState(null);
   const [groupMembers, setGroupMembers] = useState([]);
 
   // State for add expense form
@@ -63,44 +64,36 @@ const GroupExpenseScreen = () => {
     return await AsyncStorage.getItem('access_token');
   };
 
-  const fetchGroupExpenses = async () => {
+  const fetchGroupExpenses = async (nextUrl = null) => {
     setGroupExpensesLoading(true);
     try {
       const accessToken = await getAccessToken();
       if (!accessToken) throw new Error('No access token');
-      const res = await fetch(`${API_BASE_URL}/expense/groups/?group_id=${group.id}`, {
-        headers: { 'Authorization': `Bearer ${accessToken}` }
-      });
-      
-      if (!res.ok) {
-        throw new Error(`HTTP error! status: ${res.status}`);
-      }
-      
-      const data = await res.json();
-      console.log('Group expenses response status:', res.status);
-      console.log('Group expenses data:', data);
-      // Support data.expenses/members, data.results.expenses/members, and data.results[0].expenses/members
-      let expensesArr = [];
-      let membersArr = [];
-      if (Array.isArray(data.expenses)) {
-        expensesArr = data.expenses;
-      } else if (data.results && Array.isArray(data.results.expenses)) {
-        expensesArr = data.results.expenses;
-      } else if (Array.isArray(data.results) && data.results[0] && Array.isArray(data.results[0].expenses)) {
-        expensesArr = data.results[0].expenses;
+      const headers = { 'Authorization': `Bearer ${accessToken}` };
+
+      // Expenses are a paginated sub-resource; members come from the group detail
+      const expensesUrl = nextUrl || `${API_BASE_URL}/expense/groups/${group.id}/expenses/`;
+      const [expensesRes, groupRes] = await Promise.all([
+        fetch(expensesUrl, { headers }),
+        nextUrl ? null : fetch(`${API_BASE_URL}/expense/groups/${group.id}/`, { headers }),
+      ]);
+
+      if (!expensesRes.ok) {
+        throw new Error(`HTTP error! status: ${expensesRes.status}`);
       }
-      if (Array.isArray(data.members)) {
-        membersArr = data.members;
-      } else if (data.results && Array.isArray(data.results.members)) {
-        membersArr = data.results.members;
-      } else if (Array.isArray(data.results) && data.results[0] && Array.isArray(data.results[0].members)) {
-        membersArr = data.results[0].members;
+
+      const data = await expensesRes.json();
+      const expensesArr = data.results || data || [];
+      setGroupExpenses(prev => (nextUrl ? [...prev, ...expensesArr] : expensesArr));
+      setGroupExpensesNext(data.next || null);
+
+      if (groupRes && groupRes.ok) {
+        const groupData = await groupRes.json();
+        setGroupMembers(groupData.members || []);
       }
-      setGroupExpenses(expensesArr);
-      setGroupMembers(membersArr);
     } catch (err) {
       console.error('Error fetching group expenses:', err);
-      setGroupExpenses([]);
+      if (!nextUrl) setGroupExpenses([]);
     } finally {
       setGroupExpensesLoading(false);
     }
@@ -381,7 +374,7 @@ const GroupExpenseScreen = () => {
           <Text style={[styles.sectionTitle, { color: isDarkMode ? '#FFFFFF' : '#111827' }]}>
             Expense Log
           </Text>
-          {groupExpensesLoading ? (
+          {groupExpensesLoading && groupExpenses.length === 0 ? (
             <ActivityIndicator size="large" color={colors.primary} style={styles.loader} />
           ) : !groupExpenses || groupExpenses.length === 0 ? (
             <View style={[styles.emptyState, { backgroundColor: isDarkMode ? '#374151' : '#F9FAFB' }]}>
@@ -397,6 +390,19 @@ const GroupExpenseScreen = () => {
           ) : (
             <View style={styles.expensesList}>
               {groupExpenses.map(renderExpenseItem)}
+              {groupExpensesNext && (
+                <TouchableOpacity
+                  style={styles.loadMoreButton}
+                  disabled={groupExpensesLoading}
+                  onPress={() => fetchGroupExpenses(groupExpensesNext)}
+                >
+                  {groupExpensesLoading ? (
+                    <ActivityIndicator size="small" color={colors.primary} />
+                  ) : (
+                    <Text style={[styles.loadMoreText, { color: colors.primary }]}>Load more</Text>
+                  )}
+                </TouchableOpacity>
+              )}
             </View>
           )}
         </View>
@@ -960,6 +966,14 @@ const styles = StyleSheet.create({
     fontSize: 16,
     textAlign: 'center',
   },
+  loadMoreButton: {
+    paddingVertical: 12,
+    alignItems: 'center',
+  },
+  loadMoreText: {
+    fontSize: 14,
+    fontWeight: '600',
+  },
   expensesList: {
     gap: 12,
   },
@@ -149,7 +149,7 @@ const GroupsScreen = () => {
     }
 
     const url = query
-      ? `${API_BASE_URL}/auth/list/?username=${encodeURIComponent(query)}`
+      ? `${API_BASE_URL}/auth/search/?q=${encodeURIComponent(query)}`
       : `${API_BASE_URL}/auth/list/`;
 
     try {
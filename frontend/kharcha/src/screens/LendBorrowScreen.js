@@ -3,7 +3,7 @@ import { View, Text, TouchableOpacity, ScrollView, ActivityIndicator, FlatList,
 import { MaterialCommunityIcons } from '@expo/vector-icons';
 import { useNavigation } from '@react-navigation/native';
 import { AuthContext } from '../context/AuthContext';
-import { getTransactions, createTransaction, markTransactionPaid, verifyTransaction } from '../api/apiService';
+import { getTransactions, getTransactionSummary, createTransaction, markTransactionPaid, verifyTransaction } from '../api/apiService';
 
 const LendBorrowScreen = () => {
     const navigation = useNavigation();
@@ -12,6 +12,8 @@ const LendBorrowScreen = () => {
     const [transactions, setTransactions] = useState([]);
     const [loading, setLoading] = useState(true);
     const [refreshing, setRefreshing] = useState(false);
+    const [nextPage, setNextPage] = useState(null);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [activeTab, setActiveTab] = useState('lend'); // 'lend' or 'borrow'
 
     // Summary States
@@ -32,9 +34,12 @@ const LendBorrowScreen = () => {
 
     const fetchData = async () => {
         try {
-            const data = await getTransactions();
-            setTransactions(data);
-            calculateTotals(data);
+            // Totals come from the server-side per-counterparty summary
+            const [data, summary] = await Promise.all([getTransactions(), getTransactionSummary()]);
+            setTransactions(data.results || data);
+            setNextPage(data.next || null);
+            setTotalLent(parseFloat(summary.totals.net_lent) || 0);
+            setTotalBorrowed(parseFloat(summary.totals.net_borrowed) || 0);
         } catch (error) {
             console.error("Failed to fetch transactions", error);
         } finally {
@@ -43,35 +48,18 @@ const LendBorrowScreen = () => {
         }
     };
 
-    const calculateTotals = (data) => {
-        let lent = 0;
-        let borrowed = 0;
-        const currentUserId = userDetails?.id;
-
-        data.forEach(t => {
-            const isCompleted = t.status === 'D'; // Paid
-            if (isCompleted) return; // Don't count paid transactions in outstanding balance
-
-            const isInitiator = t.initiator === currentUserId;
-            // Logic:
-            // Type 'L' (Lend): Initiator GIVES to Participant.
-            //    - If I am Initiator: I lent money. (Positive for me)
-            //    - If I am Participant: I received money. (Negative/Debt for me)
-            // Type 'B' (Borrow): Initiator TAKES from Participant.
-            //    - If I am Initiator: I borrowed money. (Negative/Debt for me)
-            //    - If I am Participant: I gave money. (Positive for me)
-
-            if (t.transaction_type === 'L') {
-                if (isInitiator) lent += parseFloat(t.amount);
-                else borrowed += parseFloat(t.amount);
-            } else if (t.transaction_type === 'B') {
-                if (isInitiator) borrowed += parseFloat(t.amount);
-                else lent += parseFloat(t.amount);
-            }
-        });
-
-        setTotalLent(lent);
-        setTotalBorrowed(borrowed);
+    const loadMore = async () => {
+        if (!nextPage || loadingMore) return;
+        setLoadingMore(true);
+        try {
+            const data = await getTransactions(nextPage);
+            setTransactions(prev => [...prev, ...(data.results || [])]);
+            setNextPage(data.next || null);
+        } catch (error) {
+            console.error("Failed to load more transactions", error);
+        } finally {
+            setLoadingMore(false);
+        }
     };
 
     const handleRefresh = () => {
@@ -215,6 +203,21 @@ const LendBorrowScreen = () => {
                         renderItem={renderItem}
                         keyExtractor={item => item.id.toString()}
                         scrollEnabled={false} // Since wrapped in ScrollView
+                        ListFooterComponent={
+                            nextPage ? (
+                                <TouchableOpacity
+                                    onPress={loadMore}
+                                    disabled={loadingMore}
+                                    className="py-3 items-center justify-center"
+                                >
+                                    {loadingMore ? (
+                                        <ActivityIndicator color="#2DD4BF" />
+                                    ) : (
+                                        <Text className="text-sm font-bold text-[#2DD4BF]">Load more</Text>
+                                    )}
+                                </TouchableOpacity>
+                            ) : null
+                        }
                         ListEmptyComponent={
                             <View className="items-center justify-center py-10">
                                 <MaterialCommunityIcons name="currency-usd-off" size={40} color="#52525B" />
@@ -27,7 +27,7 @@ start_backend() {
     # export DATABASE_USER=myuser
     # export DATABASE_PASSWORD=mypassword
     
-    python manage.py runserver 0.0.0.0:8000
+    uvicorn src.asgi:application --reload --host 0.0.0.0 --port 8000
 }
 
 # Function to start frontend
@@ -64,7 +64,7 @@ elif command -v tmux &> /dev/null; then
     tmux split-window -h
     
     # Start backend in left pane
-    tmux send-keys -t kharcha:0.0 "cd /home/blackinone/Downloads/kharcha/backend && source .venv/bin/activate && python manage.py runserver 0.0.0.0:8000" C-m
+    tmux send-keys -t kharcha:0.0 "cd /home/blackinone/Downloads/kharcha/backend && source .venv/bin/activate && uvicorn src.asgi:application --reload --host 0.0.0.0 --port 8000" C-m
     
     # Start frontend in right pane
     tmux send-keys -t kharcha:0.1 "cd /home/blackinone/Downloads/kharcha/frontend/kharcha && source /usr/share/nvm/init-nvm.sh && nvm use 22 && npx expo start -c" C-m